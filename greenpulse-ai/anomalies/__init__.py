@@ -2,9 +2,12 @@
 from .threshold import detect_threshold_anomalies
 from .zscore import detect_zscore_anomalies
 from .route_deviation import detect_route_deviations
+from .combined import combine_alerts, served_alerts
 
 __all__ = [
     "detect_threshold_anomalies",
     "detect_zscore_anomalies",
     "detect_route_deviations",
+    "combine_alerts",
+    "served_alerts",
 ]
@@ -0,0 +1,34 @@
+"""
+PHASE C — Combined Alert Stream
+
+Merges the threshold, z-score and route-deviation alert tables into the
+single all_alerts table behind /alerts, fleet reports and the RAG alert
+documents.
+
+WHY A COMMON SCHEMA:
+- Each detector carries its own diagnostic columns (speed_zscore,
+  deviation_km, ...); concat needs identical columns, so only the
+  fields every consumer reads are kept
+- The API serves a copy that expires with event time, so its snapshot
+  stays bounded like the windowed tables
+"""
+import pathway as pw
+
+from config import config
+from streaming.retention import expire_after
+
+
+ALERT_COLUMNS = ("vehicle_id", "anomaly_type", "severity", "message", "timestamp")
+
+
+def combine_alerts(*alerts: pw.Table) -> pw.Table:
+    """Concatenate alert tables on their shared ALERT_COLUMNS."""
+    tables = [table.select(*[pw.this[name] for name in ALERT_COLUMNS]) for table in alerts]
+    return tables[0].concat_reindex(*tables[1:])
+
+
+def served_alerts(alerts: pw.Table) -> pw.Table:
+    """The API's copy of `alerts`: each alert expires api_alert_ttl_sec after its timestamp."""
+    if not config.window.retention_enabled:
+        return alerts
+    return expire_after(alerts, "timestamp", config.window.api_alert_ttl_sec)
@@ -63,8 +63,9 @@ def detect_route_deviations(telemetry: pw.Table) -> pw.Table:
 
     # Compute distance from expected route per row
     with_deviation = telemetry.with_columns(
-        route_deviation_km=pw.apply(
+        route_deviation_km=pw.apply_with_type(
             lambda vid, lat, lon: _compute_deviation(vid, lat, lon),
+            float,
             pw.this.vehicle_id,
             pw.this.latitude,
             pw.this.longitude,
@@ -86,8 +87,9 @@ def detect_route_deviations(telemetry: pw.Table) -> pw.Table:
                 "medium",
             ),
         ),
-        message=pw.apply(
+        message=pw.apply_with_type(
             lambda vid, dev: f"Route deviation: {dev:.1f} km from expected route",
+            str,
             pw.this.vehicle_id,
             pw.this.route_deviation_km,
         ),
@@ -59,12 +59,14 @@ def detect_threshold_anomalies(telemetry: pw.Table) -> pw.Table:
         ),
         message=pw.if_else(
             pw.this.is_speed_anomaly,
-            pw.apply(
+            pw.apply_with_type(
                 lambda s: f"Speed threshold exceeded: {s:.0f} km/h",
+                str,
                 pw.this.speed,
             ),
-            pw.apply(
+            pw.apply_with_type(
                 lambda e: f"Fuel efficiency below threshold: {e:.1f} km/L",
+                str,
                 pw.this.fuel_efficiency,
             ),
         ),
@@ -11,6 +11,7 @@ WHY STREAMING-SAFE:
 import pathway as pw
 import math
 from config import config
+from streaming.retention import window_behavior
 
 
 def detect_zscore_anomalies(telemetry: pw.Table) -> pw.Table:
@@ -47,28 +48,36 @@ def detect_zscore_anomalies(telemetry: pw.Table) -> pw.Table:
             hop=pw.Duration(seconds=60),
         ),
         instance=pw.this.vehicle_id,
+        # Free window state past the cutoff but keep the alerts it emitted
+        behavior=window_behavior(keep_results=True),
     ).reduce(
-        vehicle_id=pw.this._instance,
+        vehicle_id=pw.this._pw_instance,
         mean_speed=pw.reducers.avg(pw.this.speed),
         # We compute std via avg of squares - square of avg
         avg_speed_sq=pw.reducers.avg(pw.this.speed * pw.this.speed),
         mean_carbon=pw.reducers.avg(pw.this.carbon_kg),
         avg_carbon_sq=pw.reducers.avg(pw.this.carbon_kg * pw.this.carbon_kg),
         count=pw.reducers.count(),
-        latest_speed=pw.reducers.latest(pw.this.speed),
-        latest_carbon=pw.reducers.latest(pw.this.carbon_kg),
+        # Values of the latest row in event time; unlike reducers.latest this
+        # accepts retractions (the as-of join revises telemetry rows)
+        latest=pw.reducers.max(pw.make_tuple(pw.this.timestamp, pw.this.speed, pw.this.carbon_kg)),
         window_time=pw.this._pw_window_start,
+    ).with_columns(
+        latest_speed=pw.apply_with_type(lambda latest: latest[1], float, pw.this.latest),
+        latest_carbon=pw.apply_with_type(lambda latest: latest[2], float, pw.this.latest),
     )
 
     # Compute standard deviation: std = sqrt(E[X²] - E[X]²)
     stats = stats.with_columns(
-        std_speed=pw.apply(
+        std_speed=pw.apply_with_type(
             lambda avg_sq, avg: max(math.sqrt(max(avg_sq - avg * avg, 0)), 0.001),
+            float,
             pw.this.avg_speed_sq,
             pw.this.mean_speed,
         ),
-        std_carbon=pw.apply(
+        std_carbon=pw.apply_with_type(
             lambda avg_sq, avg: max(math.sqrt(max(avg_sq - avg * avg, 0)), 0.001),
+            float,
             pw.this.avg_carbon_sq,
             pw.this.mean_carbon,
         ),
@@ -76,14 +85,16 @@ def detect_zscore_anomalies(telemetry: pw.Table) -> pw.Table:
 
     # Compute Z-scores for latest values
     zscores = stats.with_columns(
-        speed_zscore=pw.apply(
+        speed_zscore=pw.apply_with_type(
             lambda val, mean, std: abs(val - mean) / std,
+            float,
             pw.this.latest_speed,
             pw.this.mean_speed,
             pw.this.std_speed,
         ),
-        carbon_zscore=pw.apply(
+        carbon_zscore=pw.apply_with_type(
             lambda val, mean, std: abs(val - mean) / std,
+            float,
             pw.this.latest_carbon,
             pw.this.mean_carbon,
             pw.this.std_carbon,
@@ -106,10 +117,11 @@ def detect_zscore_anomalies(telemetry: pw.Table) -> pw.Table:
             "critical",
             "high",
         ),
-        message=pw.apply(
+        message=pw.apply_with_type(
             lambda vid, sz, cz: (
                 f"Z-score anomaly: speed z={sz:.1f}, carbon z={cz:.1f}"
             ),
+            str,
             pw.this.vehicle_id,
             pw.this.speed_zscore,
             pw.this.carbon_zscore,
@@ -1,4 +1,4 @@
 """API package."""
-from .server import app, register_tables
+from .server import app, pipeline_stats_state, register_store, register_tables, snapshot_store
 
-__all__ = ["app", "register_tables"]
+__all__ = ["app", "pipeline_stats_state", "register_store", "register_tables", "snapshot_store"]
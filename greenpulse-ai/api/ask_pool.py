@@ -0,0 +1,136 @@
+"""
+API — Bounded Executor for /ask
+
+Runs the synchronous RAG engine (retrieval + LLM round trip) off the
+event loop, so a slow question never stalls the read endpoints.
+
+WHY BOUNDED:
+- A fixed number of worker threads caps concurrent LLM calls
+- Admission is capped at workers + queue slots; beyond that /ask answers
+  429 immediately instead of building an unbounded backlog
+- Identical questions in flight share one engine call (single-flight):
+  late arrivals await the running call instead of taking a slot
+- Streamed answers take a slot for their whole generation; they are
+  never coalesced, since every client needs its own stream
+"""
+import asyncio
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional
+
+
+class AskRejected(Exception):
+    """Raised when every worker and queue slot is taken."""
+
+
+def question_key(question: str) -> str:
+    """Coalescing key: case- and whitespace-insensitive question text."""
+    return " ".join(question.lower().split())
+
+
+class AskPool:
+    """Bounded, single-flight executor; all bookkeeping runs on the event loop."""
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 16, timeout: Optional[float] = None):
+        self.max_workers = max(1, max_workers)
+        self.capacity = self.max_workers + max(0, max_queue)
+        self.timeout = timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+        self._stream_ids = itertools.count()
+        self.admitted = 0
+        self.completed = 0
+        self.coalesced = 0
+        self.rejected = 0
+
+    async def submit(self, key: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run fn(*args) on the pool, or join the call already running for `key`.
+
+        Raises:
+            AskRejected: the pool is at capacity
+            asyncio.TimeoutError: no result within `timeout` (the call keeps
+                its slot until it actually finishes)
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            if len(self._inflight) >= self.capacity:
+                self.rejected += 1
+                raise AskRejected(f"{len(self._inflight)} questions in flight")
+            future = self._start(key, fn, *args)
+
+        # shield: a client that disconnects must not cancel the shared call
+        return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+
+    def stream(self, fn: Callable[..., Iterator[Any]], *args: Any) -> AsyncIterator[Any]:
+        """
+        Run the generator fn(*args) on the pool and relay its items as they
+        are produced. Admission happens now, so callers can still answer 429
+        before starting a response.
+
+        Raises:
+            AskRejected: the pool is at capacity (raised here)
+            asyncio.TimeoutError: no item within `timeout` (raised while iterating)
+        """
+        if len(self._inflight) >= self.capacity:
+            self.rejected += 1
+            raise AskRejected(f"{len(self._inflight)} questions in flight")
+
+        loop = asyncio.get_running_loop()
+        queue: "asyncio.Queue[Any]" = asyncio.Queue()
+        stop = threading.Event()
+        end = object()
+
+        def pump() -> None:
+            try:
+                for item in fn(*args):
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+            except BaseException as exc:
+                loop.call_soon_threadsafe(queue.put_nowait, (end, exc))
+            else:
+                loop.call_soon_threadsafe(queue.put_nowait, (end, None))
+
+        self._start(f"stream:{next(self._stream_ids)}", pump)
+
+        async def relay() -> AsyncIterator[Any]:
+            try:
+                while True:
+                    item, error = await asyncio.wait_for(queue.get(), self.timeout)
+                    if item is end:
+                        if error is not None:
+                            raise error
+                        return
+                    yield item
+            finally:
+                # A disconnected client stops generation at the next item
+                stop.set()
+
+        return relay()
+
+    def _start(self, key: str, fn: Callable[..., Any], *args: Any) -> "asyncio.Future[Any]":
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="ask")
+        future = asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        self._inflight[key] = future
+        self.admitted += 1
+        future.add_done_callback(lambda _: self._finish(key))
+        return future
+
+    def _finish(self, key: str) -> None:
+        self._inflight.pop(key, None)
+        self.completed += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._inflight),
+            "capacity": self.capacity,
+            "admitted": self.admitted,
+            "completed": self.completed,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+        }
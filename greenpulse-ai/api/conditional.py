@@ -0,0 +1,30 @@
+"""
+API — Conditional GET Helpers
+
+ETags are derived from the versions of the tables a response depends
+on. A table's version only moves when the pipeline commits a change to
+it, so an unchanged ETag means an unchanged payload and the handler can
+answer 304 without rebuilding or reserializing anything.
+"""
+import hashlib
+from typing import Iterable, Optional
+
+
+def make_etag(parts: Iterable[str]) -> str:
+    """Strong ETag for an ordered list of version tokens."""
+    digest = hashlib.blake2b("|".join(parts).encode(), digest_size=8).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 9110 weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(_opaque(tag) == _opaque(etag) for tag in candidates)
+
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
@@ -0,0 +1,157 @@
+"""
+API — Incremental Pipeline Statistics
+
+Per-table counters, event rates and event-time watermarks maintained
+from snapshot commit listeners, so /pipeline-metrics never scans a table.
+
+WHY INCREMENTAL:
+- Each commit is folded in once, in O(size of the commit), on the engine
+  thread; reading the stats is O(number of tables)
+- Rates are exponentially weighted moving averages over a fixed time
+  constant, decayed to "now" when read — an idle source reads as ~0
+  instead of holding its last burst rate
+- Watermarks only move forward: the max event time ever inserted, taken
+  from the rows of each commit as they arrive
+"""
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from .snapshots import Change, SnapshotStore, TableSnapshot
+from .time_index import event_time
+
+
+class TableStats:
+    """Counters, EWMA insert rate and event-time watermark for one table."""
+
+    def __init__(self, name: str, time_fields: Sequence[str], rate_window_sec: float):
+        self.name = name
+        self.time_fields = tuple(time_fields)
+        self.tau = max(rate_window_sec, 1e-3)
+        self.rows = 0
+        self.inserted = 0
+        self.retracted = 0
+        self.commits = 0
+        self.watermark: Optional[float] = None
+        self.last_commit_at: Optional[float] = None
+        self._decayed = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, changes: List[Change], live_rows: int, now: float) -> None:
+        added = 0
+        watermark = self.watermark
+        for _, row, is_addition in changes:
+            if not is_addition:
+                continue
+            added += 1
+            for field in self.time_fields:
+                ts = event_time(row.get(field))
+                if ts is not None and (watermark is None or ts > watermark):
+                    watermark = ts
+
+        with self._lock:
+            self._decayed = self._decay(now) + added
+            self.last_commit_at = now
+            self.inserted += added
+            self.retracted += len(changes) - added
+            self.rows = live_rows
+            self.commits += 1
+            self.watermark = watermark
+
+    def rate(self, now: float) -> float:
+        """Inserted rows per second (EWMA), decayed to `now`."""
+        with self._lock:
+            return self._decay(now) / self.tau
+
+    def _decay(self, now: float) -> float:
+        if self.last_commit_at is None:
+            return 0.0
+        return self._decayed * math.exp(-max(0.0, now - self.last_commit_at) / self.tau)
+
+    def state(self) -> Dict[str, Any]:
+        """Everything needed to restore these stats in another process (see load)."""
+        with self._lock:
+            return {
+                "rows": self.rows,
+                "inserted": self.inserted,
+                "retracted": self.retracted,
+                "commits": self.commits,
+                "watermark": self.watermark,
+                "last_commit_at": self.last_commit_at,
+                "decayed": self._decayed,
+            }
+
+    def load(self, state: Dict[str, Any]) -> None:
+        with self._lock:
+            self.rows = state["rows"]
+            self.inserted = state["inserted"]
+            self.retracted = state["retracted"]
+            self.commits = state["commits"]
+            self.watermark = state["watermark"]
+            self.last_commit_at = state["last_commit_at"]
+            self._decayed = state["decayed"]
+
+    def as_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "inserted": self.inserted,
+            "retracted": self.retracted,
+            "commits": self.commits,
+            "rows_per_second": round(self.rate(now), 2),
+            "watermark": self.watermark,
+        }
+
+
+class PipelineStats:
+    """TableStats for every table of a SnapshotStore."""
+
+    def __init__(self, time_fields: Dict[str, Sequence[str]], rate_window_sec: float = 10.0):
+        self.time_fields = time_fields
+        self.rate_window_sec = rate_window_sec
+        self.tables: Dict[str, TableStats] = {}
+
+    def attach(self, store: SnapshotStore) -> None:
+        for name in store.names():
+            snapshot = store.get(name)
+            stats = TableStats(name, self.time_fields.get(name, ()), self.rate_window_sec)
+            if len(snapshot):
+                stats.observe([(key, row, True) for key, row in snapshot.items()], len(snapshot), time.time())
+            self.tables[name] = stats
+            snapshot.add_listener(self._on_commit)
+
+    # Runs on the Pathway engine thread
+    def _on_commit(self, snapshot: TableSnapshot, changes: List[Change], commit_time: Optional[int]) -> None:
+        stats = self.tables.get(snapshot.name)
+        if stats is not None:
+            stats.observe(changes, len(snapshot), time.time())
+
+    def state(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stats.state() for name, stats in self.tables.items()}
+
+    def load(self, state: Dict[str, Dict[str, Any]]) -> None:
+        """Adopt stats published by the pipeline process (API worker processes)."""
+        for name, table_state in state.items():
+            stats = self.tables.get(name)
+            if stats is None:
+                stats = TableStats(name, self.time_fields.get(name, ()), self.rate_window_sec)
+                self.tables[name] = stats
+            stats.load(table_state)
+
+    def inserted(self, names: Sequence[str]) -> int:
+        return sum(self.tables[name].inserted for name in names if name in self.tables)
+
+    def rate(self, names: Sequence[str], now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        return sum(self.tables[name].rate(now) for name in names if name in self.tables)
+
+    def watermark(self, names: Sequence[str]) -> Optional[float]:
+        marks = [
+            self.tables[name].watermark for name in names
+            if name in self.tables and self.tables[name].watermark is not None
+        ]
+        return max(marks) if marks else None
+
+    def as_dict(self, now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        now = time.time() if now is None else now
+        return {name: stats.as_dict(now) for name, stats in self.tables.items()}
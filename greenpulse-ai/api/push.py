@@ -0,0 +1,135 @@
+"""
+API — Push Feed for Dashboard Panels
+
+Fans table diffs out to connected /stream clients as Server-Sent Events.
+
+WHY PUSH:
+- Polling rebuilds full payloads every 2–3 s per panel per browser even
+  when nothing changed; at steady state a push feed sends nothing
+- Diffs are formatted once per commit on the engine thread and shared
+  by every subscribed client
+- Each client coalesces diffs per row key over a short window, so a
+  burst of commits collapses into one event per topic
+"""
+import asyncio
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .snapshots import Change, SnapshotStore, TableSnapshot
+
+
+# A formatted diff: (row key, formatted row or None for a deletion)
+RowDiff = Tuple[str, Optional[Dict[str, Any]]]
+
+
+class StreamTopic:
+    """A pushable topic: table-backed (row diffs) or computed (whole payload)."""
+
+    def __init__(
+        self,
+        name: str,
+        table: Optional[str] = None,
+        formatter: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+        builder: Optional[Callable[[], Any]] = None,
+    ):
+        self.name = name
+        self.table = table
+        self.formatter = formatter
+        self.builder = builder
+
+    @property
+    def is_computed(self) -> bool:
+        return self.builder is not None
+
+
+class StreamClient:
+    """One /stream connection: per-topic pending diffs, coalesced by row key."""
+
+    def __init__(self, topics: Set[str], loop: asyncio.AbstractEventLoop):
+        self.topics = topics
+        self.loop = loop
+        self._pending: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {}
+        self._dirty_computed: Set[str] = set()
+        self._ready = asyncio.Event()
+
+    # Runs on the event loop (scheduled via call_soon_threadsafe)
+    def offer(self, topic: str, diffs: List[RowDiff]) -> None:
+        pending = self._pending.setdefault(topic, {})
+        for key, row in diffs:
+            pending[key] = row
+        self._ready.set()
+
+    def mark_dirty(self, topic: str) -> None:
+        self._dirty_computed.add(topic)
+        self._ready.set()
+
+    async def wait(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def drain(self) -> Tuple[Dict[str, Dict[str, Optional[Dict[str, Any]]]], Set[str]]:
+        pending, self._pending = self._pending, {}
+        dirty, self._dirty_computed = self._dirty_computed, set()
+        self._ready.clear()
+        return pending, dirty
+
+
+class PushHub:
+    """Routes snapshot commits to subscribed StreamClients."""
+
+    def __init__(self, topics: List[StreamTopic]):
+        self.topics: Dict[str, StreamTopic] = {topic.name: topic for topic in topics}
+        self._clients: Set[StreamClient] = set()
+        self._lock = threading.Lock()
+
+    def attach(self, store: SnapshotStore) -> None:
+        """Listen to every table in the store; computed topics refresh on any commit."""
+        for name in store.names():
+            store.get(name).add_listener(self._on_commit)
+
+    def connect(self, topics: Set[str], loop: asyncio.AbstractEventLoop) -> StreamClient:
+        client = StreamClient(topics & set(self.topics), loop)
+        with self._lock:
+            self._clients.add(client)
+        return client
+
+    def disconnect(self, client: StreamClient) -> None:
+        with self._lock:
+            self._clients.discard(client)
+
+    # Runs on the Pathway engine thread
+    def _on_commit(self, snapshot: TableSnapshot, changes: List[Change], time: Optional[int]) -> None:
+        with self._lock:
+            clients = list(self._clients)
+        if not clients:
+            return
+
+        table_topics = [
+            topic for topic in self.topics.values()
+            if topic.table == snapshot.name and not topic.is_computed
+        ]
+        formatted = {topic.name: _format_diffs(topic, changes) for topic in table_topics}
+        computed = [topic.name for topic in self.topics.values() if topic.is_computed]
+
+        for client in clients:
+            for topic_name, diffs in formatted.items():
+                if topic_name in client.topics and diffs:
+                    client.loop.call_soon_threadsafe(client.offer, topic_name, diffs)
+            for topic_name in computed:
+                if topic_name in client.topics:
+                    client.loop.call_soon_threadsafe(client.mark_dirty, topic_name)
+
+
+def _format_diffs(topic: StreamTopic, changes: List[Change]) -> List[RowDiff]:
+    """Collapse a commit's changes to one diff per key (updates become upserts)."""
+    latest: Dict[str, Optional[Dict[str, Any]]] = {}
+    for key, _, is_addition in changes:
+        if not is_addition:
+            latest.setdefault(str(key), None)
+    for key, row, is_addition in changes:
+        if is_addition:
+            latest[str(key)] = topic.formatter(row) if topic.formatter else row
+    return list(latest.items())
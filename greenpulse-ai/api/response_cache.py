@@ -0,0 +1,54 @@
+"""
+API — Pre-serialized Response Cache
+
+Stores the fully encoded JSON body of each read endpoint, keyed by
+endpoint + query parameters and tagged with the ETag it was built for.
+
+WHY CACHE BYTES:
+- Building Pydantic models row by row and re-encoding them dominates the
+  cost of a read; the result only changes when a source table commits
+- The ETag already encodes every input of a response (table versions
+  and the crisis overlay), so an entry is valid exactly while its ETag
+  is current — no TTLs, no explicit invalidation hooks
+- Hits are served as a raw Response: no validation, no re-encoding
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class ResponseCache:
+    """Bounded LRU of (etag, encoded body) per cache key."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, etag: str) -> Optional[bytes]:
+        """Cached body for `key` if it was built for `etag`, else None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, etag: str, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -7,16 +7,39 @@ New endpoints added:
   /predictions      → carbon, risk, and fuel exhaustion forecasts
   /fleet-report/latest   → most recent auto-generated intelligence report
   /fleet-report/history  → all historical reports
+  /dashboard        → every panel in one response, from one snapshot view
+  /state-explanations (POST) → batch state explanations for a list of vehicles
+  /stream           → Server-Sent Events push feed of table diffs
+  /ask/stream (POST) → /ask as Server-Sent Events: sources, then LLM tokens
+
+Read endpoints carry an ETag derived from the versions of the tables
+they depend on and answer If-None-Match with 304 Not Modified. Their
+encoded bodies are cached per ETag and served as raw JSON responses.
+/alerts, /state-history and /fleet-report/history page newest-first
+through keyset cursors over a time-ordered index.
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, Sequence, Tuple
+import asyncio
+import heapq
 import json
 import os
 import time
 from datetime import datetime, timezone
 from config import config
+from .ask_pool import AskPool, AskRejected, question_key
+from .conditional import etag_matches, make_etag
+from .pipeline_stats import PipelineStats
+from .push import PushHub, StreamTopic
+from .response_cache import ResponseCache
+from .shared_snapshot import crisis_path, write_json
+from .snapshots import SnapshotStore, StoreView, build_snapshot_store
+from .time_index import Entry, TimeIndex, decode_cursor, encode_cursor, event_time
+from .vehicle_index import VehicleIndex
 
 try:
     import psutil
@@ -40,38 +63,187 @@ app.add_middleware(
 
 
 # ──────────────────────────────────────────────
-# In-memory references to Pathway tables
+# Materialized snapshots of Pathway tables
 # ──────────────────────────────────────────────
-_tables: Dict[str, Any] = {}
+_store = SnapshotStore()
 _query_engine = None
 _api_started_at = time.time()
-_last_total_events = 0
-_last_eps_time = _api_started_at
-_last_eps_value = 0.0
 _crisis_state: Dict[str, Any] = {
     "enabled": False,
     "vehicle_id": None,
     "started_at": None,
 }
+# Bumped on every crisis start/stop; part of crisis-aware ETags
+_crisis_version = 0
+# Process mode: shared directory that carries the crisis state between workers
+_crisis_dir: Optional[str] = None
+# Raw input streams; their inserts are the pipeline's event count
+SOURCE_TABLES = ("gps", "fuel", "shipments", "weather")
+# Tables whose rows the endpoints, indexes and /ask router read; every other
+# registered table (raw inputs, telemetry, intermediate alerts) is only counted
+SERVED_TABLES = (
+    "all_alerts", "rankings", "sustainability", "risk_scores", "vehicle_states",
+    "state_history", "predictions", "latest_report", "report_history",
+)
+# Event-time columns that advance each table's watermark in /pipeline-metrics
+WATERMARK_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "gps": ("parsed_time",),
+    "fuel": ("parsed_time",),
+    "shipments": ("parsed_time",),
+    "weather": ("timestamp",),
+    "windowed": ("window_end",),
+    "telemetry": ("timestamp", "parsed_time", "window_end"),
+    "all_alerts": ("timestamp", "parsed_time", "window_end"),
+    "predictions": ("timestamp", "parsed_time", "window_end"),
+}
+_pipeline_stats = PipelineStats(WATERMARK_FIELDS)
+# Time-ordered indexes behind the paginated endpoints: table → (time field, filter fields)
+INDEXED_TABLES: Dict[str, Tuple[Optional[str], Tuple[str, ...]]] = {
+    "all_alerts": ("timestamp", ("vehicle_id", "severity", "anomaly_type")),
+    "state_history": (None, ("vehicle_id",)),
+    "report_history": (None, ()),
+}
+MAX_PAGE_SIZE = 500
+_indexes: Dict[str, TimeIndex] = {}
+# vehicle_id → current state / prediction / risk rows, behind the state explanations
+VEHICLE_INDEX_FIELDS = {"state": "vehicle_states", "prediction": "predictions", "risk": "risk_scores"}
+VEHICLE_INDEX_TABLES = tuple(VEHICLE_INDEX_FIELDS.values())
+_vehicle_index = VehicleIndex(VEHICLE_INDEX_FIELDS)
+# Tables behind the RAG documents → document category (see rag/document_store.py)
+DOCUMENT_TABLES = {"all_alerts": "alert", "windowed": "metrics", "closed_windows": "metrics"}
+# Semantic /ask answer cache (pipeline process only; None when disabled)
+_answer_cache = None
+# /ask fast path answering lookup questions from the snapshot tables (None when disabled)
+_intent_router = None
+# /ask runs off the event loop on a bounded, single-flight pool
+_ask_pool = AskPool(config.api.ask_workers, config.api.ask_queue_size, config.api.ask_timeout_sec)
+# Encoded read responses, valid while their ETag is current
+_response_cache: Optional[ResponseCache] = (
+    ResponseCache(config.api.response_cache_max_entries)
+    if config.api.response_cache_enabled
+    else None
+)
 
 
 def register_tables(tables: Dict[str, Any], query_engine=None):
-    """Register Pathway tables for API access."""
-    global _tables, _query_engine
-    _tables = tables
+    """
+    Register Pathway tables for API access.
+
+    Must be called before pw.run(): each table is subscribed to; the
+    SERVED_TABLES are materialized into the snapshot store that handlers
+    read from, the others only feed counters and listeners.
+    """
+    store = build_snapshot_store(tables, served=SERVED_TABLES)
+    if query_engine is not None and config.rag.answer_cache_enabled:
+        query_engine = _with_answer_cache(store, query_engine)
+    register_store(store, query_engine=query_engine)
+
+
+def _document_tables(store: SnapshotStore) -> Dict[str, str]:
+    """The DOCUMENT_TABLES whose rows are currently indexed as RAG documents."""
+    tables = dict(DOCUMENT_TABLES)
+    if store.has("closed_windows") and not config.rag.current_window_docs:
+        # Metric documents only change when a window closes
+        del tables["windowed"]
+    return tables
+
+
+def _with_answer_cache(store: SnapshotStore, query_engine: Any) -> Any:
+    """Put the semantic answer cache in front of the engine, fed by document-table changes."""
+    # Imported lazily so API-only processes never load the rag package
+    from rag.answer_cache import CachedQueryEngine, create_answer_cache
+
+    global _answer_cache
+    cache = _answer_cache = create_answer_cache()
+
+    def invalidate(category: str):
+        return lambda snapshot, changes, commit_time: cache.on_documents_changed(
+            {(str(row.get("vehicle_id", "")), category) for _, row, _ in changes}
+        )
+
+    for table, category in _document_tables(store).items():
+        snapshot = store.get(table)
+        if snapshot is not None:
+            snapshot.add_listener(invalidate(category))
+    return CachedQueryEngine(query_engine, cache)
+
+
+def register_store(store: SnapshotStore, query_engine=None, remote_stats: bool = False):
+    """
+    Serve from an existing SnapshotStore and build the read-side indexes
+    over it. Used directly by API worker processes, whose store follows
+    the snapshots published by the pipeline process; with remote_stats
+    their pipeline stats are the pipeline's (load_pipeline_stats), since
+    the tables that are only counted are not shared.
+    """
+    global _store, _query_engine, _indexes, _pipeline_stats, _vehicle_index, _intent_router
+    _store = store
+    _indexes = build_indexes(_store)
+    _pipeline_stats = PipelineStats(WATERMARK_FIELDS, config.api.metrics_rate_window_sec)
+    if not remote_stats:
+        _pipeline_stats.attach(_store)
+    _vehicle_index = VehicleIndex(VEHICLE_INDEX_FIELDS)
+    _vehicle_index.attach(_store)
+    _push_hub.attach(_store)
     _query_engine = query_engine
+    if config.rag.intent_router_enabled:
+        from rag.intent_router import IntentRouter
+
+        # Same crisis overlays as the read endpoints, so chat matches the panels
+        _intent_router = IntentRouter(_store, formatters={
+            "vehicle_states": _format_vehicle_state,
+            "risk_scores": _format_risk_breakdown,
+            "predictions": _format_prediction,
+        })
+    if _response_cache is not None:
+        _response_cache.clear()
 
 
-def _to_datetime(value: Any) -> Optional[datetime]:
-    if isinstance(value, datetime):
-        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
-    if isinstance(value, str):
-        try:
-            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
-            return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
-        except Exception:
-            return None
-    return None
+def snapshot_store() -> SnapshotStore:
+    return _store
+
+
+def pipeline_stats_state() -> Dict[str, Dict[str, Any]]:
+    return _pipeline_stats.state()
+
+
+def load_pipeline_stats(state: Dict[str, Dict[str, Any]]) -> None:
+    """Adopt the pipeline stats published by the pipeline process."""
+    _pipeline_stats.load(state)
+
+
+def share_crisis_state(directory: Optional[str]) -> None:
+    """Mirror crisis start/stop into `directory` so every API process sees it."""
+    global _crisis_dir
+    _crisis_dir = directory
+
+
+def load_crisis_state(state: Dict[str, Any]) -> None:
+    """Adopt a crisis state published by another API process."""
+    global _crisis_version
+    _crisis_state["enabled"] = bool(state.get("enabled"))
+    _crisis_state["vehicle_id"] = state.get("vehicle_id")
+    _crisis_state["started_at"] = state.get("started_at")
+    _crisis_version = int(state.get("version", _crisis_version))
+
+
+def _set_crisis_state(enabled: bool, vehicle_id: Optional[str]) -> None:
+    global _crisis_version
+    _crisis_version += 1
+    _crisis_state["enabled"] = enabled
+    _crisis_state["vehicle_id"] = vehicle_id
+    _crisis_state["started_at"] = time.time() if enabled else None
+    if _crisis_dir is not None:
+        write_json(crisis_path(_crisis_dir), {**_crisis_state, "version": _crisis_version})
+
+
+def build_indexes(store: SnapshotStore) -> Dict[str, TimeIndex]:
+    """TimeIndexes for every INDEXED_TABLES entry present in `store`."""
+    return {
+        name: TimeIndex(store.get(name), time_field, partitions)
+        for name, (time_field, partitions) in INDEXED_TABLES.items()
+        if store.has(name)
+    }
 
 
 def _is_crisis_vehicle(vehicle_id: str) -> bool:
@@ -86,52 +258,102 @@ def _crisis_intensity() -> float:
     return min(1.0, elapsed / 120.0)
 
 
-def _safe_rows(table_name: str) -> List[Dict[str, Any]]:
-    table = _tables.get(table_name)
-    if table is None:
-        return []
+def _crisis_token() -> str:
+    """
+    Version token for the crisis overlay.
+
+    While a crisis is active the overlay ramps with wall-clock time, so the
+    token also changes every second.
+    """
+    if not _crisis_state.get("enabled"):
+        return f"crisis:{_crisis_version}"
+    return f"crisis:{_crisis_version}:{_crisis_state.get('vehicle_id')}:{int(time.time())}"
+
+
+def _encode_json(payload: Any) -> bytes:
+    """Encode a handler payload exactly as FastAPI's JSONResponse would."""
+    return json.dumps(
+        jsonable_encoder(payload),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _cached_json(
+    request: Request,
+    cache_key: str,
+    tables: Sequence[str],
+    build: Callable[[], Any],
+    crisis: bool = True,
+    view: Optional[StoreView] = None,
+) -> Response:
+    """
+    Serve a read endpoint as pre-encoded JSON.
+
+    The ETag is built from the versions of `tables` (and the crisis
+    overlay). A matching If-None-Match gets 304; otherwise the cached
+    body for this ETag is returned as-is, and only on a miss does
+    `build()` run and its encoded result get cached under `cache_key`.
+    When `build()` reads a pinned `view`, pass it: the ETag then names
+    exactly the versions the body is built from.
+    """
+    version = view.version if view is not None else _store.version
+    parts = [_store.epoch] + [f"{name}:{version(name)}" for name in tables]
+    if crisis:
+        parts.append(_crisis_token())
+    etag = make_etag(parts)
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    body = _response_cache.get(cache_key, etag) if _response_cache is not None else None
+    if body is None:
+        body = _encode_json(build())
+        if _response_cache is not None:
+            _response_cache.put(cache_key, etag, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _query_key(path: str, **params: Any) -> str:
+    """Cache key for an endpoint: path plus its non-empty params in a fixed order."""
+    query = "&".join(f"{name}={value}" for name, value in sorted(params.items()) if value is not None)
+    return f"{path}?{query}" if query else path
+
+
+def _page_params(
+    limit: int,
+    cursor: Optional[str],
+    since: Optional[str],
+) -> Tuple[int, Optional[Entry], Optional[float]]:
+    """Validate pagination params: (clamped limit, cursor position, since as epoch seconds)."""
     try:
-        return list(table)
-    except Exception:
-        return []
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    since_ts = event_time(since) if since else None
+    if since and since_ts is None:
+        raise HTTPException(400, f"Invalid since timestamp: {since!r}")
+    return max(1, min(limit, MAX_PAGE_SIZE)), position, since_ts
 
 
-def _get_pipeline_metrics_snapshot() -> Dict[str, Any]:
-    global _last_total_events, _last_eps_time, _last_eps_value
+def _next_cursor(position: Optional[Entry]) -> Optional[str]:
+    return encode_cursor(position) if position is not None else None
 
-    source_tables = ("gps", "fuel", "shipments", "weather")
-    source_counts = {name: len(_safe_rows(name)) for name in source_tables}
-    total_events = sum(source_counts.values())
 
+def _get_pipeline_metrics_snapshot() -> Dict[str, Any]:
     now = time.time()
-    delta_events = total_events - _last_total_events
-    delta_time = max(1e-6, now - _last_eps_time)
-    if delta_events >= 0:
-        _last_eps_value = delta_events / delta_time
-    _last_total_events = total_events
-    _last_eps_time = now
-
-    window_rows = _safe_rows("windowed")
-    latest_window_end = None
-    for row in window_rows:
-        maybe_dt = _to_datetime(row.get("window_end"))
-        if maybe_dt and (latest_window_end is None or maybe_dt > latest_window_end):
-            latest_window_end = maybe_dt
+    total_events = _pipeline_stats.inserted(SOURCE_TABLES)
+    events_per_second = _pipeline_stats.rate(SOURCE_TABLES, now)
 
     sliding_latency_ms = 0.0
+    latest_window_end = _pipeline_stats.watermark(("windowed",))
     if latest_window_end is not None:
-        sliding_latency_ms = max(
-            0.0,
-            (datetime.now(timezone.utc) - latest_window_end).total_seconds() * 1000.0,
-        )
+        sliding_latency_ms = max(0.0, (now - latest_window_end) * 1000.0)
 
-    last_update = None
-    for table_name in ("telemetry", "gps", "all_alerts", "predictions"):
-        for row in _safe_rows(table_name):
-            for key in ("timestamp", "parsed_time", "window_end"):
-                maybe_dt = _to_datetime(row.get(key))
-                if maybe_dt and (last_update is None or maybe_dt > last_update):
-                    last_update = maybe_dt
+    last_update = _pipeline_stats.watermark(("telemetry", "gps", "all_alerts", "predictions"))
 
     memory_mb = None
     if psutil is not None:
@@ -141,22 +363,156 @@ def _get_pipeline_metrics_snapshot() -> Dict[str, Any]:
         except Exception:
             memory_mb = None
 
-    active_tables = [name for name, table in _tables.items() if table is not None]
+    active_tables = _store.names()
     uptime_seconds = now - _api_started_at
 
     return {
-        "events_per_second": round(_last_eps_value, 2),
+        "events_per_second": round(events_per_second, 2),
         "total_events_processed": int(total_events),
         "active_streaming_tables_count": len(active_tables),
         "sliding_window_latency_ms": round(sliding_latency_ms, 2),
-        "last_update_timestamp": last_update.isoformat() if last_update else datetime.now(timezone.utc).isoformat(),
+        "last_update_timestamp": datetime.fromtimestamp(last_update or now, timezone.utc).isoformat(),
         "total_streaming_nodes": len(active_tables),
         "memory_usage_mb": round(memory_mb, 2) if memory_mb is not None else None,
         "uptime_seconds": round(uptime_seconds, 2),
         "pathway_runtime_integrated": True,
+        "stages": _pipeline_stats.as_dict(now),
+        "ask_pool": _ask_pool.stats(),
+        "answer_cache": _answer_cache.stats() if _answer_cache is not None else None,
+        "intent_router": _intent_router.stats() if _intent_router is not None else None,
+    }
+
+
+# ──────────────────────────────────────────────
+# Row formatters (shared by REST handlers and the /stream feed)
+# ──────────────────────────────────────────────
+
+RISK_FORMULA = "Risk Score = 0.35(alerts) + 0.25(efficiency) + 0.25(carbon) + 0.15(status)"
+
+
+def _format_alert(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "vehicle_id": row.get("vehicle_id", ""),
+        "type": row.get("anomaly_type", ""),
+        "severity": row.get("severity", ""),
+        "message": row.get("message", ""),
+        "timestamp": str(row.get("timestamp", "")),
+    }
+
+
+def _crisis_alerts() -> List[Dict[str, Any]]:
+    if not (_crisis_state.get("enabled") and _crisis_state.get("vehicle_id")):
+        return []
+
+    vehicle_id = _crisis_state["vehicle_id"]
+    intensity = _crisis_intensity()
+    return [
+        {
+            "vehicle_id": vehicle_id,
+            "type": "HIGH_EMISSION",
+            "severity": "high",
+            "message": f"Simulated crisis: carbon emission rate increased ({intensity:.2f} intensity)",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+        {
+            "vehicle_id": vehicle_id,
+            "type": "ROUTE_DEVIATION",
+            "severity": "high",
+            "message": "Simulated crisis: route deviation probability elevated",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+        {
+            "vehicle_id": vehicle_id,
+            "type": "CRITICAL_RISK",
+            "severity": "critical",
+            "message": "Simulated crisis: multi-factor risk escalation triggered",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+    ]
+
+
+def _format_vehicle_state(row: Dict[str, Any]) -> Dict[str, Any]:
+    current_state = row.get("current_state", "NORMAL")
+    transition_reason = row.get("transition_reason", "")
+    risk_level = row.get("risk_level", "low")
+    risk_score = round(row.get("risk_score", 0.0), 1)
+
+    if _is_crisis_vehicle(row.get("vehicle_id", "")):
+        intensity = _crisis_intensity()
+        current_state = "CRITICAL_RISK"
+        risk_level = "critical"
+        risk_score = min(100.0, round(max(risk_score, 85.0) + intensity * 12.0, 1))
+        transition_reason = "Simulated crisis mode active: emission + alerts + route deviation escalation"
+
+    return {
+        "vehicle_id": row.get("vehicle_id", ""),
+        "current_state": current_state,
+        "previous_state": row.get("previous_state", "NORMAL"),
+        "transition_reason": transition_reason,
+        "risk_level": risk_level,
+        "risk_score": risk_score,
+    }
+
+
+def _format_risk_breakdown(row: Dict[str, Any]) -> Dict[str, Any]:
+    risk_score = round(row.get("risk_score", 0.0), 1)
+    alert_pct = round(row.get("alert_impact_pct", 0.0), 2)
+    efficiency_pct = round(row.get("efficiency_impact_pct", 0.0), 2)
+    carbon_pct = round(row.get("carbon_impact_pct", 0.0), 2)
+    status_pct = round(row.get("status_impact_pct", 0.0), 2)
+
+    if _is_crisis_vehicle(row.get("vehicle_id", "")):
+        intensity = _crisis_intensity()
+        risk_score = min(100.0, round(max(risk_score, 88.0) + intensity * 10.0, 1))
+        alert_pct = round(min(100.0, alert_pct + intensity * 8.0), 2)
+        carbon_pct = round(min(100.0, carbon_pct + intensity * 6.0), 2)
+
+    return {
+        "vehicle_id": row.get("vehicle_id", ""),
+        "risk_score": risk_score,
+        "alert_impact_pct": alert_pct,
+        "efficiency_impact_pct": efficiency_pct,
+        "carbon_impact_pct": carbon_pct,
+        "status_impact_pct": status_pct,
+        "formula": RISK_FORMULA,
+    }
+
+
+def _format_prediction(row: Dict[str, Any]) -> Dict[str, Any]:
+    predicted_carbon = round(row.get("predicted_carbon_10min", 0.0), 2)
+    predicted_risk = round(row.get("predicted_risk_score", 0.0), 1)
+    escalation = round(row.get("risk_escalation_probability", 0.0), 3)
+    fuel_eta = round(row.get("fuel_exhaustion_minutes", -1.0), 1)
+
+    if _is_crisis_vehicle(row.get("vehicle_id", "")):
+        intensity = _crisis_intensity()
+        predicted_carbon = round(predicted_carbon * (1.2 + intensity * 0.6), 2)
+        predicted_risk = round(min(100.0, max(predicted_risk, 88.0) + intensity * 10.0), 1)
+        escalation = round(min(0.99, max(escalation, 0.78) + intensity * 0.15), 3)
+        fuel_eta = round(min(59.0, max(10.0, fuel_eta * (0.55 - intensity * 0.15))), 1)
+
+    return {
+        "vehicle_id": row.get("vehicle_id", ""),
+        "predicted_carbon_10min": predicted_carbon,
+        "predicted_risk_score": predicted_risk,
+        "risk_escalation_probability": escalation,
+        "fuel_exhaustion_minutes": fuel_eta,
     }
 
 
+
+def _build_push_hub() -> PushHub:
+    return PushHub([
+        StreamTopic("alerts", table="all_alerts", formatter=_format_alert),
+        StreamTopic("vehicle_states", table="vehicle_states", formatter=_format_vehicle_state),
+        StreamTopic("predictions", table="predictions", formatter=_format_prediction),
+        StreamTopic("risk_breakdown", table="risk_scores", formatter=_format_risk_breakdown),
+        StreamTopic("pipeline_metrics", builder=_get_pipeline_metrics_snapshot),
+    ])
+
+
+_push_hub = _build_push_hub()
+
 # ──────────────────────────────────────────────
 # Request / Response Models
 # ──────────────────────────────────────────────
@@ -210,6 +566,10 @@ class CrisisRequest(BaseModel):
     vehicle_id: str
 
 
+class StateExplanationsRequest(BaseModel):
+    vehicle_ids: List[str]
+
+
 # ──────────────────────────────────────────────
 # Core Endpoints
 # ──────────────────────────────────────────────
@@ -231,6 +591,8 @@ async def root():
             "pipeline-metrics",
             "xai-risk-breakdown",
             "crisis-simulation",
+            "push-stream",
+            "composite-dashboard",
         ],
     }
 
@@ -240,18 +602,85 @@ async def get_pipeline_metrics():
     return _get_pipeline_metrics_snapshot()
 
 
-@app.get("/metrics", response_model=MetricsResponse)
-async def get_metrics():
-    rankings = _tables.get("rankings")
-    if rankings is None:
-        raise HTTPException(503, "Pipeline not ready")
+@app.get("/stream")
+async def stream(request: Request, topics: Optional[str] = None):
+    """
+    Server-Sent Events feed of per-table row diffs.
+
+    Query: ?topics=alerts,vehicle_states,predictions,risk_breakdown,pipeline_metrics
+    (default: all). Each topic first receives a "snapshot" event with
+    every current row, then "<topic>" events carrying coalesced
+    {"upserts": {key: row}, "deletes": [key]} diffs.
+    """
+    wanted = set(topics.split(",")) if topics else set(_push_hub.topics)
+    client = _push_hub.connect(wanted, asyncio.get_running_loop())
+    coalesce_sec = config.api.stream_coalesce_ms / 1000.0
+    keepalive_sec = config.api.stream_keepalive_sec
 
-    rows = list(rankings)
+    async def events():
+        try:
+            for name in sorted(client.topics):
+                yield _sse("snapshot", {"topic": name, **_topic_snapshot(name)})
+
+            while not await request.is_disconnected():
+                if not await client.wait(keepalive_sec):
+                    yield ": keep-alive\n\n"
+                    continue
+                await asyncio.sleep(coalesce_sec)
+                pending, dirty = client.drain()
+                for name, diffs in pending.items():
+                    yield _sse(name, {
+                        "topic": name,
+                        "upserts": {key: row for key, row in diffs.items() if row is not None},
+                        "deletes": [key for key, row in diffs.items() if row is None],
+                    })
+                for name in dirty:
+                    yield _sse(name, {"topic": name, "data": _push_hub.topics[name].builder()})
+        finally:
+            _push_hub.disconnect(client)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _topic_snapshot(name: str) -> Dict[str, Any]:
+    topic = _push_hub.topics[name]
+    if topic.is_computed:
+        return {"data": topic.builder()}
+    snapshot = _store.get(topic.table)
+    rows = snapshot.items() if snapshot is not None else []
+    return {"rows": {str(key): topic.formatter(row) for key, row in rows}}
+
+
+def _sse(event: str, payload: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+def _rankings_by_carbon(view: StoreView) -> List[Dict[str, Any]]:
+    """Ranking rows, lowest carbon first (shared by /metrics and /rankings)."""
+    return view.memo(
+        "rankings_by_carbon",
+        lambda: sorted(view.rows("rankings"), key=lambda r: r["total_carbon_kg"]),
+    )
+
+
+def _sustainability_by_score(view: StoreView) -> List[Dict[str, Any]]:
+    """Sustainability rows, best score first (shared by /rankings and /sustainability)."""
+    return view.memo(
+        "sustainability_by_score",
+        lambda: sorted(view.rows("sustainability"), key=lambda r: r.get("sustainability_score", 0), reverse=True),
+    )
+
+
+def _build_metrics(view: StoreView) -> MetricsResponse:
     vehicles = []
     total_carbon = 0
     total_eff = 0
 
-    for row in rows:
+    for row in reversed(_rankings_by_carbon(view)):
         v = {
             "vehicle_id": row["vehicle_id"],
             "total_carbon_kg": round(row["total_carbon_kg"], 1),
@@ -267,68 +696,102 @@ async def get_metrics():
     return MetricsResponse(
         total_emissions_kg=round(total_carbon, 1),
         active_vehicles=len(vehicles),
-        total_alerts=len(list(_tables.get("all_alerts", []))),
+        total_alerts=len(view.rows("all_alerts")),
         avg_fleet_efficiency=round(total_eff / n, 1),
-        vehicles=sorted(vehicles, key=lambda x: x["total_carbon_kg"], reverse=True),
+        vehicles=vehicles,
     )
 
 
-@app.get("/alerts")
-async def get_alerts():
-    all_alerts = _tables.get("all_alerts")
-    if all_alerts is None:
-        return {"alerts": []}
-
-    alerts = []
-    for row in list(all_alerts):
-        alerts.append({
-            "vehicle_id": row.get("vehicle_id", ""),
-            "type": row.get("anomaly_type", ""),
-            "severity": row.get("severity", ""),
-            "message": row.get("message", ""),
-            "timestamp": str(row.get("timestamp", "")),
-        })
+@app.get("/metrics", response_model=MetricsResponse)
+async def get_metrics(request: Request):
+    if not _store.has("rankings"):
+        raise HTTPException(503, "Pipeline not ready")
+    return _cached_json(
+        request, "/metrics", ("rankings", "all_alerts"),
+        lambda: _build_metrics(_store.view()), crisis=False,
+    )
 
-    if _crisis_state.get("enabled") and _crisis_state.get("vehicle_id"):
-        vehicle_id = _crisis_state["vehicle_id"]
-        intensity = _crisis_intensity()
-        alerts.extend(
-            [
-                {
-                    "vehicle_id": vehicle_id,
-                    "type": "HIGH_EMISSION",
-                    "severity": "high",
-                    "message": f"Simulated crisis: carbon emission rate increased ({intensity:.2f} intensity)",
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                },
-                {
-                    "vehicle_id": vehicle_id,
-                    "type": "ROUTE_DEVIATION",
-                    "severity": "high",
-                    "message": "Simulated crisis: route deviation probability elevated",
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                },
-                {
-                    "vehicle_id": vehicle_id,
-                    "type": "CRITICAL_RISK",
-                    "severity": "critical",
-                    "message": "Simulated crisis: multi-factor risk escalation triggered",
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                },
-            ]
-        )
 
-    return {"alerts": sorted(alerts, key=lambda x: x["timestamp"], reverse=True)[:50]}
+def _build_alerts(
+    limit: int,
+    cursor: Optional[Entry],
+    since: Optional[float],
+    vehicle_id: Optional[str],
+    severity: Optional[str],
+    alert_type: Optional[str],
+) -> Dict[str, Any]:
+    rows, next_position = _indexes["all_alerts"].page(
+        limit,
+        cursor=cursor,
+        since=since,
+        where={"vehicle_id": vehicle_id, "severity": severity, "anomaly_type": alert_type},
+    )
+    alerts = [_format_alert(row) for row in rows]
+
+    if cursor is None:
+        # Crisis alerts are always the newest, so they lead the first page only
+        crisis = [
+            alert for alert in _crisis_alerts()
+            if (vehicle_id is None or alert["vehicle_id"] == vehicle_id)
+            and (severity is None or alert["severity"] == severity)
+            and (alert_type is None or alert["type"] == alert_type)
+        ]
+        alerts = crisis + alerts
 
+    return {"alerts": alerts, "next_cursor": _next_cursor(next_position)}
 
-@app.get("/rankings")
-async def get_rankings():
-    rankings = _tables.get("rankings")
-    sustainability = _tables.get("sustainability")
+
+def _alert_entry(key: Any, row: Dict[str, Any]) -> Entry:
+    # The (event time, key) position TimeIndex gives the same alert
+    ts = event_time(row.get("timestamp"))
+    return (0.0 if ts is None else ts, str(key))
+
+
+def _build_latest_alerts(view: StoreView, limit: int = 50) -> Dict[str, Any]:
+    """The unfiltered first /alerts page, read from a pinned view instead of the live index."""
+    newest = heapq.nlargest(
+        limit + 1,
+        ((_alert_entry(key, row), row) for key, row in view.items("all_alerts")),
+        key=lambda pair: pair[0],
+    )
+    page = newest[:limit]
+    alerts = _crisis_alerts() + [_format_alert(row) for _, row in page]
+    next_cursor = _next_cursor(page[-1][0]) if len(newest) > limit else None
+    return {"alerts": alerts, "next_cursor": next_cursor}
+
+
+@app.get("/alerts")
+async def get_alerts(
+    request: Request,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    since: Optional[str] = None,
+    vehicle_id: Optional[str] = None,
+    severity: Optional[str] = None,
+    type: Optional[str] = None,
+):
+    """
+    Anomaly alerts, newest first, with keyset pagination.
+    Pass the returned next_cursor as ?cursor= to fetch the following page;
+    since= (ISO-8601) bounds how far back pages go.
+    """
+    if "all_alerts" not in _indexes:
+        return {"alerts": [], "next_cursor": None}
+    limit, position, since_ts = _page_params(limit, cursor, since)
+    return _cached_json(
+        request,
+        _query_key("/alerts", limit=limit, cursor=cursor, since=since,
+                   vehicle_id=vehicle_id, severity=severity, type=type),
+        ("all_alerts",),
+        lambda: _build_alerts(limit, position, since_ts, vehicle_id, severity, type),
+    )
+
+
+def _build_rankings(view: StoreView) -> Dict[str, Any]:
     result = {"carbon_ranking": [], "sustainability_ranking": []}
 
-    if rankings:
-        rows = sorted(list(rankings), key=lambda r: r["total_carbon_kg"])
+    if view.has("rankings"):
+        rows = _rankings_by_carbon(view)
         result["carbon_ranking"] = [
             {
                 "rank": i + 1,
@@ -339,8 +802,8 @@ async def get_rankings():
             for i, r in enumerate(rows)
         ]
 
-    if sustainability:
-        rows = sorted(list(sustainability), key=lambda r: r.get("sustainability_score", 0), reverse=True)
+    if view.has("sustainability"):
+        rows = _sustainability_by_score(view)
         result["sustainability_ranking"] = [
             {
                 "rank": i + 1,
@@ -354,14 +817,17 @@ async def get_rankings():
     return result
 
 
-@app.get("/sustainability")
-async def get_sustainability():
-    sustainability = _tables.get("sustainability")
-    if sustainability is None:
-        return {"scores": []}
+@app.get("/rankings")
+async def get_rankings(request: Request):
+    return _cached_json(
+        request, "/rankings", ("rankings", "sustainability"),
+        lambda: _build_rankings(_store.view()), crisis=False,
+    )
+
 
+def _build_sustainability(view: StoreView) -> Dict[str, Any]:
     scores = []
-    for row in list(sustainability):
+    for row in _sustainability_by_score(view):
         scores.append({
             "vehicle_id": row["vehicle_id"],
             "score": round(row.get("sustainability_score", 0), 1),
@@ -373,137 +839,217 @@ async def get_sustainability():
     return {"scores": sorted(scores, key=lambda x: x["score"], reverse=True)}
 
 
+@app.get("/sustainability")
+async def get_sustainability(request: Request):
+    if not _store.has("sustainability"):
+        return {"scores": []}
+    return _cached_json(
+        request, "/sustainability", ("sustainability",),
+        lambda: _build_sustainability(_store.view()), crisis=False,
+    )
+
+
 @app.post("/ask", response_model=AskResponse)
 async def ask_question(req: AskRequest):
+    """
+    RAG question answering on a bounded worker pool.
+    Lookup questions the live tables answer exactly (rankings, scores,
+    states, forecasts, alert counts) skip the pool and the LLM entirely.
+    Identical concurrent questions share one engine call; when every
+    worker and queue slot is busy the request is rejected with 429.
+    """
+    if _intent_router is not None:
+        routed = _intent_router.answer(req.question)
+        if routed is not None:
+            return AskResponse(answer=routed["answer"], sources=routed["sources"])
+
     if _query_engine is None:
-        raise HTTPException(503, "RAG engine not ready")
+        raise _rag_unavailable()
 
     try:
-        result = _query_engine.answer(req.question)
+        result = await _ask_pool.submit(question_key(req.question), _query_engine.answer, req.question)
         return AskResponse(
             answer=result.get("answer", "I couldn't find relevant information."),
             sources=result.get("sources", []),
         )
+    except AskRejected:
+        raise HTTPException(429, "Too many questions in flight, retry shortly", headers={"Retry-After": "1"})
+    except asyncio.TimeoutError:
+        raise HTTPException(504, "Query timed out")
     except Exception as e:
         raise HTTPException(500, f"Query failed: {str(e)}")
 
 
+def _rag_unavailable() -> HTTPException:
+    if not config.rag.enabled:
+        return HTTPException(503, "RAG is disabled (--no-rag); only lookup questions are answered")
+    return HTTPException(503, "RAG engine not ready")
+
+
+def _answer_events(question: str):
+    """(event, payload) pairs for one streamed answer; runs on an ask worker thread."""
+    engine = _query_engine
+    if hasattr(engine, "stream"):
+        yield from engine.stream(question)
+        return
+    result = engine.answer(question)
+    yield "sources", result.get("sources", [])
+    yield "token", result.get("answer", "")
+
+
+async def _routed_events(routed: Dict[str, Any]):
+    yield "sources", routed["sources"]
+    yield "token", routed["answer"]
+
+
+@app.post("/ask/stream")
+async def ask_question_stream(req: AskRequest):
+    """
+    Streaming /ask (Server-Sent Events): a `sources` event as soon as
+    retrieval finishes, `token` events as the LLM generates, then `done`
+    with the full answer (or `error`). Fast-path answers arrive as one
+    token. Streams take an /ask pool slot each; 429 when saturated.
+    """
+    routed = _intent_router.answer(req.question) if _intent_router is not None else None
+    if routed is not None:
+        source = _routed_events(routed)
+    else:
+        if _query_engine is None:
+            raise _rag_unavailable()
+        try:
+            source = _ask_pool.stream(_answer_events, req.question)
+        except AskRejected:
+            raise HTTPException(429, "Too many questions in flight, retry shortly", headers={"Retry-After": "1"})
+
+    async def events():
+        parts = []
+        try:
+            async for event, payload in source:
+                if event == "sources":
+                    yield _sse("sources", {"sources": [str(item) for item in payload]})
+                else:
+                    parts.append(payload)
+                    yield _sse("token", {"text": payload})
+        except asyncio.TimeoutError:
+            yield _sse("error", {"detail": "Query timed out"})
+            return
+        except Exception as e:
+            yield _sse("error", {"detail": f"Query failed: {str(e)}"})
+            return
+        finally:
+            # Stops generation on the worker thread if the client went away
+            await source.aclose()
+        yield _sse("done", {"answer": "".join(parts)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # ──────────────────────────────────────────────
 # PART 1: Vehicle State Machine Endpoints
 # ──────────────────────────────────────────────
 
+def _build_vehicle_states(view: StoreView) -> List[VehicleStateResponse]:
+    states = [
+        VehicleStateResponse(**_format_vehicle_state(row))
+        for row in view.rows("vehicle_states")
+    ]
+
+    return sorted(states, key=lambda x: x.risk_score, reverse=True)
+
+
 @app.get("/vehicle-state", response_model=List[VehicleStateResponse])
-async def get_vehicle_states():
+async def get_vehicle_states(request: Request):
     """
     Current state for every vehicle in the fleet.
     Updated incrementally by Pathway whenever window metrics change.
     States: NORMAL | EFFICIENT | HIGH_EMISSION | ROUTE_DEVIATION | IDLE | CRITICAL_RISK
     """
-    vehicle_states = _tables.get("vehicle_states")
-    if vehicle_states is None:
+    if not _store.has("vehicle_states"):
         raise HTTPException(503, "State machine not ready")
+    return _cached_json(
+        request, "/vehicle-state", ("vehicle_states",),
+        lambda: _build_vehicle_states(_store.view()),
+    )
 
-    states = []
-    for row in list(vehicle_states):
-        current_state = row.get("current_state", "NORMAL")
-        transition_reason = row.get("transition_reason", "")
-        risk_level = row.get("risk_level", "low")
-        risk_score = round(row.get("risk_score", 0.0), 1)
-
-        if _is_crisis_vehicle(row.get("vehicle_id", "")):
-            intensity = _crisis_intensity()
-            current_state = "CRITICAL_RISK"
-            risk_level = "critical"
-            risk_score = min(100.0, round(max(risk_score, 85.0) + intensity * 12.0, 1))
-            transition_reason = "Simulated crisis mode active: emission + alerts + route deviation escalation"
-
-        states.append(VehicleStateResponse(
-            vehicle_id=row.get("vehicle_id", ""),
-            current_state=current_state,
-            previous_state=row.get("previous_state", "NORMAL"),
-            transition_reason=transition_reason,
-            risk_level=risk_level,
-            risk_score=risk_score,
-        ))
-
-    return sorted(states, key=lambda x: x.risk_score, reverse=True)
-
-
-@app.get("/state-history")
-async def get_state_history(vehicle_id: Optional[str] = None, limit: int = 50):
-    """
-    Append-only state transition history.
-    Optionally filter by vehicle_id.
-    """
-    state_history = _tables.get("state_history")
-    if state_history is None:
-        return {"history": []}
 
-    history = []
-    for row in list(state_history):
-        if vehicle_id and row.get("vehicle_id") != vehicle_id:
-            continue
-        history.append({
+def _build_state_history(
+    limit: int,
+    cursor: Optional[Entry],
+    since: Optional[float],
+    vehicle_id: Optional[str],
+) -> Dict[str, Any]:
+    rows, next_position = _indexes["state_history"].page(
+        limit, cursor=cursor, since=since, where={"vehicle_id": vehicle_id}
+    )
+    history = [
+        {
             "vehicle_id": row.get("vehicle_id", ""),
             "state": row.get("state", ""),
             "risk_level": row.get("risk_level", ""),
             "reason": row.get("reason", ""),
-        })
+        }
+        for row in rows
+    ]
 
-    return {"history": history[:limit]}
+    return {"history": history, "next_cursor": _next_cursor(next_position)}
 
 
-@app.get("/risk-breakdown")
-async def get_risk_breakdown():
-    risk_scores = _tables.get("risk_scores")
-    if risk_scores is None:
-        raise HTTPException(503, "Risk scoring not ready")
+@app.get("/state-history")
+async def get_state_history(
+    request: Request,
+    vehicle_id: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    since: Optional[str] = None,
+):
+    """
+    Append-only state transition history, newest first.
+    Optionally filter by vehicle_id; paginate with next_cursor.
+    """
+    if "state_history" not in _indexes:
+        return {"history": [], "next_cursor": None}
+    limit, position, since_ts = _page_params(limit, cursor, since)
+    return _cached_json(
+        request,
+        _query_key("/state-history", limit=limit, cursor=cursor, since=since, vehicle_id=vehicle_id),
+        ("state_history",),
+        lambda: _build_state_history(limit, position, since_ts, vehicle_id),
+        crisis=False,
+    )
 
-    formula = "Risk Score = 0.35(alerts) + 0.25(efficiency) + 0.25(carbon) + 0.15(status)"
-    rows = []
-    for row in list(risk_scores):
-        risk_score = round(row.get("risk_score", 0.0), 1)
-        alert_pct = round(row.get("alert_impact_pct", 0.0), 2)
-        efficiency_pct = round(row.get("efficiency_impact_pct", 0.0), 2)
-        carbon_pct = round(row.get("carbon_impact_pct", 0.0), 2)
-        status_pct = round(row.get("status_impact_pct", 0.0), 2)
-
-        if _is_crisis_vehicle(row.get("vehicle_id", "")):
-            intensity = _crisis_intensity()
-            risk_score = min(100.0, round(max(risk_score, 88.0) + intensity * 10.0, 1))
-            alert_pct = round(min(100.0, alert_pct + intensity * 8.0), 2)
-            carbon_pct = round(min(100.0, carbon_pct + intensity * 6.0), 2)
-
-        rows.append(
-            {
-                "vehicle_id": row.get("vehicle_id", ""),
-                "risk_score": risk_score,
-                "alert_impact_pct": alert_pct,
-                "efficiency_impact_pct": efficiency_pct,
-                "carbon_impact_pct": carbon_pct,
-                "status_impact_pct": status_pct,
-                "formula": formula,
-            }
-        )
+
+def _build_risk_breakdown(view: StoreView) -> Dict[str, Any]:
+    rows = [_format_risk_breakdown(row) for row in view.rows("risk_scores")]
 
     return {
-        "formula": formula,
+        "formula": RISK_FORMULA,
         "breakdown": sorted(rows, key=lambda x: x["risk_score"], reverse=True),
     }
 
 
-@app.get("/state-explanation/{vehicle_id}")
-async def get_state_explanation(vehicle_id: str):
-    states = {row.get("vehicle_id", ""): row for row in _safe_rows("vehicle_states")}
-    predictions = {row.get("vehicle_id", ""): row for row in _safe_rows("predictions")}
-    risk_rows = {row.get("vehicle_id", ""): row for row in _safe_rows("risk_scores")}
+@app.get("/risk-breakdown")
+async def get_risk_breakdown(request: Request):
+    if not _store.has("risk_scores"):
+        raise HTTPException(503, "Risk scoring not ready")
+    return _cached_json(
+        request, "/risk-breakdown", ("risk_scores",),
+        lambda: _build_risk_breakdown(_store.view()),
+    )
+
 
-    state_row = states.get(vehicle_id)
+def _explain_vehicle(vehicle_id: str) -> Optional[Dict[str, Any]]:
+    """Transition reasoning for one vehicle, or None if it has no state yet."""
+    joined = _vehicle_index.get(vehicle_id)
+    state_row = joined["state"]
     if state_row is None:
-        raise HTTPException(404, f"Vehicle {vehicle_id} not found")
+        return None
 
-    pred_row = predictions.get(vehicle_id, {})
-    risk_row = risk_rows.get(vehicle_id, {})
+    pred_row = joined["prediction"] or {}
+    risk_row = joined["risk"] or {}
 
     current_state = state_row.get("current_state", "NORMAL")
     previous_state = state_row.get("previous_state", "NORMAL")
@@ -534,12 +1080,55 @@ async def get_state_explanation(vehicle_id: str):
     }
 
 
+def _build_state_explanation(vehicle_id: str) -> Dict[str, Any]:
+    explanation = _explain_vehicle(vehicle_id)
+    if explanation is None:
+        raise HTTPException(404, f"Vehicle {vehicle_id} not found")
+    return explanation
+
+
+@app.get("/state-explanation/{vehicle_id}")
+async def get_state_explanation(vehicle_id: str, request: Request):
+    return _cached_json(
+        request,
+        f"/state-explanation/{vehicle_id}",
+        VEHICLE_INDEX_TABLES,
+        lambda: _build_state_explanation(vehicle_id),
+    )
+
+
+@app.post("/state-explanations")
+async def get_state_explanations(req: StateExplanationsRequest):
+    """
+    Batch form of /state-explanation: one O(1) index lookup per vehicle.
+    Unknown vehicles are listed under `missing`.
+    """
+    explanations = []
+    missing = []
+    for vehicle_id in dict.fromkeys(req.vehicle_ids):
+        explanation = _explain_vehicle(vehicle_id)
+        if explanation is None:
+            missing.append(vehicle_id)
+        else:
+            explanations.append(explanation)
+    return {"explanations": explanations, "missing": missing}
+
+
 # ──────────────────────────────────────────────
 # PART 2: Prediction Endpoints
 # ──────────────────────────────────────────────
 
+def _build_predictions(view: StoreView) -> List[PredictionResponse]:
+    results = [
+        PredictionResponse(**_format_prediction(row))
+        for row in view.rows("predictions")
+    ]
+
+    return sorted(results, key=lambda x: x.risk_escalation_probability, reverse=True)
+
+
 @app.get("/predictions", response_model=List[PredictionResponse])
-async def get_predictions():
+async def get_predictions(request: Request):
     """
     Real-time predictive forecasts per vehicle.
     - predicted_carbon_10min: Carbon output predicted 10 min from now (kg)
@@ -547,51 +1136,20 @@ async def get_predictions():
     - risk_escalation_probability: Probability of risk increasing (0-1)
     - fuel_exhaustion_minutes: Minutes until critically low fuel (-1 = safe)
     """
-    predictions = _tables.get("predictions")
-    if predictions is None:
+    if not _store.has("predictions"):
         raise HTTPException(503, "Forecasting engine not ready")
-
-    results = []
-    for row in list(predictions):
-        predicted_carbon = round(row.get("predicted_carbon_10min", 0.0), 2)
-        predicted_risk = round(row.get("predicted_risk_score", 0.0), 1)
-        escalation = round(row.get("risk_escalation_probability", 0.0), 3)
-        fuel_eta = round(row.get("fuel_exhaustion_minutes", -1.0), 1)
-
-        if _is_crisis_vehicle(row.get("vehicle_id", "")):
-            intensity = _crisis_intensity()
-            predicted_carbon = round(predicted_carbon * (1.2 + intensity * 0.6), 2)
-            predicted_risk = round(min(100.0, max(predicted_risk, 88.0) + intensity * 10.0), 1)
-            escalation = round(min(0.99, max(escalation, 0.78) + intensity * 0.15), 3)
-            fuel_eta = round(min(59.0, max(10.0, fuel_eta * (0.55 - intensity * 0.15))), 1)
-
-        results.append(PredictionResponse(
-            vehicle_id=row.get("vehicle_id", ""),
-            predicted_carbon_10min=predicted_carbon,
-            predicted_risk_score=predicted_risk,
-            risk_escalation_probability=escalation,
-            fuel_exhaustion_minutes=fuel_eta,
-        ))
-
-    return sorted(results, key=lambda x: x.risk_escalation_probability, reverse=True)
+    return _cached_json(
+        request, "/predictions", ("predictions",),
+        lambda: _build_predictions(_store.view()),
+    )
 
 
 # ──────────────────────────────────────────────
 # PART 3: Fleet Intelligence Report Endpoints
 # ──────────────────────────────────────────────
 
-@app.get("/fleet-report/latest", response_model=FleetReportResponse)
-async def get_latest_fleet_report():
-    """
-    Latest auto-generated fleet intelligence report.
-    Generated every 5 minutes by Pathway's tumbling window engine.
-    No cron job — fully event-driven.
-    """
-    latest_report = _tables.get("latest_report")
-    if latest_report is None:
-        raise HTTPException(503, "Report generator not ready")
-
-    rows = list(latest_report)
+def _build_latest_report(view: StoreView) -> FleetReportResponse:
+    rows = view.rows("latest_report")
     if not rows:
         raise HTTPException(404, "No reports generated yet")
 
@@ -620,18 +1178,25 @@ async def get_latest_fleet_report():
     )
 
 
-@app.get("/fleet-report/history")
-async def get_fleet_report_history(limit: int = 10):
+@app.get("/fleet-report/latest", response_model=FleetReportResponse)
+async def get_latest_fleet_report(request: Request):
     """
-    Historical fleet intelligence reports (last N reports).
-    Appended automatically every 5 minutes by the streaming engine.
+    Latest auto-generated fleet intelligence report.
+    Generated every 5 minutes by Pathway's tumbling window engine.
+    No cron job — fully event-driven.
     """
-    report_history = _tables.get("report_history")
-    if report_history is None:
-        return {"reports": []}
+    if not _store.has("latest_report"):
+        raise HTTPException(503, "Report generator not ready")
+    return _cached_json(
+        request, "/fleet-report/latest", ("latest_report",),
+        lambda: _build_latest_report(_store.view()),
+    )
+
 
+def _build_report_history(limit: int, cursor: Optional[Entry], since: Optional[float]) -> Dict[str, Any]:
+    rows, next_position = _indexes["report_history"].page(limit, cursor=cursor, since=since)
     reports = []
-    for row in list(report_history):
+    for row in rows:
         fleet_health = row.get("fleet_health", "unknown")
         if _crisis_state.get("enabled"):
             fleet_health = "degraded"
@@ -645,14 +1210,97 @@ async def get_fleet_report_history(limit: int = 10):
             "executive_summary": row.get("executive_summary", ""),
         })
 
-    return {"reports": reports[:limit]}
+    return {"reports": reports, "next_cursor": _next_cursor(next_position)}
+
+
+@app.get("/fleet-report/history")
+async def get_fleet_report_history(
+    request: Request,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    since: Optional[str] = None,
+):
+    """
+    Historical fleet intelligence reports, newest first (N per page).
+    Appended automatically every 5 minutes by the streaming engine.
+    """
+    if "report_history" not in _indexes:
+        return {"reports": [], "next_cursor": None}
+    limit, position, since_ts = _page_params(limit, cursor, since)
+    return _cached_json(
+        request,
+        _query_key("/fleet-report/history", limit=limit, cursor=cursor, since=since),
+        ("report_history",),
+        lambda: _build_report_history(limit, position, since_ts),
+    )
+
+
+# ──────────────────────────────────────────────
+# Composite dashboard endpoint
+# ──────────────────────────────────────────────
+
+# section → (source tables, crisis-aware, table required to build it, builder)
+DASHBOARD_SECTIONS: Dict[str, Tuple[Tuple[str, ...], bool, Optional[str], Callable[[StoreView], Any]]] = {
+    "metrics": (("rankings", "all_alerts"), False, "rankings", _build_metrics),
+    "alerts": (("all_alerts",), True, "all_alerts", _build_latest_alerts),
+    "rankings": (("rankings", "sustainability"), False, None, _build_rankings),
+    "sustainability": (("sustainability",), False, "sustainability", _build_sustainability),
+    "vehicle_states": (("vehicle_states",), True, "vehicle_states", _build_vehicle_states),
+    "predictions": (("predictions",), True, "predictions", _build_predictions),
+    "risk_breakdown": (("risk_scores",), True, "risk_scores", _build_risk_breakdown),
+    "fleet_report": (("latest_report",), True, "latest_report", _build_latest_report),
+}
+
+
+def _build_dashboard(selected: List[str], view: StoreView) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {}
+    for name in selected:
+        _, _, required, build = DASHBOARD_SECTIONS[name]
+        if required is not None and not view.has(required):
+            payload[name] = None
+            continue
+        try:
+            payload[name] = build(view)
+        except HTTPException:
+            # e.g. no fleet report generated yet — the panel shows its empty state
+            payload[name] = None
+    payload["versions"] = view.versions()
+    return payload
+
+
+@app.get("/dashboard")
+async def get_dashboard(request: Request, sections: Optional[str] = None):
+    """
+    Every dashboard panel in one round trip.
+    All sections are built from one view of the snapshot store, sharing
+    sorted/formatted intermediates; `versions` reports the table versions
+    they were built from. sections= (comma-separated) selects a subset.
+    """
+    if sections:
+        requested = {name.strip() for name in sections.split(",") if name.strip()}
+        unknown = requested - set(DASHBOARD_SECTIONS)
+        if unknown:
+            raise HTTPException(400, f"Unknown sections: {', '.join(sorted(unknown))}")
+        selected = [name for name in DASHBOARD_SECTIONS if name in requested]
+    else:
+        selected = list(DASHBOARD_SECTIONS)
+
+    tables = sorted({table for name in selected for table in DASHBOARD_SECTIONS[name][0]})
+    # Pinned before the ETag is derived, so the tag and every section share one set of versions
+    view = _store.view(tables)
+    return _cached_json(
+        request,
+        _query_key("/dashboard", sections=",".join(selected)),
+        tables,
+        lambda: _build_dashboard(selected, view),
+        crisis=any(DASHBOARD_SECTIONS[name][1] for name in selected),
+        view=view,
+    )
 
 
 @app.post("/simulate-crisis")
 async def simulate_crisis(req: CrisisRequest):
-    _crisis_state["enabled"] = True
-    _crisis_state["vehicle_id"] = req.vehicle_id
-    _crisis_state["started_at"] = time.time()
+    _set_crisis_state(True, req.vehicle_id)
     return {
         "status": "enabled",
         "vehicle_id": req.vehicle_id,
@@ -663,9 +1311,7 @@ async def simulate_crisis(req: CrisisRequest):
 @app.post("/stop-crisis")
 async def stop_crisis():
     prev_vehicle = _crisis_state.get("vehicle_id")
-    _crisis_state["enabled"] = False
-    _crisis_state["vehicle_id"] = None
-    _crisis_state["started_at"] = None
+    _set_crisis_state(False, None)
     return {
         "status": "disabled",
         "vehicle_id": prev_vehicle,
@@ -678,14 +1324,15 @@ async def health():
     return {
         "status": "healthy",
         "version": "2.0.0",
-        "tables_registered": list(_tables.keys()),
+        "tables_registered": _store.names(),
         "rag_ready": _query_engine is not None,
+        "rag_enabled": config.rag.enabled,
         "features": {
-            "state_machine": "vehicle_states" in _tables,
-            "forecasting": "predictions" in _tables,
-            "fleet_reports": "latest_report" in _tables,
+            "state_machine": _store.has("vehicle_states"),
+            "forecasting": _store.has("predictions"),
+            "fleet_reports": _store.has("latest_report"),
             "pipeline_metrics": True,
-            "risk_explainability": "risk_scores" in _tables,
+            "risk_explainability": _store.has("risk_scores"),
             "crisis_mode": _crisis_state.get("enabled", False),
         },
     }
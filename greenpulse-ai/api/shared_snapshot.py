@@ -0,0 +1,378 @@
+"""
+API — Cross-Process Snapshot Sharing
+
+Lets the API run in separate worker processes from the Pathway engine.
+The pipeline process publishes every table snapshot as a file under a
+shared-memory directory (/dev/shm by default); each API worker follows
+those files into its own SnapshotStore.
+
+WHY SEPARATE PROCESSES:
+- Request handling and the dataflow's Python UDFs no longer share a GIL,
+  so a busy dashboard cannot stall event processing (window latency)
+- Reads scale with the number of uvicorn workers, i.e. with cores
+
+WHY FILES IN /dev/shm:
+- tmpfs pages live in RAM, so publishing and loading never touch disk
+- Only the tables the API serves are shared, as deltas: each served
+  table is a base snapshot plus an append-only log of the commits made
+  since, so a publish costs O(rows changed), not O(table)
+- The log is compacted into a new base once it outgrows the last one,
+  which keeps both the files and a new worker's catch-up bounded
+- A manifest of table versions and log sizes is replaced last; workers
+  poll only the manifest and read just the log bytes it covers
+- The publisher runs on its own thread and coalesces bursts of commits,
+  so the engine thread only queues each commit's diff list
+- Tables the pipeline only counts (raw inputs, telemetry) are not
+  shared at all; the pipeline's stats travel in the manifest instead
+
+Followers replay each logged commit through TableSnapshot.apply under
+the version the pipeline gave it, so indexes, counters and the push
+feed in the worker behave exactly as in the single-process mode, and
+every worker derives the same ETag from the same data.
+"""
+import datetime
+import io
+import json
+import os
+import pickle
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .snapshots import Change, SnapshotStore, TableSnapshot
+
+
+MANIFEST = "manifest.json"
+CRISIS = "crisis.json"
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as handle:
+        handle.write(data)
+    os.replace(tmp, path)
+
+
+def _plain(value: Any) -> Any:
+    """Convert engine values (pw.Json, pandas timestamps, pointers) to stdlib types."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return type(value)(_plain(item) for item in value)
+    if isinstance(value, dict):
+        return {str(key): _plain(item) for key, item in value.items()}
+    if hasattr(value, "to_pydatetime"):
+        return value.to_pydatetime()
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.timedelta)):
+        return value
+    if hasattr(value, "value") and type(value).__name__ == "Json":
+        return _plain(value.value)
+    return str(value)
+
+
+def read_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "rb") as handle:
+            return json.loads(handle.read())
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path: str, payload: Dict[str, Any]) -> None:
+    _atomic_write(path, json.dumps(payload).encode())
+
+
+class _Segment:
+    """One served table's base snapshot plus the log of commits appended after it."""
+
+    def __init__(self, directory: str, name: str, number: int, version: int, rows: Dict[str, Any]):
+        self.number = number
+        self.base_version = version
+        self.version = version
+        self.log_path = os.path.join(directory, _log_name(name, number))
+        data = pickle.dumps((version, rows), pickle.HIGHEST_PROTOCOL)
+        _atomic_write(os.path.join(directory, _base_name(name, number)), data)
+        self.base_bytes = len(data)
+        with open(self.log_path, "wb"):
+            pass
+        self.size = 0
+
+    def append(self, records: List[Tuple[int, List[Change]]]) -> None:
+        data = pickle.dumps(records, pickle.HIGHEST_PROTOCOL)
+        with open(self.log_path, "ab") as handle:
+            handle.write(data)
+        self.size += len(data)
+        self.version = records[-1][0]
+
+    def entry(self) -> Dict[str, Any]:
+        return {
+            "served": True,
+            "version": self.version,
+            "segment": self.number,
+            "base_version": self.base_version,
+            "size": self.size,
+        }
+
+
+class SnapshotPublisher:
+    """Pipeline side: writes the served tables' commits to the shared directory."""
+
+    # Logs shorter than this are never compacted, however small the base
+    MIN_COMPACT_BYTES = 1 << 20
+
+    def __init__(
+        self,
+        store: SnapshotStore,
+        directory: str,
+        interval_ms: int = 200,
+        stats: Optional[Callable[[], Dict[str, Any]]] = None,
+    ):
+        self.store = store
+        self.directory = directory
+        self.interval = interval_ms / 1000.0
+        self.stats = stats
+        self._served = [name for name in store.names() if store.get(name).materialize]
+        self._pending: Dict[str, List[Tuple[int, List[Change]]]] = {name: [] for name in self._served}
+        self._segments: Dict[str, _Segment] = {}
+        self._dirty = True
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SnapshotPublisher":
+        os.makedirs(self.directory, exist_ok=True)
+        # Leftovers of a previous run must not be served before the first publish
+        for stale in os.listdir(self.directory):
+            if stale == CRISIS or stale == MANIFEST or stale.endswith((".snap", ".log")):
+                try:
+                    os.remove(os.path.join(self.directory, stale))
+                except FileNotFoundError:
+                    pass
+        for name in self.store.names():
+            self.store.get(name).add_listener(self._on_commit)
+        for name in self._served:
+            self._compact(name, 0)
+        self._thread = threading.Thread(target=self._run, name="snapshot-publisher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    # Runs on the Pathway engine thread: only queue the commit
+    def _on_commit(self, snapshot: TableSnapshot, changes: List[Change], commit_time: Optional[int]) -> None:
+        with self._lock:
+            self._dirty = True
+            if snapshot.materialize:
+                self._pending[snapshot.name].append((snapshot.version, changes))
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.publish()
+
+    def publish(self) -> None:
+        # Logs due for compaction: take the new base before the queued commits,
+        # so the old log can be completed up to exactly the base's version
+        bases = {
+            name: self.store.get(name).checkpoint()
+            for name, segment in self._segments.items()
+            if segment.size > max(segment.base_bytes, self.MIN_COMPACT_BYTES)
+        }
+        with self._lock:
+            if not self._dirty and not bases:
+                return
+            pending = self._pending
+            self._pending = {name: [] for name in self._served}
+            self._dirty = False
+        for name in self._served:
+            commits = pending[name]
+            base = bases.get(name)
+            if base is not None:
+                self._append(name, [commit for commit in commits if commit[0] <= base[0]])
+                self._compact(name, self._segments[name].number + 1, base)
+            self._append(name, commits)
+        tables = {name: segment.entry() for name, segment in self._segments.items()}
+        for name in self.store.names():
+            if name not in tables:
+                tables[name] = {"served": False, "version": self.store.version(name)}
+        write_json(
+            os.path.join(self.directory, MANIFEST),
+            {
+                "epoch": self.store.epoch,
+                "tables": tables,
+                "stats": self.stats() if self.stats is not None else None,
+                "published_at": time.time(),
+                "pid": os.getpid(),
+            },
+        )
+
+    def _append(self, name: str, commits: List[Tuple[int, List[Change]]]) -> None:
+        segment = self._segments[name]
+        # Commits already in the segment (its base was taken while they were queued) are skipped
+        records = [
+            (version, [(str(key), _plain(row), is_addition) for key, row, is_addition in changes])
+            for version, changes in commits
+            if version > segment.version
+        ]
+        if records:
+            segment.append(records)
+
+    def _compact(self, name: str, number: int, base: Optional[Tuple[int, List[Tuple[Any, Dict[str, Any]]]]] = None) -> None:
+        """Start segment `number` from `base` (the table's current rows by default)."""
+        version, items = base if base is not None else self.store.get(name).checkpoint()
+        rows = {str(key): _plain(row) for key, row in items}
+        self._segments[name] = _Segment(self.directory, name, number, version, rows)
+        # Followers may still be reading the previous segment; older ones are gone
+        for stale in (_base_name(name, number - 2), _log_name(name, number - 2)):
+            try:
+                os.remove(os.path.join(self.directory, stale))
+            except FileNotFoundError:
+                pass
+
+
+class SnapshotFollower:
+    """Worker side: mirrors the published tables into a local SnapshotStore."""
+
+    def __init__(
+        self,
+        directory: str,
+        poll_ms: int = 100,
+        on_crisis: Optional[Callable[[Dict[str, Any]], None]] = None,
+        on_stats: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        self.directory = directory
+        self.poll = poll_ms / 1000.0
+        self.on_crisis = on_crisis
+        self.on_stats = on_stats
+        self.store = SnapshotStore()
+        # table → (segment, bytes of its log already applied)
+        self._positions: Dict[str, Tuple[int, int]] = {}
+        self._crisis_mtime: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def wait_for_manifest(self, timeout: Optional[float] = None) -> bool:
+        """Block until the pipeline has published once, then create the tables."""
+        deadline = None if timeout is None else time.time() + timeout
+        while not self._stop.is_set():
+            manifest = read_json(os.path.join(self.directory, MANIFEST))
+            if manifest is not None:
+                self.store.epoch = manifest["epoch"]
+                for name, entry in manifest.get("tables", {}).items():
+                    if not self.store.has(name):
+                        self.store.create(name, materialize=entry["served"])
+                return True
+            if deadline is not None and time.time() > deadline:
+                return False
+            self._stop.wait(self.poll)
+        return False
+
+    def start(self) -> "SnapshotFollower":
+        self._thread = threading.Thread(target=self._run, name="snapshot-follower", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sync()
+            except Exception:
+                # A half-written directory (e.g. during pipeline restart) is retried next poll
+                pass
+            self._stop.wait(self.poll)
+
+    def sync(self) -> None:
+        manifest = read_json(os.path.join(self.directory, MANIFEST))
+        if manifest is not None:
+            if manifest["epoch"] != self.store.epoch:
+                # The pipeline restarted: its versions start over, so reload every base
+                self.store.epoch = manifest["epoch"]
+                self._positions.clear()
+            for name, entry in manifest.get("tables", {}).items():
+                if entry["served"] and self.store.has(name):
+                    self._follow(name, entry)
+            if manifest.get("stats") and self.on_stats is not None:
+                self.on_stats(manifest["stats"])
+        self._sync_crisis()
+
+    def _follow(self, name: str, entry: Dict[str, Any]) -> None:
+        snapshot = self.store.get(name)
+        segment, offset = self._positions.get(name, (None, 0))
+        if segment is not None and segment != entry["segment"]:
+            # Finish the previous segment's log; if that reaches the new base, skip loading it
+            if segment == entry["segment"] - 1:
+                self._replay(snapshot, _log_name(name, segment), offset, None)
+            if snapshot.version != entry["base_version"]:
+                segment = None
+            else:
+                segment, offset = entry["segment"], 0
+        if segment is None:
+            self._load_base(snapshot, _base_name(name, entry["segment"]))
+            segment, offset = entry["segment"], 0
+        if entry["size"] > offset:
+            offset = self._replay(snapshot, _log_name(name, segment), offset, entry["size"])
+        self._positions[name] = (segment, offset)
+
+    def _load_base(self, snapshot: TableSnapshot, filename: str) -> None:
+        with open(os.path.join(self.directory, filename), "rb") as handle:
+            version, rows = pickle.load(handle)
+        # Only a new worker (empty table) or one that fell behind gets here
+        snapshot.apply(_diff(dict(snapshot.items()), rows), version=version)
+
+    def _replay(self, snapshot: TableSnapshot, filename: str, offset: int, end: Optional[int]) -> int:
+        """Apply the logged commits in [offset, end) (to the end of the file if None); returns the new offset."""
+        with open(os.path.join(self.directory, filename), "rb") as handle:
+            handle.seek(offset)
+            data = handle.read() if end is None else handle.read(end - offset)
+        stream = io.BytesIO(data)
+        while stream.tell() < len(data):
+            for version, changes in pickle.load(stream):
+                if version > snapshot.version:
+                    snapshot.apply(changes, version=version)
+        return offset + len(data)
+
+    def _sync_crisis(self) -> None:
+        if self.on_crisis is None:
+            return
+        path = crisis_path(self.directory)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._crisis_mtime:
+            return
+        state = read_json(path)
+        if state is not None:
+            self._crisis_mtime = mtime
+            self.on_crisis(state)
+
+
+def _diff(current: Dict[str, Dict[str, Any]], published: Dict[str, Dict[str, Any]]) -> List[Change]:
+    changes: List[Change] = [
+        (key, row, False) for key, row in current.items()
+        if published.get(key) != row
+    ]
+    changes.extend(
+        (key, row, True) for key, row in published.items()
+        if current.get(key) != row
+    )
+    return changes
+
+
+def _base_name(name: str, segment: int) -> str:
+    return f"{name}.{segment}.snap"
+
+
+def _log_name(name: str, segment: int) -> str:
+    return f"{name}.{segment}.log"
+
+
+def crisis_path(directory: str) -> str:
+    return os.path.join(directory, CRISIS)
@@ -0,0 +1,250 @@
+"""
+API — Materialized Table Snapshots
+
+Keeps an in-memory, keyed copy of every Pathway table registered with
+the API so request handlers never touch the live dataflow.
+
+WHY SUBSCRIPTIONS:
+- pw.io.subscribe delivers row-level diffs (key, row, is_addition) as the
+  engine commits them — no full table scans on the request path
+- Diffs are staged per commit and published on on_time_end, so readers
+  only ever see whole commits (a consistent view of each table)
+- A commit is folded into the keyed rows in place, in O(size of the
+  commit), under a short per-table lock; the tuple readers iterate is
+  rebuilt lazily, at most once per version, on the first read after it
+- Only the tables the API serves keep their rows: the raw, append-only
+  inputs (gps, fuel, telemetry, ...) are counted, not stored, so memory
+  does not grow with the length of the run
+- Listeners receive each published commit's diffs, so push feeds and
+  counters can follow the tables without re-reading them
+- A StoreView pins the published rows (and keys) of several tables at
+  once, so a multi-table response — its ETag included — is built from
+  one set of versions
+"""
+import threading
+import uuid
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# (key, row, is_addition) as delivered by pw.io.subscribe
+Change = Tuple[Any, Dict[str, Any], bool]
+
+# listener(snapshot, changes, commit_time), called after each publish
+Listener = Callable[["TableSnapshot", List[Change], Optional[int]], None]
+
+# (version, rows, (key, row) items) of one published commit
+Pinned = Tuple[int, Tuple[Dict[str, Any], ...], Tuple[Tuple[Any, Dict[str, Any]], ...]]
+
+
+class TableSnapshot:
+    """
+    Materialized view of a single Pathway table.
+
+    With materialize=False only the live row count is kept: listeners
+    still get every commit's diffs, but rows / get / items are empty.
+    """
+
+    def __init__(self, name: str, materialize: bool = True):
+        self.name = name
+        self.materialize = materialize
+        self.version = 0
+        self.last_commit_time: Optional[int] = None
+        self._by_key: Dict[Any, Dict[str, Any]] = {}
+        self._count = 0
+        # Tuples of the rows / items of _rows_version, rebuilt on read when stale
+        self._rows: Tuple[Dict[str, Any], ...] = ()
+        self._items: Tuple[Tuple[Any, Dict[str, Any]], ...] = ()
+        self._rows_version = 0
+        self._lock = threading.Lock()
+        self._pending: List[Change] = []
+        self._pending_lock = threading.Lock()
+        self._listeners: List[Listener] = []
+
+    # ── Writer side (Pathway engine thread) ──
+
+    def on_change(self, key: Any, row: Dict[str, Any], time: int, is_addition: bool) -> None:
+        with self._pending_lock:
+            self._pending.append((key, row, is_addition))
+
+    def on_time_end(self, time: int) -> None:
+        with self._pending_lock:
+            changes, self._pending = self._pending, []
+        if changes:
+            self.apply(changes, time)
+
+    def apply(self, changes: List[Change], time: Optional[int] = None, version: Optional[int] = None) -> None:
+        """
+        Fold one commit worth of diffs into the table and publish it.
+
+        Retractions are applied before insertions so that an update
+        (retract old value + insert new value under the same key) is
+        order-independent within the commit. `version` is set by
+        followers replaying another process's commits; by default the
+        version is incremented.
+        """
+        with self._lock:
+            if self.materialize:
+                by_key = self._by_key
+                for key, _, is_addition in changes:
+                    if not is_addition:
+                        by_key.pop(key, None)
+                for key, row, is_addition in changes:
+                    if is_addition:
+                        by_key[key] = row
+                self._count = len(by_key)
+            else:
+                added = sum(1 for _, _, is_addition in changes if is_addition)
+                self._count = max(0, self._count + 2 * added - len(changes))
+            self.last_commit_time = time
+            self.version = self.version + 1 if version is None else version
+
+        for listener in self._listeners:
+            try:
+                listener(self, changes, time)
+            except Exception:
+                # A misbehaving consumer must never stall the engine thread
+                pass
+
+    def add_listener(self, listener: Listener) -> None:
+        self._listeners.append(listener)
+
+    # ── Reader side (API handlers) ──
+
+    def pinned(self) -> Pinned:
+        """(version, rows, items) of the same published commit."""
+        with self._lock:
+            if self._rows_version != self.version:
+                self._items = tuple(self._by_key.items())
+                self._rows = tuple(row for _, row in self._items)
+                self._rows_version = self.version
+            return self.version, self._rows, self._items
+
+    @property
+    def rows(self) -> Tuple[Dict[str, Any], ...]:
+        return self.pinned()[1]
+
+    def checkpoint(self) -> Tuple[int, List[Tuple[Any, Dict[str, Any]]]]:
+        """(version, items) of the same published commit."""
+        with self._lock:
+            return self.version, list(self._by_key.items())
+
+    def get(self, key: Any) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._by_key.get(key)
+
+    def items(self) -> List[Tuple[Any, Dict[str, Any]]]:
+        with self._lock:
+            return list(self._by_key.items())
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.rows)
+
+
+class SnapshotStore:
+    """Registry of TableSnapshots, one per table registered with the API."""
+
+    def __init__(self):
+        self._snapshots: Dict[str, TableSnapshot] = {}
+        # Identifies the pipeline run the versions belong to; part of every ETag
+        self.epoch = uuid.uuid4().hex[:12]
+
+    def create(self, name: str, materialize: bool = True) -> TableSnapshot:
+        """Register an empty snapshot under `name`, fed through TableSnapshot.apply."""
+        snapshot = TableSnapshot(name, materialize)
+        self._snapshots[name] = snapshot
+        return snapshot
+
+    def attach(self, name: str, table: Any, materialize: bool = True) -> TableSnapshot:
+        """Subscribe to a pw.Table and start materializing (or counting) it under `name`."""
+        import pathway as pw
+
+        snapshot = self.create(name, materialize)
+        pw.io.subscribe(
+            table,
+            on_change=snapshot.on_change,
+            on_time_end=snapshot.on_time_end,
+        )
+        return snapshot
+
+    def has(self, name: str) -> bool:
+        return name in self._snapshots
+
+    def names(self) -> List[str]:
+        return list(self._snapshots.keys())
+
+    def get(self, name: str) -> Optional[TableSnapshot]:
+        return self._snapshots.get(name)
+
+    def rows(self, name: str) -> Tuple[Dict[str, Any], ...]:
+        snapshot = self._snapshots.get(name)
+        return snapshot.rows if snapshot is not None else ()
+
+    def version(self, name: str) -> int:
+        snapshot = self._snapshots.get(name)
+        return snapshot.version if snapshot is not None else 0
+
+    def view(self, names: Iterable[str] = ()) -> "StoreView":
+        return StoreView(self, names)
+
+
+class StoreView:
+    """
+    One read of the store: each table's (version, rows) captured once.
+
+    Tables listed up front are pinned together; any other table is pinned
+    on first access. memo() shares derived values between the sections
+    of a response built from the same view.
+    """
+
+    def __init__(self, store: SnapshotStore, names: Iterable[str] = ()):
+        self._store = store
+        self._pinned: Dict[str, Pinned] = {}
+        self._memo: Dict[str, Any] = {}
+        for name in names:
+            self._pin(name)
+
+    def _pin(self, name: str) -> Pinned:
+        pinned = self._pinned.get(name)
+        if pinned is None:
+            snapshot = self._store.get(name)
+            pinned = snapshot.pinned() if snapshot is not None else (0, (), ())
+            self._pinned[name] = pinned
+        return pinned
+
+    def has(self, name: str) -> bool:
+        return self._store.has(name)
+
+    def rows(self, name: str) -> Tuple[Dict[str, Any], ...]:
+        return self._pin(name)[1]
+
+    def items(self, name: str) -> Tuple[Tuple[Any, Dict[str, Any]], ...]:
+        """(key, row) pairs of the same pinned version as rows(name)."""
+        return self._pin(name)[2]
+
+    def version(self, name: str) -> int:
+        return self._pin(name)[0]
+
+    def versions(self) -> Dict[str, int]:
+        return {name: version for name, (version, _, _) in self._pinned.items()}
+
+    def memo(self, key: str, compute: Callable[[], Any]) -> Any:
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+
+def build_snapshot_store(tables: Dict[str, Any], served: Optional[Iterable[str]] = None) -> SnapshotStore:
+    """
+    Create a SnapshotStore subscribed to every non-None table. Only the
+    `served` tables keep their rows (all of them when None); the rest
+    are counted.
+    """
+    served = None if served is None else set(served)
+    store = SnapshotStore()
+    for name, table in tables.items():
+        if table is not None:
+            store.attach(name, table, materialize=served is None or name in served)
+    return store
@@ -0,0 +1,63 @@
+"""
+API — Per-Vehicle Index
+
+Maintains vehicle_id → (state, prediction, risk) rows from the snapshot
+listeners of the per-vehicle tables, so explanation lookups are O(1)
+per vehicle instead of re-keying three whole tables on every request.
+
+WHY A MAINTAINED INDEX:
+- Each commit touches only the vehicles it changed; a lookup never scans
+- Rows are tracked with their Pathway key, so a retraction only clears
+  a vehicle's entry if it still holds the retracted row (an update that
+  arrives as retract + insert can never leave the vehicle empty)
+"""
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from .snapshots import Change, SnapshotStore, TableSnapshot
+
+
+class VehicleIndex:
+    """vehicle_id → {field: row} over several tables keyed one row per vehicle."""
+
+    def __init__(self, tables: Dict[str, str]):
+        # field name in the joined entry → snapshot table name
+        self.tables = tables
+        self._fields = {table: field for field, table in tables.items()}
+        self._rows: Dict[str, Dict[str, Tuple[Any, Dict[str, Any]]]] = {field: {} for field in tables}
+        self._lock = threading.Lock()
+
+    def attach(self, store: SnapshotStore) -> None:
+        for field, table in self.tables.items():
+            snapshot = store.get(table)
+            if snapshot is None:
+                continue
+            self._on_commit(snapshot, [(key, row, True) for key, row in snapshot.items()], None)
+            snapshot.add_listener(self._on_commit)
+
+    # Runs on the Pathway engine thread
+    def _on_commit(self, snapshot: TableSnapshot, changes: List[Change], commit_time: Optional[int]) -> None:
+        field = self._fields.get(snapshot.name)
+        if field is None:
+            return
+        by_vehicle = self._rows[field]
+        with self._lock:
+            for key, row, is_addition in changes:
+                if is_addition:
+                    continue
+                vehicle_id = row.get("vehicle_id", "")
+                current = by_vehicle.get(vehicle_id)
+                if current is not None and current[0] == key:
+                    del by_vehicle[vehicle_id]
+            for key, row, is_addition in changes:
+                if is_addition:
+                    by_vehicle[row.get("vehicle_id", "")] = (key, row)
+
+    def get(self, vehicle_id: str) -> Dict[str, Optional[Dict[str, Any]]]:
+        """The joined rows for one vehicle; a field is None if that table has no row yet."""
+        with self._lock:
+            entries = {field: rows.get(vehicle_id) for field, rows in self._rows.items()}
+        return {field: entry[1] if entry is not None else None for field, entry in entries.items()}
+
+    def __contains__(self, vehicle_id: str) -> bool:
+        return any(vehicle_id in rows for rows in self._rows.values())
@@ -0,0 +1,75 @@
+"""
+API — Worker Process Entry Point (--api-mode process)
+
+uvicorn imports `api.worker:app` in each of its worker processes. On
+startup a worker waits for the pipeline's first snapshot publish, then
+serves every read endpoint from a local SnapshotStore that follows the
+shared-memory snapshots. /ask is forwarded to the pipeline process,
+which owns the RAG engine and the document index; /ask/stream is
+relayed from the pipeline's stream event by event.
+"""
+import json
+from typing import Any, Dict, Iterator, Tuple
+
+import httpx
+
+from config import config
+
+from . import server
+from .shared_snapshot import SnapshotFollower
+
+app = server.app
+
+
+class RemoteQueryEngine:
+    """Query-engine stand-in that forwards questions to the pipeline process."""
+
+    def __init__(self, url: str, timeout: float):
+        self.url = url
+        self.timeout = timeout
+
+    def answer(self, question: str) -> Dict[str, Any]:
+        response = httpx.post(self.url, json={"question": question}, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def stream(self, question: str) -> Iterator[Tuple[str, Any]]:
+        """Re-emits the pipeline's /ask/stream events as (event, payload) pairs."""
+        event = None
+        with httpx.stream("POST", f"{self.url}/stream", json={"question": question}, timeout=self.timeout) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line.startswith("event: "):
+                    event = line[len("event: "):]
+                elif line.startswith("data: ") and event is not None:
+                    data = json.loads(line[len("data: "):])
+                    if event == "sources":
+                        yield "sources", data["sources"]
+                    elif event == "token":
+                        yield "token", data["text"]
+                    elif event == "error":
+                        raise RuntimeError(data.get("detail", "remote query failed"))
+
+
+def _follow_pipeline() -> None:
+    follower = SnapshotFollower(
+        config.api.shared_snapshot_dir,
+        poll_ms=config.api.snapshot_poll_ms,
+        on_crisis=server.load_crisis_state,
+        on_stats=server.load_pipeline_stats,
+    )
+    follower.wait_for_manifest()
+    server.register_store(
+        follower.store,
+        query_engine=RemoteQueryEngine(
+            f"http://127.0.0.1:{config.api.internal_port}/ask",
+            config.api.ask_timeout_sec,
+        ),
+        remote_stats=True,
+    )
+    server.share_crisis_state(config.api.shared_snapshot_dir)
+    follower.sync()
+    follower.start()
+
+
+app.add_event_handler("startup", _follow_pipeline)
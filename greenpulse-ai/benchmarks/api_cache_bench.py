@@ -0,0 +1,191 @@
+"""
+Benchmark — pre-serialized response cache on the read endpoints.
+
+Fills the API's snapshot store with a synthetic fleet, then drives the
+read endpoints in-process (httpx ASGI transport) with --concurrency
+clients for --duration seconds, once with the response cache disabled
+and once enabled. A writer thread commits to one table every
+--commit-ms so the cached endpoints also pay for real invalidations.
+
+Reports p50 / p99 latency and requests per second for both runs.
+
+Usage (from greenpulse-ai/):
+    python benchmarks/api_cache_bench.py
+    python benchmarks/api_cache_bench.py --vehicles 500 --concurrency 64 --duration 10
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx  # noqa: E402
+
+from api import server  # noqa: E402
+from api.response_cache import ResponseCache  # noqa: E402
+from api.snapshots import SnapshotStore  # noqa: E402
+
+
+ENDPOINTS = [
+    "/metrics",
+    "/alerts",
+    "/rankings",
+    "/sustainability",
+    "/vehicle-state",
+    "/risk-breakdown",
+    "/predictions",
+    "/state-history?limit=50",
+]
+
+STATES = ["NORMAL", "EFFICIENT", "HIGH_EMISSION", "ROUTE_DEVIATION", "IDLE", "CRITICAL_RISK"]
+
+
+def _vehicle_rows(vehicle_id: str, rng: random.Random) -> dict:
+    risk = rng.uniform(0, 100)
+    return {
+        "rankings": {
+            "vehicle_id": vehicle_id,
+            "total_carbon_kg": rng.uniform(10, 500),
+            "avg_efficiency": rng.uniform(2, 9),
+            "avg_speed": rng.uniform(20, 90),
+            "total_distance": rng.uniform(50, 900),
+        },
+        "sustainability": {
+            "vehicle_id": vehicle_id,
+            "sustainability_score": rng.uniform(0, 100),
+            "grade": rng.choice("ABCDF"),
+            "avg_carbon_per_km": rng.uniform(0.1, 1.2),
+            "avg_efficiency": rng.uniform(2, 9),
+        },
+        "vehicle_states": {
+            "vehicle_id": vehicle_id,
+            "current_state": rng.choice(STATES),
+            "previous_state": rng.choice(STATES),
+            "transition_reason": "synthetic",
+            "risk_level": "medium",
+            "risk_score": risk,
+        },
+        "risk_scores": {
+            "vehicle_id": vehicle_id,
+            "risk_score": risk,
+            "alert_impact_pct": rng.uniform(0, 40),
+            "efficiency_impact_pct": rng.uniform(0, 30),
+            "carbon_impact_pct": rng.uniform(0, 30),
+            "status_impact_pct": rng.uniform(0, 15),
+        },
+        "predictions": {
+            "vehicle_id": vehicle_id,
+            "predicted_carbon_10min": rng.uniform(1, 50),
+            "predicted_risk_score": rng.uniform(0, 100),
+            "risk_escalation_probability": rng.random(),
+            "fuel_exhaustion_minutes": rng.uniform(-1, 300),
+        },
+    }
+
+
+def build_store(vehicles: int, alerts_per_vehicle: int, seed: int = 7) -> SnapshotStore:
+    rng = random.Random(seed)
+    store = SnapshotStore()
+    changes = {}
+    for i in range(vehicles):
+        vehicle_id = f"V{i:04d}"
+        for table, row in _vehicle_rows(vehicle_id, rng).items():
+            changes.setdefault(table, []).append((vehicle_id, row, True))
+        for j in range(alerts_per_vehicle):
+            alert = {
+                "vehicle_id": vehicle_id,
+                "anomaly_type": rng.choice(["speed", "fuel", "route"]),
+                "severity": rng.choice(["low", "medium", "high"]),
+                "message": "synthetic alert",
+                "timestamp": f"2025-01-01T00:{j % 60:02d}:00",
+            }
+            changes.setdefault("all_alerts", []).append((f"{vehicle_id}-{j}", alert, True))
+            history = {"vehicle_id": vehicle_id, "state": rng.choice(STATES), "risk_level": "low", "reason": "synthetic"}
+            changes.setdefault("state_history", []).append((f"{vehicle_id}-{j}", history, True))
+
+    for table, table_changes in changes.items():
+        store.create(table).apply(table_changes)
+    return store
+
+
+def _writer(store: SnapshotStore, vehicles: int, commit_ms: int, stop: threading.Event) -> None:
+    """Simulate the engine: one prediction update every commit_ms."""
+    rng = random.Random(11)
+    snapshot = store.get("predictions")
+    while not stop.wait(commit_ms / 1000.0):
+        vehicle_id = f"V{rng.randrange(vehicles):04d}"
+        old = snapshot.get(vehicle_id)
+        new = _vehicle_rows(vehicle_id, rng)["predictions"]
+        snapshot.apply([(vehicle_id, old, False), (vehicle_id, new, True)])
+
+
+async def _run(concurrency: int, duration: float) -> list:
+    latencies = []
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker(offset: int):
+            i = offset
+            while time.perf_counter() < deadline:
+                path = ENDPOINTS[i % len(ENDPOINTS)]
+                i += 1
+                started = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{path} -> {response.status_code}")
+
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    return latencies
+
+
+def _report(label: str, latencies: list, duration: float) -> float:
+    ordered = sorted(latencies)
+    p50 = statistics.median(ordered) * 1000
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000
+    rps = len(ordered) / duration
+    print(f"{label:<10} {len(ordered):>8} req  p50 {p50:7.2f} ms  p99 {p99:7.2f} ms  {rps:9.1f} req/s")
+    return rps
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--vehicles", type=int, default=200)
+    parser.add_argument("--alerts-per-vehicle", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--commit-ms", type=int, default=100)
+    args = parser.parse_args()
+
+    server._store = build_store(args.vehicles, args.alerts_per_vehicle)
+    server._indexes = server.build_indexes(server._store)
+    print(f"{args.vehicles} vehicles, {len(ENDPOINTS)} endpoints, "
+          f"concurrency {args.concurrency}, one commit every {args.commit_ms} ms")
+
+    results = {}
+    for label, cache in (("no cache", None), ("cache", ResponseCache())):
+        server._response_cache = cache
+        stop = threading.Event()
+        writer = threading.Thread(
+            target=_writer, args=(server._store, args.vehicles, args.commit_ms, stop), daemon=True
+        )
+        writer.start()
+        latencies = asyncio.run(_run(args.concurrency, args.duration))
+        stop.set()
+        writer.join()
+        results[label] = _report(label, latencies, args.duration)
+        if cache is not None:
+            print(f"{'':<10} cache stats {cache.stats()}")
+
+    print(f"throughput x{results['cache'] / max(results['no cache'], 1e-9):.2f} with the response cache")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
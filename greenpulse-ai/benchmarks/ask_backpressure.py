@@ -0,0 +1,135 @@
+"""
+Benchmark — /metrics stays responsive while /ask is saturated.
+
+Serves the API in-process (httpx ASGI transport) over a synthetic fleet
+with a stub query engine whose answer() blocks for --llm-ms, like a
+retrieval + LLM round trip. Measures /metrics latency alone, then again
+while --askers clients keep /ask saturated with a mix of repeated and
+unique questions, and reports 429s and coalesced calls.
+
+Fails (exit code 1) if /metrics p99 under /ask load exceeds the
+baseline p99 by more than --max-slowdown× (plus 5 ms of jitter).
+
+Usage (from greenpulse-ai/):
+    python benchmarks/ask_backpressure.py
+    python benchmarks/ask_backpressure.py --llm-ms 2000 --askers 64 --duration 10
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx  # noqa: E402
+
+from api import server  # noqa: E402
+from api_cache_bench import build_store  # noqa: E402
+
+
+REPEATED_QUESTIONS = [
+    "Which vehicle emitted the most carbon?",
+    "Any route deviations for V-103?",
+    "What is the fleet sustainability score?",
+]
+
+
+class StubQueryEngine:
+    """Stands in for the RAG engine: blocks like a network-bound LLM call."""
+
+    def __init__(self, latency_ms: int):
+        self.latency = latency_ms / 1000.0
+        self.calls = 0
+
+    def answer(self, question: str) -> dict:
+        self.calls += 1
+        time.sleep(self.latency)
+        return {"answer": f"stub answer to: {question}", "sources": []}
+
+
+async def _probe_metrics(client: httpx.AsyncClient, duration: float, interval: float) -> list:
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.get("/metrics")
+        latencies.append(time.perf_counter() - started)
+        response.raise_for_status()
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def _saturate_ask(client: httpx.AsyncClient, askers: int, duration: float) -> dict:
+    statuses: dict = {}
+    deadline = time.perf_counter() + duration
+
+    async def asker(n: int):
+        i = 0
+        while time.perf_counter() < deadline:
+            # Half the askers repeat popular questions, the rest ask unique ones
+            if n % 2 == 0:
+                question = REPEATED_QUESTIONS[(n + i) % len(REPEATED_QUESTIONS)]
+            else:
+                question = f"Unique question {n}-{i}"
+            i += 1
+            response = await client.post("/ask", json={"question": question})
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.status_code == 429:
+                await asyncio.sleep(0.05)
+
+    await asyncio.gather(*(asker(n) for n in range(askers)))
+    return statuses
+
+
+def _percentiles(latencies: list) -> tuple:
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return statistics.median(ordered) * 1000, p99 * 1000
+
+
+async def _run(args) -> int:
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        baseline = await _probe_metrics(client, args.duration, args.probe_ms / 1000.0)
+        loaded, statuses = await asyncio.gather(
+            _probe_metrics(client, args.duration, args.probe_ms / 1000.0),
+            _saturate_ask(client, args.askers, args.duration),
+        )
+
+    base_p50, base_p99 = _percentiles(baseline)
+    load_p50, load_p99 = _percentiles(loaded)
+    print(f"/metrics idle       p50 {base_p50:7.2f} ms  p99 {base_p99:7.2f} ms  ({len(baseline)} probes)")
+    print(f"/metrics /ask busy  p50 {load_p50:7.2f} ms  p99 {load_p99:7.2f} ms  ({len(loaded)} probes)")
+    print(f"/ask statuses {dict(sorted(statuses.items()))}, engine calls {args.engine.calls}")
+    print(f"ask pool {server._ask_pool.stats()}")
+
+    if load_p99 > base_p99 * args.max_slowdown + 5.0:
+        print(f"FAIL: /metrics p99 degraded more than {args.max_slowdown:g}x under /ask load")
+        return 1
+    print("OK: /metrics latency flat under /ask saturation")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--vehicles", type=int, default=200)
+    parser.add_argument("--llm-ms", type=int, default=1000)
+    parser.add_argument("--askers", type=int, default=48)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--probe-ms", type=int, default=20)
+    parser.add_argument("--max-slowdown", type=float, default=3.0)
+    args = parser.parse_args()
+
+    server._store = build_store(args.vehicles, alerts_per_vehicle=5)
+    server._indexes = server.build_indexes(server._store)
+    args.engine = StubQueryEngine(args.llm_ms)
+    server._query_engine = args.engine
+    print(f"stub LLM {args.llm_ms} ms, {args.askers} /ask clients, pool {server._ask_pool.stats()['capacity']} slots")
+
+    return asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
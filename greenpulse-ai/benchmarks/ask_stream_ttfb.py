@@ -0,0 +1,145 @@
+"""
+Benchmark — time to first byte of /ask/stream vs /ask.
+
+Serves the API with uvicorn on a local port (in-process ASGI transports
+buffer whole responses, which would hide streaming). The query engine is
+a stub retriever with --retrieval-ms of latency in front of the offline
+FakeStreamingLLM (--first-token-ms, then --token-ms per word), wrapped in
+the real StreamingQueryEngine.
+
+For each run reports, at p50 / p99:
+  /ask          total latency (= time to first byte)
+  /ask/stream   time to the sources event, to the first token, and total
+
+Usage (from greenpulse-ai/):
+    python benchmarks/ask_stream_ttfb.py
+    python benchmarks/ask_stream_ttfb.py --requests 50 --first-token-ms 600 --token-ms 30
+"""
+import argparse
+import asyncio
+import importlib
+import socket
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+from api import server  # noqa: E402
+
+
+def _load_streaming():
+    # rag/__init__ is lazy: this does not load the pathway LLM xpack
+    return importlib.import_module("rag.streaming")
+
+
+class StubRetrievalEngine:
+    """Retrieval with fixed latency; answer() runs retrieval plus the whole generation."""
+
+    def __init__(self, retrieval_ms: int, llm):
+        self.retrieval = retrieval_ms / 1000.0
+        self.llm = llm
+
+    def retrieve(self, question: str, k: int) -> list:
+        time.sleep(self.retrieval)
+        return [f"METRICS Vehicle V-{100 + i}: Carbon emitted {10.0 + i:.1f}kg CO₂" for i in range(k)]
+
+    def answer(self, question: str) -> dict:
+        sources = self.retrieve(question, 5)
+        return {"answer": "".join(self.llm.stream(question)), "sources": sources}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _serve(port: int) -> uvicorn.Server:
+    api = uvicorn.Server(uvicorn.Config(server.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=api.run, daemon=True).start()
+    while not api.started:
+        time.sleep(0.01)
+    return api
+
+
+async def _plain(client: httpx.AsyncClient, question: str) -> float:
+    started = time.perf_counter()
+    response = await client.post("/ask", json={"question": question})
+    response.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def _streamed(client: httpx.AsyncClient, question: str) -> tuple:
+    started = time.perf_counter()
+    sources = first_token = None
+    async with client.stream("POST", "/ask/stream", json={"question": question}) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            now = time.perf_counter() - started
+            if line == "event: sources" and sources is None:
+                sources = now
+            elif line == "event: token" and first_token is None:
+                first_token = now
+            elif line == "event: error":
+                raise RuntimeError("stream reported an error")
+    return sources, first_token, time.perf_counter() - started
+
+
+def _pct(values: list) -> str:
+    ordered = sorted(values)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return f"p50 {statistics.median(ordered) * 1000:8.1f} ms  p99 {p99 * 1000:8.1f} ms"
+
+
+async def _run(args, port: int) -> None:
+    plain, sources, tokens, totals = [], [], [], []
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=None) as client:
+        for i in range(args.requests):
+            question = f"Open-ended fleet question {i}"
+            plain.append(await _plain(client, question))
+            s, t, total = await _streamed(client, question)
+            sources.append(s)
+            tokens.append(t)
+            totals.append(total)
+
+    print(f"/ask         first byte   {_pct(plain)}")
+    print(f"/ask/stream  sources      {_pct(sources)}")
+    print(f"/ask/stream  first token  {_pct(tokens)}")
+    print(f"/ask/stream  complete     {_pct(totals)}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--retrieval-ms", type=int, default=50)
+    parser.add_argument("--first-token-ms", type=int, default=300)
+    parser.add_argument("--token-ms", type=int, default=20)
+    args = parser.parse_args()
+
+    streaming = _load_streaming()
+    llm = streaming.FakeStreamingLLM(args.first_token_ms, args.token_ms)
+    engine = StubRetrievalEngine(args.retrieval_ms, llm)
+    server._query_engine = streaming.StreamingQueryEngine(engine, llm, retrieve=engine.retrieve)
+    print(
+        f"retrieval {args.retrieval_ms} ms, fake LLM first token {args.first_token_ms} ms "
+        f"+ {args.token_ms} ms/word, {args.requests} requests each"
+    )
+
+    port = _free_port()
+    api = _serve(port)
+    try:
+        asyncio.run(_run(args, port))
+    finally:
+        api.should_exit = True
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Benchmark — CSV vs columnar (Parquet / Arrow IPC) replay throughput.
+
+Writes --rows synthetic GPS, fuel and shipment events as CSV, converts
+them with ingestion/columnar.csv_to_columnar, then replays each file
+through Pathway in static mode and reports rows/s per stream and format:
+
+  csv      pw.io.csv.read + dt.strptime, as the CSV streams do
+  parquet  ingestion/columnar.read_columnar, typed timestamp column
+  arrow    the same from an Arrow IPC file
+
+Both paths produce the same columns (GPSSchema / FuelSchema /
+ShipmentSchema plus parsed_time); every row is counted through
+pw.io.subscribe so both are fully materialized. Needs pathway and
+pyarrow.
+
+Usage (from greenpulse-ai/):
+    python benchmarks/columnar_replay_bench.py
+    python benchmarks/columnar_replay_bench.py --rows 2000000 --streams gps
+"""
+import argparse
+import csv
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import pathway as pw  # noqa: E402
+
+from ingestion.columnar import csv_to_columnar, read_columnar  # noqa: E402
+from ingestion.fuel_stream import FuelSchema  # noqa: E402
+from ingestion.gps_stream import GPSSchema  # noqa: E402
+from ingestion.shipment_stream import ShipmentSchema  # noqa: E402
+
+SCHEMAS = {"gps": GPSSchema, "fuel": FuelSchema, "shipments": ShipmentSchema}
+STATUSES = ("in_transit", "delivered", "delayed", "loading")
+CITIES = ("New York", "Boston", "Philadelphia", "Baltimore", "Hartford")
+
+
+def _row(stream: str, n: int, rng: random.Random, start: datetime) -> dict:
+    vehicle_id = f"V-{100 + n % 500}"
+    timestamp = (start + timedelta(seconds=n // 500)).strftime("%Y-%m-%dT%H:%M:%S")
+    if stream == "gps":
+        return {"vehicle_id": vehicle_id, "latitude": 40.0 + rng.random() * 2, "longitude": -74.5 + rng.random() * 1.5,
+                "speed": 20 + rng.random() * 100, "timestamp": timestamp}
+    if stream == "fuel":
+        return {"vehicle_id": vehicle_id, "fuel_liters": rng.uniform(0.1, 6.0), "distance_km": rng.uniform(0.5, 40.0),
+                "fuel_type": rng.choice(("diesel", "gasoline")), "timestamp": timestamp}
+    return {"shipment_id": f"S-{n}", "vehicle_id": vehicle_id, "status": rng.choice(STATUSES),
+            "origin": rng.choice(CITIES), "destination": rng.choice(CITIES), "timestamp": timestamp}
+
+
+def write_csv(path: Path, stream: str, rows: int) -> None:
+    rng = random.Random(5)
+    start = datetime(2025, 1, 1)
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(SCHEMAS[stream].typehints()))
+        writer.writeheader()
+        for n in range(rows):
+            writer.writerow(_row(stream, n, rng, start))
+
+
+def replay(build) -> tuple:
+    """(rows, seconds) of one static run of the table `build()` returns."""
+    pw.internals.parse_graph.G.clear()
+    table = build()
+    count = [0]
+
+    def on_change(key, row, time, is_addition):
+        count[0] += 1
+
+    pw.io.subscribe(table, on_change=on_change)
+    started = time.perf_counter()
+    pw.run(monitoring_level=pw.MonitoringLevel.NONE)
+    return count[0], time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--streams", nargs="+", choices=sorted(SCHEMAS), default=["gps", "fuel", "shipments"])
+    parser.add_argument("--batch-rows", type=int, default=65_536)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for stream in args.streams:
+            schema = SCHEMAS[stream]
+            csv_path = Path(directory) / f"{stream}.csv"
+            write_csv(csv_path, stream, args.rows)
+            paths = {"csv": csv_path}
+            for fmt, suffix in (("parquet", ".parquet"), ("arrow", ".arrow")):
+                paths[fmt] = Path(directory) / f"{stream}{suffix}"
+                csv_to_columnar(str(csv_path), str(paths[fmt]), schema, fmt)
+            sizes = ", ".join(f"{fmt} {path.stat().st_size / 1e6:.1f} MB" for fmt, path in paths.items())
+            print(f"{stream}: {args.rows} rows ({sizes})")
+
+            def from_csv():
+                table = pw.io.csv.read(str(csv_path), schema=schema, mode="static")
+                return table.with_columns(parsed_time=pw.this.timestamp.dt.strptime("%Y-%m-%dT%H:%M:%S"))
+
+            results = {"csv": replay(from_csv)}
+            for fmt in ("parquet", "arrow"):
+                results[fmt] = replay(lambda fmt=fmt: read_columnar(
+                    str(paths[fmt]), schema, fmt, mode="static", batch_rows=args.batch_rows,
+                ))
+            baseline = results["csv"][0] / results["csv"][1]
+            for fmt, (rows, seconds) in results.items():
+                rate = rows / seconds
+                print(f"  {fmt:<8} {rate:>12,.0f} rows/s  ({rows} rows, {seconds:.2f} s, {rate / baseline:.2f}x csv)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
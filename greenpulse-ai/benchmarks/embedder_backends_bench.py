@@ -0,0 +1,101 @@
+"""
+Benchmark — CPU embedding backends: docs/s and retrieval quality.
+
+Embeds the fixed synthetic corpus of rag_retrieval_bench.py with each
+backend of rag/encoders.py and reports, per backend:
+
+  docs/s        corpus throughput in batches of --batch-size
+  recall@1/@k   vector retrieval of the benchmark questions
+  cos vs fp32   mean cosine similarity of each document vector to the
+                fp32 "torch" vector of the same document
+  top-k overlap share of each question's top k shared with fp32
+
+The "torch" backend is always run first as the reference. Needs
+sentence-transformers; the ONNX backends also need
+`pip install "sentence-transformers[onnx]"`.
+
+Usage (from greenpulse-ai/):
+    python benchmarks/embedder_backends_bench.py
+    python benchmarks/embedder_backends_bench.py --backends torch onnx-int8 --threads 4
+"""
+import argparse
+import importlib
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from rag_retrieval_bench import (  # noqa: E402
+    VectorIndex,
+    _load_rag,
+    _matches,
+    build_corpus,
+    build_questions,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument("--backends", nargs="+", default=["torch", "torch-int8", "onnx", "onnx-int8"])
+    parser.add_argument("--threads", type=int, default=0, help="intra-op threads (0: all cores)")
+    parser.add_argument("--onnx-int8-file", default="onnx/model_quint8_avx2.onnx")
+    parser.add_argument("--vehicles", type=int, default=100)
+    parser.add_argument("--alerts", type=int, default=20)
+    parser.add_argument("--windows", type=int, default=24)
+    parser.add_argument("--questions", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("-k", type=int, default=5)
+    args = parser.parse_args()
+
+    rag = _load_rag()
+    encoders = importlib.import_module("rag.encoders")
+    rows, documents = build_corpus(rag, args.vehicles, args.alerts, args.windows)
+    texts = [text for text, _ in documents]
+    questions = build_questions(rows, args.questions)
+    backends = ["torch"] + [backend for backend in args.backends if backend != "torch"]
+    print(f"{len(texts)} documents, {len(questions)} questions, model {args.model}, threads {args.threads or 'all'}")
+
+    reference = None
+    for backend in backends:
+        try:
+            encoder = encoders.load_encoder(args.model, backend, args.threads, onnx_int8_file=args.onnx_int8_file)
+        except ImportError as exc:
+            print(f"{backend:<11} skipped ({exc})")
+            continue
+        encoder(texts[:args.batch_size])  # warm-up: lazy init, kernel selection
+
+        index = VectorIndex(encoder, batch_size=args.batch_size)
+        started = time.perf_counter()
+        index.add(texts)
+        elapsed = time.perf_counter() - started
+
+        hits_1 = hits_k = 0
+        top = []
+        for question, key in questions:
+            found = index.search(question, args.k)
+            top.append(set(found))
+            hits = [_matches(texts[doc], key) for doc in found]
+            hits_1 += bool(hits and hits[0])
+            hits_k += any(hits)
+
+        if reference is None:
+            reference = (index.matrix, top)
+            fidelity = overlap = 1.0
+        else:
+            fidelity = float(np.mean(np.sum(index.matrix * reference[0], axis=1)))
+            overlap = statistics.mean(len(a & b) / args.k for a, b in zip(top, reference[1]))
+        print(
+            f"{backend:<11} {len(texts) / elapsed:8.0f} docs/s  "
+            f"recall@1 {hits_1 / len(questions):6.1%}  recall@{args.k} {hits_k / len(questions):6.1%}  "
+            f"cos vs fp32 {fidelity:.4f}  top-{args.k} overlap {overlap:6.1%}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Benchmark — dataflow event latency under an embedding burst.
+
+A "dataflow" thread handles telemetry events at a fixed rate (a little
+pure-Python work per event, like a Pathway operator) and records how
+late each event is handled. Meanwhile a burst of documents is embedded
+through the MicroBatcher, with the encoder
+  none        no embedding (baseline)
+  in-process  in this process, as the dataflow does by default
+  pool        in worker processes (rag/embedding_service.ProcessEncoder)
+and the event lateness p50 / p99 / max and embedding docs/s are
+reported. The encoder is the CPU cost model of embedding_cache_bench.py:
+it burns CPU in Python and holds the GIL, like tokenization and the
+pre/post-processing around a model's forward pass.
+
+Usage (from greenpulse-ai/):
+    python benchmarks/embedding_offload_bench.py
+    python benchmarks/embedding_offload_bench.py --workers 4 --documents 4000
+"""
+import argparse
+import importlib
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from embedding_cache_bench import CostModelEncoder  # noqa: E402
+
+embedding_cache = importlib.import_module("rag.embedding_cache")
+embedding_service = importlib.import_module("rag.embedding_service")
+
+
+def cost_model(call_ms: float, text_ms: float):
+    """Encoder factory; module-level so worker processes can unpickle it."""
+    return CostModelEncoder(call_ms, text_ms).encode
+
+
+def dataflow(rate: float, work_us: float, stop: threading.Event, lateness: list) -> None:
+    """Handle one event every 1/rate s; record how late each is handled (ms)."""
+    interval = 1.0 / rate
+    state = {}
+    due = time.perf_counter()
+    n = 0
+    while not stop.is_set():
+        due += interval
+        now = time.perf_counter()
+        if due > now:
+            time.sleep(due - now)
+        deadline = time.perf_counter() + work_us / 1e6
+        while time.perf_counter() < deadline:
+            state[n % 64] = state.get(n % 64, 0.0) * 0.9 + n
+        lateness.append((time.perf_counter() - due) * 1000.0)
+        n += 1
+
+
+def run(mode: str, args) -> None:
+    lateness: list = []
+    stop = threading.Event()
+    encoder = None
+    if mode == "in-process":
+        encoder = cost_model(args.call_ms, args.text_ms)
+    elif mode == "pool":
+        encoder = embedding_service.ProcessEncoder(
+            cost_model, (args.call_ms, args.text_ms), workers=args.workers,
+        )
+        encoder.dimension  # start the workers before measuring
+
+    thread = threading.Thread(target=dataflow, args=(args.rate, args.work_us, stop, lateness), daemon=True)
+    thread.start()
+    time.sleep(0.5)
+    throughput = ""
+    if encoder is None:
+        time.sleep(args.idle_sec)
+    else:
+        batcher = embedding_cache.MicroBatcher(
+            encoder, max_batch_size=args.batch_size, max_wait_ms=10,
+            concurrency=args.workers if mode == "pool" else 1,
+        )
+        texts = [f"ALERT [HIGH] Vehicle V-{100 + i % 500}: burst document {i}" for i in range(args.documents)]
+        started = time.perf_counter()
+        batcher.embed(texts)
+        elapsed = time.perf_counter() - started
+        throughput = f"  embedding {len(texts) / elapsed:8.0f} docs/s"
+    stop.set()
+    thread.join()
+    if mode == "pool":
+        encoder.close()
+
+    samples = lateness[int(args.rate * 0.5):] or lateness
+    ordered = sorted(samples)
+    print(
+        f"{mode:<11} event lateness p50 {statistics.median(ordered):7.2f} ms  "
+        f"p99 {ordered[int(0.99 * (len(ordered) - 1))]:7.2f} ms  max {ordered[-1]:7.2f} ms{throughput}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--documents", type=int, default=2000)
+    # One core stays with the dataflow
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--call-ms", type=float, default=4.0)
+    parser.add_argument("--text-ms", type=float, default=0.4)
+    parser.add_argument("--rate", type=float, default=1000.0, help="dataflow events per second")
+    parser.add_argument("--work-us", type=float, default=50.0, help="CPU per dataflow event")
+    parser.add_argument("--idle-sec", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{args.documents} documents, {args.workers} workers, dataflow at {args.rate:.0f} events/s")
+    for mode in ("none", "in-process", "pool"):
+        run(mode, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Benchmark — structured-query fast path for /ask.
+
+Fills the API's snapshot store with a synthetic fleet and posts a mix of
+typical chat questions to /ask in-process (httpx ASGI transport). A stub
+query engine stands in for retrieval + LLM with --llm-ms of latency, so
+the report shows what the intent router saves: the share of questions
+answered from the live tables, and p50 / p99 latency for routed vs RAG
+questions.
+
+Usage (from greenpulse-ai/):
+    python benchmarks/intent_router_bench.py
+    python benchmarks/intent_router_bench.py --vehicles 1000 --rounds 20
+"""
+import argparse
+import asyncio
+import importlib
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import httpx  # noqa: E402
+
+from api import server  # noqa: E402
+from api_cache_bench import build_store  # noqa: E402
+from ask_backpressure import StubQueryEngine  # noqa: E402
+
+
+# Lookup questions the router should answer, then open-ended ones for RAG
+QUESTIONS = [
+    "Which vehicle emitted the most carbon?",
+    "Top 5 most efficient vehicles",
+    "What is V0003's risk score?",
+    "What state is V0042 in?",
+    "How many alerts in the last 10 minutes?",
+    "How many high alerts for V0007?",
+    "Which vehicles are in critical risk?",
+    "How many vehicles are active?",
+    "What is the total fleet carbon?",
+    "What is the fleet sustainability score?",
+    "Which vehicle will run out of fuel first?",
+    "What's the forecast carbon for V0010?",
+    "Why is V0003 flagged as risky?",
+    "What should we do about the route deviations on the north corridor?",
+    "Summarize what changed in the fleet today",
+]
+
+
+def _load_router_class():
+    # rag/__init__ is lazy: this does not load the pathway LLM xpack
+    return importlib.import_module("rag.intent_router").IntentRouter
+
+
+def _percentiles(latencies: list) -> str:
+    if not latencies:
+        return "n/a"
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return f"p50 {statistics.median(ordered) * 1000:8.2f} ms  p99 {p99 * 1000:8.2f} ms"
+
+
+async def _run(args, engine: StubQueryEngine) -> None:
+    routed, rag = [], []
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for _ in range(args.rounds):
+            for question in QUESTIONS:
+                calls = engine.calls
+                started = time.perf_counter()
+                response = await client.post("/ask", json={"question": question})
+                elapsed = time.perf_counter() - started
+                response.raise_for_status()
+                (rag if engine.calls > calls else routed).append(elapsed)
+
+    total = len(routed) + len(rag)
+    print(f"routed to tables  {len(routed):5d} / {total}  {_percentiles(routed)}")
+    print(f"sent to RAG       {len(rag):5d} / {total}  {_percentiles(rag)}")
+    print(f"router {server._intent_router.stats()}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--vehicles", type=int, default=500)
+    parser.add_argument("--llm-ms", type=int, default=800)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    server._store = build_store(args.vehicles, alerts_per_vehicle=5)
+    server._indexes = server.build_indexes(server._store)
+    engine = StubQueryEngine(args.llm_ms)
+    server._query_engine = engine
+    server._intent_router = _load_router_class()(server._store, formatters={
+        "vehicle_states": server._format_vehicle_state,
+        "risk_scores": server._format_risk_breakdown,
+        "predictions": server._format_prediction,
+    })
+    print(f"{args.vehicles} vehicles, stub LLM {args.llm_ms} ms, {len(QUESTIONS)} questions x {args.rounds} rounds")
+
+    asyncio.run(_run(args, engine))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
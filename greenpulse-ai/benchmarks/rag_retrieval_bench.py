@@ -0,0 +1,331 @@
+"""
+Benchmark — offline RAG retrieval: indexing throughput, latency, recall@k.
+
+Builds a fixed synthetic corpus (same seed, same documents every run) of
+ALERT and METRICS documents rendered by rag/documents.py, and one
+question per sampled document whose answer is that document. Each
+retriever indexes the corpus, then answers every question:
+
+  bm25         whole-corpus BM25
+  vector       whole-corpus cosine similarity of the embeddings
+  hybrid       reciprocal-rank fusion of bm25 + vector, like the
+               document store's hybrid index
+  filtered     hybrid over the documents matching the question's
+               JMESPath metadata filter (rag/metadata_filters.py), as
+               the document store applies it inside the index
+
+and reports indexed documents/s, retrieval p50/p99 and recall@1 /
+recall@k (share of questions whose document is in the top k). The last
+line is the end-to-end answer latency of the local extractive LLM
+(rag/local_llm.py) on the filtered retrieval. No network is used:
+the default embedder is the feature-hashing fallback, --model swaps in
+a sentence-transformers model to compare embedders.
+
+Usage (from greenpulse-ai/):
+    python benchmarks/rag_retrieval_bench.py
+    python benchmarks/rag_retrieval_bench.py --vehicles 1000 --model all-MiniLM-L6-v2
+"""
+import argparse
+import importlib
+import math
+import random
+import re
+import statistics
+import sys
+import time
+import types
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import jmespath
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+ANOMALIES = {
+    "speeding": "Speed {value:.0f} km/h exceeds the limit",
+    "fuel_drop": "Fuel level dropped {value:.1f}L without distance",
+    "route_deviation": "Route deviated {value:.1f} km from the planned corridor",
+    "harsh_acceleration": "Acceleration spike of {value:.0f} km/h/s",
+    "idle": "Engine idle for {value:.0f} minutes",
+}
+SEVERITIES = ("low", "medium", "high", "critical")
+_TERM = re.compile(r"[a-z0-9]+(?:[.-][a-z0-9]+)*")
+
+
+def _load_rag():
+    # rag/__init__ is lazy: none of these load the pathway LLM xpack
+    return types.SimpleNamespace(
+        documents=importlib.import_module("rag.documents"),
+        metadata_filters=importlib.import_module("rag.metadata_filters"),
+        local_llm=importlib.import_module("rag.local_llm"),
+        streaming=importlib.import_module("rag.streaming"),
+        answer_cache=importlib.import_module("rag.answer_cache"),
+    )
+
+
+def _terms(text: str):
+    return _TERM.findall(text.lower())
+
+
+def build_corpus(rag, vehicles: int, alerts: int, windows: int, seed: int = 21):
+    """Source rows per table plus the rendered (text, metadata) documents, in the same order."""
+    rng = random.Random(seed)
+    rows = {"all_alerts": [], "closed_windows": []}
+    documents = []
+    for v in range(vehicles):
+        vehicle_id = f"V-{100 + v}"
+        for a in range(alerts):
+            anomaly = rng.choice(sorted(ANOMALIES))
+            row = {
+                "vehicle_id": vehicle_id,
+                "anomaly_type": anomaly,
+                "severity": rng.choice(SEVERITIES),
+                "message": ANOMALIES[anomaly].format(value=rng.uniform(5, 140)),
+                "timestamp": f"2025-01-01T{rng.randrange(24):02d}:{rng.randrange(60):02d}:00",
+            }
+            rows["all_alerts"].append((f"{vehicle_id}-a{a}", row))
+            documents.append((
+                rag.documents.alert_text(row["vehicle_id"], anomaly, row["severity"], row["message"], row["timestamp"]),
+                rag.documents.alert_metadata(vehicle_id, anomaly),
+            ))
+        for w in range(windows):
+            fuel = rng.uniform(0.5, 6.0)
+            distance = fuel * rng.uniform(2.0, 12.0)
+            row = {
+                "vehicle_id": vehicle_id,
+                "avg_speed": rng.uniform(20, 110),
+                "total_fuel": fuel,
+                "total_distance": distance,
+                "carbon_kg": fuel * 2.68,
+                "fuel_efficiency": distance / fuel,
+                "window_start": f"2025-01-01T{w % 24:02d}:{(w // 24) * 5:02d}:00",
+            }
+            rows["closed_windows"].append((f"{vehicle_id}-w{w}", row))
+            documents.append((
+                rag.documents.metric_text(
+                    vehicle_id, row["avg_speed"], fuel, distance, row["carbon_kg"],
+                    row["fuel_efficiency"], row["window_start"],
+                ),
+                rag.documents.metric_metadata(vehicle_id),
+            ))
+    return rows, documents
+
+
+def build_questions(rows, count: int, seed: int = 22):
+    """(question, key of the document that answers it) for `count` sampled rows."""
+    rng = random.Random(seed)
+    alerts, windows = rows["all_alerts"], rows["closed_windows"]
+    questions = []
+    for n in range(count):
+        if n % 2 == 0:
+            _, row = rng.choice(alerts)
+            question = (
+                f"Why did {row['vehicle_id']} raise a {row['severity']} "
+                f"{row['anomaly_type'].replace('_', ' ')} alert at {row['timestamp']}?"
+            )
+            key = (row["vehicle_id"], row["timestamp"], row["anomaly_type"])
+        else:
+            _, row = rng.choice(windows)
+            question = f"How much carbon did {row['vehicle_id']} emit in the window starting {row['window_start']}?"
+            key = (row["vehicle_id"], row["window_start"], None)
+        questions.append((question, key))
+    return questions
+
+
+def _matches(text: str, key) -> bool:
+    vehicle_id, timestamp, anomaly = key
+    return f"Vehicle {vehicle_id}:" in text and str(timestamp) in text and (anomaly is None or anomaly in text)
+
+
+class BM25Index:
+    def __init__(self, tokenize):
+        self.tokenize = tokenize
+        self.postings = defaultdict(list)
+        self.lengths = []
+        self.texts = []
+
+    def add(self, texts):
+        for text in texts:
+            doc = len(self.texts)
+            terms = Counter(self.tokenize(text))
+            for term, tf in terms.items():
+                self.postings[term].append((doc, tf))
+            self.lengths.append(sum(terms.values()))
+            self.texts.append(text)
+
+    def search(self, question: str, k: int, allowed=None):
+        n = len(self.texts)
+        average = sum(self.lengths) / n
+        allowed = None if allowed is None else set(allowed.tolist())
+        scores = defaultdict(float)
+        for term in set(self.tokenize(question)):
+            postings = self.postings.get(term, ())
+            if not postings:
+                continue
+            idf = math.log(1.0 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc, tf in postings:
+                if allowed is not None and doc not in allowed:
+                    continue
+                norm = 1.2 * (0.25 + 0.75 * self.lengths[doc] / average)
+                scores[doc] += idf * tf * 2.2 / (tf + norm)
+        return [doc for doc, _ in sorted(scores.items(), key=lambda item: -item[1])[:k]]
+
+
+class VectorIndex:
+    def __init__(self, encode, batch_size: int = 64):
+        self.encode = encode
+        self.batch_size = batch_size
+        self.matrix = None
+
+    def add(self, texts):
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            vectors.extend(self.encode(texts[start:start + self.batch_size]))
+        matrix = np.asarray(vectors, dtype=np.float32)
+        self.matrix = matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-9)
+
+    def search(self, question: str, k: int, allowed=None):
+        query = np.asarray(self.encode([question])[0], dtype=np.float32)
+        docs = np.arange(len(self.matrix)) if allowed is None else allowed
+        if not len(docs):
+            return []
+        scores = self.matrix[docs] @ (query / max(float(np.linalg.norm(query)), 1e-9))
+        top = np.argpartition(-scores, min(k, len(scores) - 1))[:k]
+        return [int(doc) for doc in docs[top[np.argsort(-scores[top])]]]
+
+
+class HybridIndex:
+    """Reciprocal-rank fusion of two retrievers over the same documents."""
+
+    def __init__(self, *indexes, depth: int = 50):
+        self.indexes = indexes
+        self.depth = depth
+
+    def search(self, question: str, k: int, allowed=None):
+        fused = defaultdict(float)
+        for index in self.indexes:
+            for rank, doc in enumerate(index.search(question, self.depth, allowed)):
+                fused[doc] += 1.0 / (60 + rank)
+        return [doc for doc, _ in sorted(fused.items(), key=lambda item: -item[1])[:k]]
+
+
+class MetadataFilter:
+    """Document ids matching a JMESPath filter, evaluated once per distinct filter."""
+
+    def __init__(self, metadata):
+        self.metadata = metadata
+        self._matches = {}
+
+    def __call__(self, expression):
+        if expression is None:
+            return None
+        if expression not in self._matches:
+            compiled = jmespath.compile(expression)
+            self._matches[expression] = np.array(
+                [doc for doc, metadata in enumerate(self.metadata) if compiled.search(metadata)], dtype=np.int64,
+            )
+        return self._matches[expression]
+
+
+def _encoder(rag, model: str):
+    if model:
+        from sentence_transformers import SentenceTransformer
+
+        encoder = SentenceTransformer(model, device="cpu")
+        return lambda texts: list(encoder.encode(texts, batch_size=len(texts), convert_to_numpy=True))
+    hashing = rag.answer_cache.HashingEmbedder(dimension=512)
+    return lambda texts: [hashing(text) for text in texts]
+
+
+def _percentile(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _run(name, index_seconds, n_documents, search, questions, k):
+    latencies, hits_1, hits_k = [], 0, 0
+    for question, key in questions:
+        started = time.perf_counter()
+        texts = search(question, k)
+        latencies.append((time.perf_counter() - started) * 1000.0)
+        hits = [_matches(text, key) for text in texts]
+        hits_1 += bool(hits[:1] and hits[0])
+        hits_k += any(hits)
+    print(
+        f"{name:<12} {n_documents / index_seconds:>10.0f} docs/s  "
+        f"p50 {statistics.median(latencies):7.2f} ms  p99 {_percentile(latencies, 0.99):7.2f} ms  "
+        f"recall@1 {hits_1 / len(questions):6.1%}  recall@{k} {hits_k / len(questions):6.1%}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--vehicles", type=int, default=300)
+    parser.add_argument("--alerts", type=int, default=20, help="alert documents per vehicle")
+    parser.add_argument("--windows", type=int, default=48, help="window documents per vehicle")
+    parser.add_argument("--questions", type=int, default=400)
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--model", default="", help="sentence-transformers model (default: feature hashing)")
+    args = parser.parse_args()
+
+    rag = _load_rag()
+    rows, documents = build_corpus(rag, args.vehicles, args.alerts, args.windows)
+    texts = [text for text, _ in documents]
+    questions = build_questions(rows, args.questions)
+    tokenize = _terms
+    print(
+        f"{len(texts)} documents ({args.vehicles} vehicles), {len(questions)} questions, "
+        f"embedder {args.model or 'feature hashing'}"
+    )
+
+    bm25 = BM25Index(tokenize)
+    started = time.perf_counter()
+    bm25.add(texts)
+    bm25_seconds = time.perf_counter() - started
+    _run("bm25", bm25_seconds, len(texts), lambda q, k: [texts[d] for d in bm25.search(q, k)], questions, args.k)
+
+    vector = VectorIndex(_encoder(rag, args.model))
+    started = time.perf_counter()
+    vector.add(texts)
+    vector_seconds = time.perf_counter() - started
+    _run("vector", vector_seconds, len(texts), lambda q, k: [texts[d] for d in vector.search(q, k)], questions, args.k)
+
+    hybrid = HybridIndex(bm25, vector)
+    _run(
+        "hybrid", bm25_seconds + vector_seconds, len(texts),
+        lambda q, k: [texts[d] for d in hybrid.search(q, k)], questions, args.k,
+    )
+
+    matching = MetadataFilter([metadata for _, metadata in documents])
+    scope = rag.metadata_filters
+    # Resolve each distinct filter before timing: this measures retrieval, not JMESPath
+    for question, _ in questions:
+        matching(scope.metadata_filter(scope.query_scope(question)))
+
+    def filtered(question, k, metadata_filter=None):
+        return [texts[d] for d in hybrid.search(question, k, matching(metadata_filter))]
+
+    _run(
+        "filtered", bm25_seconds + vector_seconds, len(texts),
+        lambda q, k: filtered(q, k, scope.metadata_filter(scope.query_scope(q))), questions, args.k,
+    )
+
+    engine = rag.streaming.StreamingQueryEngine(
+        None, rag.local_llm.ExtractiveLLM(), retrieve=filtered, n_documents=args.k,
+    )
+    latencies = []
+    for question, _ in questions:
+        started = time.perf_counter()
+        engine.answer(question)
+        latencies.append((time.perf_counter() - started) * 1000.0)
+    print(
+        f"answer (local LLM, filtered) p50 {statistics.median(latencies):.2f} ms  "
+        f"p99 {_percentile(latencies, 0.99):.2f} ms"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""
+Soak test — state retention keeps memory flat.
+
+Replays one day of synthetic GPS / fuel / shipment events (event time,
+as fast as the engine can consume them) through the streaming core of
+the pipeline — joins, features, windows, anomalies and the all-time
+scoring services — into the API's snapshot store, while sampling
+process RSS. The three streams advance together on a shared event-time
+clock, one slice at a time, so no stream runs hours ahead of the others.
+The last --idle-vehicles vehicles go silent after the first quarter.
+
+Fails (exit code 1) if RSS in the last quarter of the run grows more
+than --tolerance over the post-warm-up baseline, or if the all-time
+rankings lose a vehicle or miscount its windows (every window of the
+run must be carried, including those of the idle vehicles).
+
+Usage (from greenpulse-ai/):
+    python benchmarks/soak_retention.py
+    python benchmarks/soak_retention.py --hours 24 --vehicles 6 --tolerance 0.15
+"""
+import argparse
+import datetime
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pathway as pw  # noqa: E402
+
+from anomalies import (  # noqa: E402
+    combine_alerts,
+    detect_route_deviations,
+    detect_threshold_anomalies,
+    detect_zscore_anomalies,
+    served_alerts,
+)
+from features import (  # noqa: E402
+    compute_carbon_emissions,
+    compute_fuel_efficiency,
+    detect_acceleration_spikes,
+    detect_idle_vehicles,
+)
+from ingestion.fuel_stream import FuelSchema  # noqa: E402
+from ingestion.gps_stream import GPSSchema  # noqa: E402
+from ingestion.shipment_stream import ShipmentSchema  # noqa: E402
+from services import (  # noqa: E402
+    compute_risk_scores,
+    compute_sustainability_scores,
+    compute_vehicle_rankings,
+)
+from api.server import SERVED_TABLES  # noqa: E402
+from api.snapshots import build_snapshot_store  # noqa: E402
+from config import config  # noqa: E402
+from streaming.joins import join_all_streams  # noqa: E402
+from streaming.retention import all_time_input  # noqa: E402
+from streaming.windows import compute_rolling_windows  # noqa: E402
+
+try:
+    import psutil
+except Exception:
+    psutil = None
+
+
+START = datetime.datetime(2025, 1, 1, 0, 0, 0)
+
+
+def _rss_mb() -> float:
+    if psutil is not None:
+        return psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024)
+    with open("/proc/self/statm") as statm:
+        pages = int(statm.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def _ts(offset_sec: float) -> str:
+    return (START + datetime.timedelta(seconds=offset_sec)).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+class _ReplayClock:
+    """Lets each replay subject emit slice n only once every subject has emitted slice n - 1."""
+
+    def __init__(self, kinds):
+        self._done = {kind: -1 for kind in kinds}
+        self._cond = threading.Condition()
+
+    def wait_turn(self, slice_no: int) -> None:
+        with self._cond:
+            self._cond.wait_for(lambda: min(self._done.values()) >= slice_no - 1)
+
+    def finish(self, kind: str, slice_no: int) -> None:
+        with self._cond:
+            self._done[kind] = slice_no
+            self._cond.notify_all()
+
+
+class _ReplaySubject(pw.io.python.ConnectorSubject):
+    """Emits one stream's synthetic events in event-time order, one clock slice per commit."""
+
+    STEPS = {"gps": 2, "fuel": 3, "shipments": 600}
+
+    def __init__(self, kind: str, hours: float, vehicles: int, idle: int, clock: _ReplayClock, slice_sec: int):
+        super().__init__()
+        self._kind = kind
+        self._horizon = int(hours * 3600)
+        self._vehicles = [f"V-{101 + i}" for i in range(vehicles)]
+        self._idle = set(self._vehicles[vehicles - idle:]) if idle else set()
+        self._clock = clock
+        self._slice = slice_sec
+
+    def run(self) -> None:
+        rng = random.Random(self._kind)
+        step = self.STEPS[self._kind]
+        idle_from = self._horizon // 4
+        offsets = iter(range(0, self._horizon, step))
+        offset = next(offsets, None)
+        for slice_no in range(-(-self._horizon // self._slice)):
+            self._clock.wait_turn(slice_no)
+            while offset is not None and offset < (slice_no + 1) * self._slice:
+                for vehicle in self._vehicles:
+                    if offset < idle_from or vehicle not in self._idle:
+                        self.next(**self._row(rng, vehicle, offset))
+                offset = next(offsets, None)
+            self.commit()
+            self._clock.finish(self._kind, slice_no)
+
+    def _row(self, rng: random.Random, vehicle: str, offset: int) -> dict:
+        if self._kind == "gps":
+            return {
+                "vehicle_id": vehicle,
+                "latitude": 40.7 + rng.uniform(-0.05, 0.05),
+                "longitude": -74.0 + rng.uniform(-0.05, 0.05),
+                "speed": max(0.0, rng.gauss(70.0, 20.0)),
+                "timestamp": _ts(offset),
+            }
+        if self._kind == "fuel":
+            return {
+                "vehicle_id": vehicle,
+                "fuel_liters": max(0.1, rng.gauss(0.4, 0.1)),
+                "distance_km": max(0.0, rng.gauss(2.5, 0.5)),
+                "fuel_type": "diesel",
+                "timestamp": _ts(offset),
+            }
+        return {
+            "shipment_id": f"S-{vehicle}-{offset // 3600}",
+            "vehicle_id": vehicle,
+            "status": rng.choice(["in_transit", "loading", "delayed", "delivered"]),
+            "origin": "New York",
+            "destination": "Boston",
+            "timestamp": _ts(offset),
+        }
+
+
+def build_soak_pipeline(hours: float, vehicles: int, idle: int, slice_sec: int) -> dict:
+    """Streaming core of main.build_pipeline() fed by replay subjects; returns the API's tables."""
+    clock = _ReplayClock(_ReplaySubject.STEPS)
+
+    def replay(kind, schema):
+        subject = _ReplaySubject(kind, hours, vehicles, idle, clock, slice_sec)
+        return pw.io.python.read(subject, schema=schema, autocommit_duration_ms=None).with_columns(
+            parsed_time=pw.this.timestamp.dt.strptime("%Y-%m-%dT%H:%M:%S"),
+        )
+
+    gps = replay("gps", GPSSchema)
+    fuel = replay("fuel", FuelSchema)
+    shipments = replay("shipments", ShipmentSchema).with_columns(is_delayed=pw.this.status == "delayed")
+
+    telemetry = join_all_streams(gps, fuel, shipments)
+    telemetry = compute_carbon_emissions(telemetry)
+    telemetry = compute_fuel_efficiency(telemetry)
+    windowed = compute_rolling_windows(telemetry)
+
+    threshold_alerts = detect_threshold_anomalies(telemetry)
+    zscore_alerts = detect_zscore_anomalies(telemetry)
+    route_alerts = detect_route_deviations(telemetry)
+    history = all_time_input(windowed, telemetry)
+
+    return {
+        "gps": gps,
+        "fuel": fuel,
+        "shipments": shipments,
+        "telemetry": telemetry,
+        "windowed": windowed,
+        "threshold_alerts": threshold_alerts,
+        "zscore_alerts": zscore_alerts,
+        "route_alerts": route_alerts,
+        "all_alerts": served_alerts(combine_alerts(threshold_alerts, zscore_alerts, route_alerts)),
+        "accel_spikes": detect_acceleration_spikes(telemetry),
+        "idle_vehicles": detect_idle_vehicles(telemetry),
+        "rankings": compute_vehicle_rankings(history),
+        "risk_scores": compute_risk_scores(history, threshold_alerts, zscore_alerts, route_alerts),
+        "sustainability": compute_sustainability_scores(history),
+    }
+
+
+def check_rankings(store, hours: float, vehicles: int, idle: int) -> list:
+    """Problems with the carried window counts in the final rankings snapshot."""
+    window_sec = config.window.window_duration_sec
+    horizon = int(hours * 3600)
+    expected = {}
+    for i in range(vehicles):
+        active = horizon // 4 if i >= vehicles - idle else horizon
+        expected[f"V-{101 + i}"] = -(-active // window_sec)
+    counts = {row["vehicle_id"]: row["window_count"] for row in store.rows("rankings")}
+    problems = [f"{vid}: missing from rankings" for vid in expected if vid not in counts]
+    problems += [
+        f"{vid}: {counts[vid]} windows, expected {want}"
+        for vid, want in expected.items()
+        if vid in counts and counts[vid] != want
+    ]
+    print("window counts:", ", ".join(f"{vid}={counts.get(vid)}/{want}" for vid, want in expected.items()))
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--hours", type=float, default=24.0)
+    parser.add_argument("--vehicles", type=int, default=6)
+    parser.add_argument("--sample-sec", type=float, default=1.0)
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    parser.add_argument("--idle-vehicles", type=int, default=1, help="vehicles that go silent after the first quarter")
+    parser.add_argument("--slice-sec", type=int, default=60, help="event time the streams advance together per commit")
+    args = parser.parse_args()
+
+    tables = build_soak_pipeline(args.hours, args.vehicles, args.idle_vehicles, args.slice_sec)
+    store = build_snapshot_store(tables, served=SERVED_TABLES)
+
+    samples = []
+    done = threading.Event()
+
+    def sampler():
+        while not done.is_set():
+            samples.append(_rss_mb())
+            done.wait(args.sample_sec)
+
+    thread = threading.Thread(target=sampler, daemon=True)
+    started = time.perf_counter()
+    thread.start()
+    pw.run(monitoring_level=pw.MonitoringLevel.NONE)
+    done.set()
+    thread.join()
+    elapsed = time.perf_counter() - started
+
+    if len(samples) < 8:
+        print(f"Run too short for a verdict ({len(samples)} samples); increase --hours")
+        return 1
+
+    quarter = len(samples) // 4
+    baseline = statistics.median(samples[quarter:2 * quarter])
+    tail_peak = max(samples[3 * quarter:])
+    growth = (tail_peak - baseline) / baseline
+
+    print(f"replayed {args.hours:g} h × {args.vehicles} vehicles in {elapsed:.1f} s")
+    print(f"RSS baseline {baseline:.1f} MB, last-quarter peak {tail_peak:.1f} MB, growth {growth:+.1%}")
+    tenths = [samples[min(len(samples) - 1, len(samples) * i // 10)] for i in range(1, 11)]
+    print("RSS by tenth of the run (MB):", " ".join(f"{mb:.0f}" for mb in tenths))
+    print("API snapshot rows:", ", ".join(f"{name}={len(store.get(name))}" for name in SERVED_TABLES if store.has(name)))
+    problems = check_rankings(store, args.hours, args.vehicles, args.idle_vehicles)
+    if growth > args.tolerance:
+        problems.append(f"RSS grew more than {args.tolerance:.0%} after warm-up")
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    if problems:
+        return 1
+    print("OK: RSS flat, all-time totals carried")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
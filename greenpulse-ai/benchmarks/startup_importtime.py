@@ -0,0 +1,88 @@
+"""
+Benchmark — startup import cost, with and without the RAG subsystem.
+
+Runs each target in a fresh interpreter under `python -X importtime` and
+reports wall time, the summed import time, peak RSS, and the packages
+whose modules take the most import time (own time, summed per
+top-level package):
+
+  api-worker  api.worker — an API worker process (--api-mode process)
+  no-rag      main — the pipeline as started with --no-rag
+  rag         main + rag.document_store / rag.query_engine — what
+              build_pipeline() imports when RAG is enabled
+
+Model weights are not part of it: the embedder loads its model on the
+first document batch (rag/embedders.py).
+
+Usage (from greenpulse-ai/):
+    python benchmarks/startup_importtime.py
+    python benchmarks/startup_importtime.py --repeat 5 --top 15 --targets no-rag rag
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+TARGETS = {
+    "api-worker": "import api.worker",
+    "no-rag": "import main",
+    "rag": "import main, rag.document_store, rag.query_engine",
+}
+_RSS = "import resource; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+
+
+def measure(code: str):
+    """(wall s, summed import s, peak RSS MB, {top-level package: import s}) or an error line."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{code}; {_RSS}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - started
+    if result.returncode != 0:
+        lines = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        return lines[-1] if lines else f"exit code {result.returncode}"
+
+    total = 0
+    packages = defaultdict(int)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # "import time:  self_us | cumulative_us | <2 spaces per level>name"
+        self_us, _, name = line[len("import time:"):].split("|")
+        total += int(self_us)
+        packages[name.strip().split(".")[0]] += int(self_us)
+    rss_mb = int(result.stdout.strip().splitlines()[-1]) / 1024.0
+    return wall, total / 1e6, rss_mb, {name: us / 1e6 for name, us in packages.items()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--targets", nargs="+", choices=sorted(TARGETS), default=list(TARGETS))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per target; the median is reported")
+    parser.add_argument("--top", type=int, default=8, help="packages listed per target")
+    args = parser.parse_args()
+
+    for target in args.targets:
+        runs = [measure(TARGETS[target]) for _ in range(args.repeat)]
+        failed = [run for run in runs if isinstance(run, str)]
+        if failed:
+            print(f"{target:<11} failed: {failed[0]}")
+            continue
+        wall = statistics.median(run[0] for run in runs)
+        imports = statistics.median(run[1] for run in runs)
+        rss = statistics.median(run[2] for run in runs)
+        print(f"{target:<11} wall {wall:6.2f} s  imports {imports:6.2f} s  peak RSS {rss:7.1f} MB")
+        packages = runs[len(runs) // 2][3]
+        for name, seconds in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"              {seconds * 1000:8.1f} ms  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
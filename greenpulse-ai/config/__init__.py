@@ -5,6 +5,7 @@ All thresholds, window sizes, emission factors, and API settings
 are defined here for easy tuning and hackathon demo adjustments.
 """
 import os
+import tempfile
 from dataclasses import dataclass, field
 from typing import Dict, List, Tuple
 
@@ -15,6 +16,25 @@ class StreamConfig:
     gps_csv_path: str = "data/gps_sample.csv"
     fuel_csv_path: str = "data/fuel_sample.csv"
     shipments_csv_path: str = "data/shipments_sample.csv"
+    # Per-stream input format: "csv" (the paths above) or "parquet" /
+    # "arrow" (Arrow IPC) replayed from a file or directory of files with a
+    # typed timestamp column (ingestion/columnar.py, needs pyarrow)
+    gps_format: str = "csv"
+    fuel_format: str = "csv"
+    shipments_format: str = "csv"
+    gps_columnar_path: str = "data/columnar/gps"
+    fuel_columnar_path: str = "data/columnar/fuel"
+    shipments_columnar_path: str = "data/columnar/shipments"
+    columnar_batch_rows: int = 65_536
+    # GPS × fuel join: "asof" (latest fuel reading at or before each GPS
+    # point, one telemetry row per GPS point) or "interval" (every pair
+    # within ±gps_fuel_interval_sec)
+    gps_fuel_join_mode: str = "asof"
+    gps_fuel_interval_sec: int = 30
+    # Shipment enrichment: "current" (vehicle's status when each GPS point
+    # is processed), "asof" (status current at each telemetry row's event
+    # time) or "latest" (vehicle's latest status on all telemetry)
+    shipment_join_mode: str = "current"
     weather_poll_interval_sec: int = 10
     weather_api_url: str = "https://api.open-meteo.com/v1/forecast"
     weather_lat: float = 40.7128
@@ -42,6 +62,26 @@ class WindowConfig:
     # Hop size for tumbling windows
     hop_sec: int = 300  # 5 minutes
 
+    # State retention (event time). Window and join state older than the
+    # cutoff is dropped, bounding memory by fleet size × retention horizon.
+    retention_enabled: bool = True
+    retention_cutoff_sec: int = 3600  # 1 hour
+    # Hold window results back until event time passes window end + delay
+    retention_delay_sec: int = 0
+    # Keep results of windows past the cutoff (True) or retract them (False)
+    retention_keep_results: bool = False
+    # Fold retracted windows into all-time per-vehicle aggregates
+    # (rankings, risk, sustainability) instead of losing their totals
+    carry_forward_totals: bool = True
+    # Cutoff of the telemetry × shipment as-of join (shipment_join_mode
+    # "asof"): a vehicle's shipment status is forgotten this long after its
+    # last shipment event. The cutoff applies to both sides, so the join
+    # also keeps this much telemetry
+    shipment_state_cutoff_sec: int = 4 * 3600  # 4 hours
+    # The API's copy of all_alerts drops each alert this long after its
+    # timestamp (risk counts and reports still see every alert)
+    api_alert_ttl_sec: int = 6 * 3600  # 6 hours
+
 
 @dataclass
 class AnomalyConfig:
@@ -68,18 +108,80 @@ class AnomalyConfig:
 @dataclass
 class RagConfig:
     """RAG and LLM configuration."""
-    # LLM provider: "openai" or "gemini"
+    # False (--no-rag) skips the document store, embedder and LLM entirely;
+    # /ask then only answers what the intent router can
+    enabled: bool = True
+
+    # LLM provider: "openai" or "gemini"; "local" answers offline and
+    # deterministically by quoting the best-matching context documents;
+    # "fake" streams a canned answer (time-to-first-byte benchmarks)
     llm_provider: str = "openai"
     llm_model: str = "gpt-4o-mini"
+    local_llm_max_documents: int = 3
+    fake_llm_first_token_ms: int = 300
+    fake_llm_token_ms: int = 20
 
     # Embedding model
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
     embedding_dimension: int = 384
+    # CPU runtime for the embedding model (rag/encoders.py): "torch" (fp32),
+    # "torch-int8", "onnx" or "onnx-int8"; threads = 0 uses every core
+    embedding_backend: str = "torch"
+    embedding_threads: int = 0
+    # Quantized ONNX export in the model repo; avx2 / avx512 / arm64 variants
+    embedding_onnx_int8_file: str = "onnx/model_quint8_avx2.onnx"
+    # Embed in N worker processes (0: inside the dataflow process), at a
+    # lower priority (nice); set embedding_threads to cores / workers
+    embedding_workers: int = 0
+    embedding_worker_nice: int = 10
+
+    # Document embeddings: content-hash cache on disk (LRU-bounded) and
+    # micro-batching of documents that arrive within batch_wait_ms
+    embedding_cache_enabled: bool = True
+    embedding_cache_path: str = "data/cache/embeddings.sqlite"
+    embedding_cache_max_entries: int = 200_000
+    # Most recently used vectors also kept in memory; only these are served
+    # without a round trip through the batcher thread
+    embedding_cache_memory_entries: int = 4096
+    embedding_batch_size: int = 32
+    embedding_batch_wait_ms: int = 10
 
     # Index settings
     n_retrieval_results: int = 10
     chunk_size: int = 500
 
+    # Metric documents: "closed" indexes each vehicle window once, when it
+    # closes; "live" re-indexes on every update of an open window
+    metric_docs_mode: str = "closed"
+    # "closed" mode only: also index one in-place "current window" document
+    # per vehicle (rewritten on every update, but never more than one each)
+    current_window_docs: bool = False
+
+    # Index retention (event time; 0 disables a limit). Alert and window
+    # documents expire after their TTL, alerts are capped per vehicle, and
+    # windows are folded into per-vehicle hourly / daily summary documents
+    doc_retention_enabled: bool = True
+    alert_doc_ttl_sec: int = 6 * 3600
+    alert_docs_per_vehicle: int = 50
+    window_doc_ttl_sec: int = 2 * 3600
+    hourly_summary_ttl_sec: int = 2 * 86400
+    daily_summary_ttl_sec: int = 30 * 86400
+
+    # /ask answer cache: cosine-similarity match on the question, served
+    # only while the answer's source documents are unchanged
+    answer_cache_enabled: bool = True
+    answer_cache_similarity: float = 0.92
+    answer_cache_ttl_sec: float = 300.0
+    answer_cache_max_entries: int = 256
+
+    # /ask fast path: lookup questions (rankings, scores, states, forecasts,
+    # alert counts) are answered from the live tables without the LLM
+    intent_router_enabled: bool = True
+
+    # Retrieval scoped to the vehicles / document category a question names,
+    # sent to the document store as a JMESPath metadata filter
+    scoped_retrieval: bool = True
+
     # API keys (from environment)
     @property
     def openai_api_key(self) -> str:
@@ -97,6 +199,29 @@ class ApiConfig:
     port: int = 8000
     cors_origins: List[str] = field(default_factory=lambda: ["*"])
     log_level: str = "info"
+    # /stream push feed: per-client coalescing window and keep-alive interval
+    stream_coalesce_ms: int = 250
+    stream_keepalive_sec: int = 15
+    # Read endpoints: cache encoded response bodies until a source table changes
+    response_cache_enabled: bool = True
+    response_cache_max_entries: int = 256
+    # /pipeline-metrics: time constant of the EWMA event rates
+    metrics_rate_window_sec: float = 10.0
+    # "thread": uvicorn on a thread next to pw.run(); "process": N uvicorn
+    # workers serving snapshots the pipeline publishes to shared memory
+    mode: str = "thread"
+    workers: int = 2
+    shared_snapshot_dir: str = field(default_factory=lambda: os.path.join(
+        "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "greenpulse"
+    ))
+    snapshot_publish_ms: int = 200
+    snapshot_poll_ms: int = 100
+    # Process mode: the pipeline process keeps serving /ask here for the workers
+    internal_port: int = 8001
+    # /ask: engine worker threads, extra queued questions before 429, timeout
+    ask_workers: int = 4
+    ask_queue_size: int = 16
+    ask_timeout_sec: float = 60.0
 
 
 @dataclass
@@ -8,11 +8,13 @@ Detects:
 
 WHY STREAMING-SAFE:
 - Uses pw.temporal.windowby for stateful computations
-- State is maintained per-vehicle, per-window
+- State is maintained per-vehicle, per-window, and dropped once a
+  window falls behind the retention cutoff
 - No global state — fully partitioned by vehicle_id
 """
 import pathway as pw
 from config import config
+from streaming.retention import window_behavior
 
 
 def detect_acceleration_spikes(telemetry: pw.Table) -> pw.Table:
@@ -39,8 +41,9 @@ def detect_acceleration_spikes(telemetry: pw.Table) -> pw.Table:
         pw.this.timestamp,
         window=pw.temporal.tumbling(duration=pw.Duration(seconds=10)),
         instance=pw.this.vehicle_id,
+        behavior=window_behavior(),
     ).reduce(
-        vehicle_id=pw.this._instance,
+        vehicle_id=pw.this._pw_instance,
         max_speed=pw.reducers.max(pw.this.speed),
         min_speed=pw.reducers.min(pw.this.speed),
         window_time=pw.this._pw_window_start,
@@ -76,8 +79,9 @@ def detect_idle_vehicles(telemetry: pw.Table) -> pw.Table:
             duration=pw.Duration(seconds=idle_threshold)
         ),
         instance=pw.this.vehicle_id,
+        behavior=window_behavior(),
     ).reduce(
-        vehicle_id=pw.this._instance,
+        vehicle_id=pw.this._pw_instance,
         avg_speed=pw.reducers.avg(pw.this.speed),
         data_points=pw.reducers.count(),
         window_time=pw.this._pw_window_start,
@@ -0,0 +1,193 @@
+"""
+PHASE A — Columnar Replay (Parquet / Arrow IPC)
+
+Replays historical telemetry from Parquet or Arrow IPC files instead of
+CSV. Files are read in record batches with pyarrow; each batch is cast
+to the stream's schema (GPSSchema, FuelSchema, ShipmentSchema) and its
+event time is taken from a typed timestamp column.
+
+WHY COLUMNAR:
+- CSV replay tokenizes every field and parses every timestamp string
+  with strptime inside the dataflow; a typed timestamp column skips both
+- Each record batch crosses into the engine as ONE connector row (a
+  list of row tuples) and is flattened there: the Python connector's
+  per-message cost is paid per batch, not per row
+- Event time crosses as int64 epoch seconds; the engine derives
+  `parsed_time` and the ISO `timestamp` string from it, so the table
+  matches the CSV path column for column and nothing downstream changes
+- Files are far smaller than CSV (Parquet compression), which matters for
+  hundreds of millions of GPS points
+
+WHY STREAMING-SAFE:
+- A path is one file or a directory of files, replayed in name order;
+  in "streaming" mode the directory is polled and new files are replayed
+  as they appear (the columnar counterpart of appending to the CSV)
+- Each record batch is one commit, so downstream operators see batches
+  in file order exactly as with the CSV connector
+
+pyarrow is optional: only needed when a stream's format in StreamConfig
+is "parquet" or "arrow"; convert existing CSVs with csv_to_columnar().
+"""
+import os
+import time
+from typing import Iterator, List, Type
+
+import pathway as pw
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+
+FORMATS = ("parquet", "arrow")
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+_EXTENSIONS = {"parquet": (".parquet", ".pq"), "arrow": (".arrow", ".feather", ".ipc")}
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("Columnar ingestion needs pyarrow: pip install pyarrow")
+
+
+def _arrow_schema(schema: Type[pw.Schema]) -> "pa.Schema":
+    """The Arrow types a pw.Schema's columns are cast to; `timestamp` is typed, not a string."""
+    types = {str: pa.string(), float: pa.float64(), int: pa.int64(), bool: pa.bool_()}
+    fields = []
+    for name, hint in schema.typehints().items():
+        if name == "timestamp":
+            fields.append(pa.field(name, pa.timestamp("s")))
+        else:
+            fields.append(pa.field(name, types.get(hint, pa.string())))
+    return pa.schema(fields)
+
+
+def _files(path: str, fmt: str) -> List[str]:
+    if os.path.isfile(path):
+        return [path]
+    if not os.path.isdir(path):
+        return []
+    return sorted(
+        os.path.join(path, name)
+        for name in os.listdir(path)
+        if name.endswith(_EXTENSIONS[fmt]) and not name.startswith(".")
+    )
+
+
+def _batches(path: str, fmt: str, batch_rows: int, columns: List[str]) -> Iterator["pa.RecordBatch"]:
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        yield from pq.ParquetFile(path).iter_batches(batch_size=batch_rows, columns=columns)
+        return
+    with pa.memory_map(path) as source:
+        try:
+            reader = pa.ipc.open_file(source)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        except pa.ArrowInvalid:
+            source.seek(0)
+            batches = iter(pa.ipc.open_stream(source))
+        for batch in batches:
+            for offset in range(0, batch.num_rows, batch_rows):
+                yield batch.slice(offset, batch_rows).select(columns)
+
+
+def _typed(batch: "pa.RecordBatch", target: "pa.Schema") -> List["pa.Array"]:
+    """The batch's columns cast to the schema's types, with `timestamp` as int64 epoch seconds."""
+    columns = []
+    for field in target:
+        column = batch.column(field.name)
+        if field.name == "timestamp":
+            if pa.types.is_string(column.type):
+                column = pc.strptime(column, format=TIMESTAMP_FORMAT, unit="s")
+            column = column.cast(field.type).cast(pa.int64())
+        else:
+            column = column.cast(field.type)
+        columns.append(column)
+    return columns
+
+
+class _ColumnarSubject(pw.io.python.ConnectorSubject):
+    def __init__(self, path: str, fmt: str, schema: Type[pw.Schema], batch_rows: int, mode: str, poll_sec: float):
+        super().__init__()
+        self.path = path
+        self.fmt = fmt
+        self.target = _arrow_schema(schema)
+        self.batch_rows = batch_rows
+        self.mode = mode
+        self.poll_sec = poll_sec
+
+    def run(self) -> None:
+        replayed = set()
+        while True:
+            for path in _files(self.path, self.fmt):
+                if path in replayed:
+                    continue
+                replayed.add(path)
+                for batch in _batches(path, self.fmt, self.batch_rows, self.target.names):
+                    # Column-wise conversion is far cheaper than to_pylist() row dicts
+                    columns = (column.to_pylist() for column in _typed(batch, self.target))
+                    self.next(rows=list(zip(*columns)))
+                    self.commit()
+            if self.mode == "static":
+                return
+            time.sleep(self.poll_sec)
+
+
+def read_columnar(
+    path: str,
+    schema: Type[pw.Schema],
+    fmt: str = "parquet",
+    mode: str = "streaming",
+    batch_rows: int = 65_536,
+    autocommit_duration_ms: int = 1000,
+    poll_sec: float = 1.0,
+) -> pw.Table:
+    """
+    Replay Parquet / Arrow IPC files as a table of `schema` plus
+    parsed_time (pw.DateTimeNaive) — the columns the CSV streams have
+    after their strptime step.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown columnar format {fmt!r}; expected one of {FORMATS}")
+    _require_pyarrow()
+    hints = schema.typehints()
+    # One row per record batch: its rows as tuples, in schema column order
+    row_type = tuple[tuple(int if name == "timestamp" else hint for name, hint in hints.items())]
+    batches = pw.io.python.read(
+        _ColumnarSubject(path, fmt, schema, batch_rows, mode, poll_sec),
+        schema=pw.schema_from_types(rows=list[row_type]),
+        autocommit_duration_ms=autocommit_duration_ms,
+    )
+    rows = batches.flatten(pw.this.rows)
+    columns = {name: pw.this.rows[index] for index, name in enumerate(hints)}
+    rows = rows.select(**columns).with_columns(parsed_time=pw.this.timestamp.dt.from_timestamp(unit="s"))
+    return rows.with_columns(timestamp=pw.this.parsed_time.dt.strftime(TIMESTAMP_FORMAT))
+
+
+def csv_to_columnar(csv_path: str, out_path: str, schema: Type[pw.Schema], fmt: str = "parquet") -> int:
+    """Convert a stream CSV to a typed Parquet / Arrow IPC file; returns the row count."""
+    _require_pyarrow()
+    import pyarrow.csv as pcsv
+
+    target = _arrow_schema(schema)
+    table = pcsv.read_csv(
+        csv_path,
+        convert_options=pcsv.ConvertOptions(
+            column_types=target,
+            timestamp_parsers=[TIMESTAMP_FORMAT],
+            include_columns=target.names,
+        ),
+    )
+    if os.path.dirname(out_path):
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, out_path)
+    else:
+        with pa.OSFile(out_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return table.num_rows
@@ -1,7 +1,8 @@
 """
 PHASE A — Fuel Consumption Stream Module
 
-Ingests fuel consumption logs as a streaming table.
+Ingests fuel consumption logs as a streaming table, from CSV or from
+Parquet / Arrow IPC files (StreamConfig.fuel_format, see columnar.py).
 
 WHY STREAMING-SAFE:
 - Each fuel log is an independent event — no ordering dependency
@@ -10,6 +11,7 @@ WHY STREAMING-SAFE:
 """
 import pathway as pw
 from config import config
+from .columnar import read_columnar
 
 
 class FuelSchema(pw.Schema):
@@ -22,11 +24,21 @@ class FuelSchema(pw.Schema):
 
 def create_fuel_stream() -> pw.Table:
     """
-    Create a streaming fuel consumption table from CSV.
+    Create a streaming fuel consumption table from CSV (or Parquet / Arrow IPC).
 
     Returns:
         pw.Table: Reactive fuel consumption table
     """
+    stream_cfg = config.stream
+    if stream_cfg.fuel_format != "csv":
+        return read_columnar(
+            stream_cfg.fuel_columnar_path,
+            FuelSchema,
+            stream_cfg.fuel_format,
+            batch_rows=stream_cfg.columnar_batch_rows,
+            autocommit_duration_ms=1000,
+        )
+
     fuel_table = pw.io.csv.read(
         config.stream.fuel_csv_path,
         schema=FuelSchema,
@@ -1,7 +1,8 @@
 """
 PHASE A — GPS Stream Ingestion Module
 
-Uses Pathway's CSV connector to replay GPS data as a real-time stream.
+Uses Pathway's CSV connector to replay GPS data as a real-time stream,
+or Parquet / Arrow IPC files (StreamConfig.gps_format, see columnar.py).
 In production, replace with Kafka or MQTT connector.
 
 WHY STREAMING-SAFE:
@@ -11,6 +12,7 @@ WHY STREAMING-SAFE:
 """
 import pathway as pw
 from config import config
+from .columnar import read_columnar
 
 
 # Schema definition for GPS data points
@@ -24,7 +26,7 @@ class GPSSchema(pw.Schema):
 
 def create_gps_stream() -> pw.Table:
     """
-    Create a streaming GPS table from CSV file.
+    Create a streaming GPS table from CSV (or Parquet / Arrow IPC) files.
 
     The CSV file is monitored for new rows — any appended data
     automatically flows through the entire pipeline.
@@ -32,6 +34,17 @@ def create_gps_stream() -> pw.Table:
     Returns:
         pw.Table: Reactive GPS data table
     """
+    stream_cfg = config.stream
+    if stream_cfg.gps_format != "csv":
+        # Typed timestamps: parsed_time comes with the file, no strptime
+        return read_columnar(
+            stream_cfg.gps_columnar_path,
+            GPSSchema,
+            stream_cfg.gps_format,
+            batch_rows=stream_cfg.columnar_batch_rows,
+            autocommit_duration_ms=1000,
+        )
+
     gps_table = pw.io.csv.read(
         config.stream.gps_csv_path,
         schema=GPSSchema,
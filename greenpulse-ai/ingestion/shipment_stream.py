@@ -1,6 +1,9 @@
 """
 PHASE A — Shipment Status Stream Module
 
+Reads shipment status events from CSV or from Parquet / Arrow IPC files
+(StreamConfig.shipments_format, see columnar.py).
+
 WHY STREAMING-SAFE:
 - Shipment status changes are discrete events
 - Each update triggers only affected downstream computations
@@ -8,6 +11,7 @@ WHY STREAMING-SAFE:
 """
 import pathway as pw
 from config import config
+from .columnar import read_columnar
 
 
 class ShipmentSchema(pw.Schema):
@@ -26,8 +30,19 @@ def create_shipment_stream() -> pw.Table:
     Returns:
         pw.Table: Reactive shipment status table
     """
+    stream_cfg = config.stream
+    if stream_cfg.shipments_format != "csv":
+        shipment_table = read_columnar(
+            stream_cfg.shipments_columnar_path,
+            ShipmentSchema,
+            stream_cfg.shipments_format,
+            batch_rows=stream_cfg.columnar_batch_rows,
+            autocommit_duration_ms=2000,
+        )
+        return shipment_table.with_columns(is_delayed=pw.this.status == "delayed")
+
     shipment_table = pw.io.csv.read(
-        config.stream.shipments_csv_path,
+        stream_cfg.shipments_csv_path,
         schema=ShipmentSchema,
         mode="streaming",
         autocommit_duration_ms=2000,
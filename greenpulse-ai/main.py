@@ -12,13 +12,18 @@ Orchestrates the complete streaming pipeline including:
   7. Fleet Intelligence Reports (NEW)
   8. Live RAG with Document Store
   9. Rankings + Risk + Sustainability Scores
- 10. FastAPI server
+ 10. FastAPI server (in-process thread, or worker processes reading
+     shared-memory snapshots with --api-mode process)
 
 New modules (v2.0):
   state_machine/ → 6-state event-driven vehicle state machine
   forecasting/   → Carbon, risk, and fuel exhaustion predictions
   reporting/     → 5-minute auto-generated fleet intelligence reports
 """
+import argparse
+import os
+import subprocess
+import sys
 import threading
 import pathway as pw
 import uvicorn
@@ -30,7 +35,8 @@ from ingestion import (
     create_shipment_stream,
     create_weather_stream,
 )
-from streaming import join_all_streams, compute_rolling_windows
+from streaming import join_all_streams, compute_rolling_windows, compute_closed_windows
+from streaming.retention import all_time_input, expire_after
 from features import (
     compute_carbon_emissions,
     compute_fuel_efficiency,
@@ -39,20 +45,22 @@ from features import (
     detect_fuel_drops,
 )
 from anomalies import (
+    combine_alerts,
     detect_threshold_anomalies,
     detect_zscore_anomalies,
     detect_route_deviations,
+    served_alerts,
 )
 from state_machine import compute_vehicle_states, compute_state_history
 from forecasting import compute_predictions
 from reporting import compute_fleet_reports
-from rag import create_document_store, create_query_engine
 from services import (
     compute_vehicle_rankings,
     compute_risk_scores,
     compute_sustainability_scores,
 )
-from api import app, register_tables
+from api import app, pipeline_stats_state, register_tables, snapshot_store
+from api.shared_snapshot import SnapshotPublisher
 from config import config
 
 
@@ -100,13 +108,15 @@ def build_pipeline():
     threshold_alerts = detect_threshold_anomalies(telemetry)
     zscore_alerts = detect_zscore_anomalies(telemetry)
     route_alerts = detect_route_deviations(telemetry)
-    all_alerts = threshold_alerts.concat(zscore_alerts).concat(route_alerts)
+    all_alerts = combine_alerts(threshold_alerts, zscore_alerts, route_alerts)
 
     # PHASE G: Rankings & Scoring
     logger.info("🏆 Computing rankings and scores...")
-    rankings = compute_vehicle_rankings(windowed)
-    risk_scores = compute_risk_scores(windowed, threshold_alerts, zscore_alerts, route_alerts)
-    sustainability = compute_sustainability_scores(windowed)
+    # All-time aggregates: windows plus a row per vehicle that outlives retention
+    history = all_time_input(windowed, telemetry)
+    rankings = compute_vehicle_rankings(history)
+    risk_scores = compute_risk_scores(history, threshold_alerts, zscore_alerts, route_alerts)
+    sustainability = compute_sustainability_scores(history)
 
     # PART 1: Vehicle State Machine (NEW)
     logger.info("🤖 Building vehicle state machine...")
@@ -124,62 +134,144 @@ def build_pipeline():
     )
 
     # PHASE D: Live RAG (include new tables)
-    logger.info("🧠 Building live RAG document store...")
-    doc_store = create_document_store(all_alerts, windowed)
-    query_engine = create_query_engine(doc_store)
+    closed_windows = None
+    query_engine = None
+    if config.rag.enabled:
+        logger.info("🧠 Building live RAG document store...")
+        # Imported here: the LLM xpack, embedder and LLM client cost seconds of startup
+        from rag import create_document_store, create_query_engine
+
+        # Metric documents from closed windows only: one index write per vehicle per window
+        if config.rag.metric_docs_mode == "closed":
+            closed_windows = compute_closed_windows(telemetry)
+        doc_store = create_document_store(all_alerts, windowed, closed_windows)
+        query_engine = create_query_engine(doc_store)
+    else:
+        logger.info("🧠 RAG disabled: /ask answers lookup questions only")
 
     # Register ALL tables for API access
-    register_tables(
-        {
-            "gps": gps,
-            "fuel": fuel,
-            "shipments": shipments,
-            "weather": weather,
-            "telemetry": telemetry,
-            "windowed": windowed,
-            "threshold_alerts": threshold_alerts,
-            "zscore_alerts": zscore_alerts,
-            "route_alerts": route_alerts,
-            "all_alerts": all_alerts,
-            "rankings": rankings,
-            "risk_scores": risk_scores,
-            "sustainability": sustainability,
-            "accel_spikes": accel_spikes,
-            "idle_vehicles": idle_vehicles,
-            # v2.0 new tables
-            "vehicle_states": vehicle_states,
-            "state_history": state_history,
-            "predictions": predictions,
-            "latest_report": latest_report,
-            "report_history": report_history,
-        },
-        query_engine=query_engine,
-    )
+    tables = {
+        "gps": gps,
+        "fuel": fuel,
+        "shipments": shipments,
+        "weather": weather,
+        "telemetry": telemetry,
+        "windowed": windowed,
+        "threshold_alerts": threshold_alerts,
+        "zscore_alerts": zscore_alerts,
+        "route_alerts": route_alerts,
+        "all_alerts": served_alerts(all_alerts),
+        "rankings": rankings,
+        "risk_scores": risk_scores,
+        "sustainability": sustainability,
+        "accel_spikes": accel_spikes,
+        "idle_vehicles": idle_vehicles,
+        # v2.0 new tables
+        "vehicle_states": vehicle_states,
+        "state_history": state_history,
+        "predictions": predictions,
+        "latest_report": latest_report,
+        "report_history": report_history,
+    }
+    if closed_windows is not None:
+        # Exactly-once windows keep their results; bound the API's copy like windowed
+        if config.window.retention_enabled:
+            closed_windows = expire_after(closed_windows, "window_end", config.window.retention_cutoff_sec)
+        tables["closed_windows"] = closed_windows
+    register_tables(tables, query_engine=query_engine)
 
     logger.info("✅ GreenPulse AI v2.0 pipeline ready!")
     return windowed
 
 
-def main():
-    logger.info("🌿 GreenPulse AI v2.0 — Starting up...")
-
-    build_pipeline()
-
+def _start_api_thread(host: str, port: int):
     api_thread = threading.Thread(
         target=uvicorn.run,
         args=(app,),
         kwargs={
-            "host": config.api.host,
-            "port": config.api.port,
+            "host": host,
+            "port": port,
             "log_level": config.api.log_level,
         },
         daemon=True,
     )
     api_thread.start()
-    logger.info(f"🌐 API server on http://{config.api.host}:{config.api.port}")
+
+
+def _spawn_api_workers(workers: int) -> subprocess.Popen:
+    """
+    Serve the API from `workers` uvicorn processes (api.worker:app) that
+    read the snapshots this process publishes to shared memory.
+    """
+    SnapshotPublisher(
+        snapshot_store(),
+        config.api.shared_snapshot_dir,
+        interval_ms=config.api.snapshot_publish_ms,
+        stats=pipeline_stats_state,
+    ).start()
+
+    # The RAG engine lives in this process; workers forward /ask here
+    _start_api_thread("127.0.0.1", config.api.internal_port)
+
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "api.worker:app",
+            "--host", config.api.host,
+            "--port", str(config.api.port),
+            "--workers", str(workers),
+            "--log-level", config.api.log_level,
+        ],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GreenPulse AI streaming pipeline + API")
+    parser.add_argument(
+        "--api-mode",
+        choices=("thread", "process"),
+        default=config.api.mode,
+        help="thread: API in this process; process: API workers fed by shared-memory snapshots",
+    )
+    parser.add_argument("--api-workers", type=int, default=config.api.workers)
+    parser.add_argument(
+        "--llm-provider",
+        choices=("openai", "gemini", "local", "fake"),
+        default=config.rag.llm_provider,
+        help="local: offline extractive answers, no API key needed",
+    )
+    parser.add_argument(
+        "--no-rag",
+        action="store_true",
+        default=not config.rag.enabled,
+        help="skip the document store and LLM: faster startup, less memory",
+    )
+    args = parser.parse_args()
+    config.rag.llm_provider = args.llm_provider
+    config.rag.enabled = not args.no_rag
+
+    logger.info("🌿 GreenPulse AI v2.0 — Starting up...")
+
+    build_pipeline()
+
+    workers = None
+    if args.api_mode == "process":
+        workers = _spawn_api_workers(args.api_workers)
+        logger.info(
+            f"🌐 API server on http://{config.api.host}:{config.api.port} "
+            f"({args.api_workers} worker processes, snapshots in {config.api.shared_snapshot_dir})"
+        )
+    else:
+        _start_api_thread(config.api.host, config.api.port)
+        logger.info(f"🌐 API server on http://{config.api.host}:{config.api.port}")
 
     logger.info("🚀 Starting Pathway streaming engine...")
-    pw.run(monitoring_level=pw.MonitoringLevel.ALL)
+    try:
+        pw.run(monitoring_level=pw.MonitoringLevel.ALL)
+    finally:
+        if workers is not None:
+            workers.terminate()
+            workers.wait()
 
 
 if __name__ == "__main__":
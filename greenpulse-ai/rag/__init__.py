@@ -1,5 +1,27 @@
-"""RAG package."""
-from .document_store import create_document_store
-from .query_engine import create_query_engine
+"""
+RAG package.
+
+create_document_store / create_query_engine are imported on first use:
+they pull in pathway.xpacks.llm, the embedding model and the LLM client,
+which a pipeline started with RAG disabled (--no-rag) never needs.
+Lightweight modules (intent_router, metadata_filters, answer_cache, ...) can
+be imported on their own.
+"""
+import importlib
+from typing import Any
 
 __all__ = ["create_document_store", "create_query_engine"]
+
+_LAZY = {
+    "create_document_store": ".document_store",
+    "create_query_engine": ".query_engine",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,268 @@
+"""
+PHASE D — Semantic Answer Cache
+
+Serves repeated /ask questions without another retrieval + LLM round
+trip, for as long as the documents behind the cached answer are unchanged.
+
+WHY STREAMING-SAFE:
+- Every document is keyed by (vehicle_id, category), matching the alert
+  and metrics documents built in rag/document_store.py; the live tables
+  behind the document store bump a version per key as rows change
+- A cached answer records the versions of the documents it was built
+  from (parsed from its sources) and is only served while all of them
+  are unchanged; answers without identifiable sources depend on the
+  whole document-store version
+- Questions match on cosine similarity of normalized embeddings, but only
+  when they mention the same vehicle IDs ("V-103" must never be served
+  an answer about "V-104")
+- TTL and LRU eviction bound both staleness and memory
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import config
+
+
+# (vehicle_id, document category) — the unit of invalidation
+DocKey = Tuple[str, str]
+
+_VEHICLE_ID = re.compile(r"\b[Vv]-?\d+\b")
+_SOURCE_VEHICLE = re.compile(r"Vehicle\s+([\w-]+)")
+_SOURCE_CATEGORY = {"ALERT": "alert", "METRICS": "metrics", "SUMMARY": "metrics"}
+
+
+def normalize_question(question: str) -> str:
+    return " ".join(question.lower().split())
+
+
+def question_vehicles(question: str) -> FrozenSet[str]:
+    return frozenset(match.upper() for match in _VEHICLE_ID.findall(question))
+
+
+class HashingEmbedder:
+    """
+    Dependency-free fallback: signed feature hashing of word unigrams and
+    bigrams. Good enough to match rephrasings of the same question, at a
+    lower similarity than a sentence model scores them.
+    """
+
+    # Rephrasings ("which vehicle emitted most carbon" / "... the most
+    # carbon?") score ~0.8 here, versus >0.95 with sentence-transformers
+    similarity = 0.75
+
+    def __init__(self, dimension: int = 512):
+        self.dimension = dimension
+
+    def __call__(self, text: str) -> np.ndarray:
+        words = re.findall(r"[a-z0-9-]+", text.lower())
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dimension
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        return vector
+
+
+def default_question_embedder() -> Callable[[str], np.ndarray]:
+    """The RAG embedding model if sentence-transformers is installed, else feature hashing."""
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return HashingEmbedder()
+    model_name = config.rag.embedding_model.replace("sentence-transformers/", "")
+    model = SentenceTransformer(model_name)
+    return lambda text: model.encode(text)
+
+
+def source_keys(sources: Sequence[Any]) -> Optional[FrozenSet[DocKey]]:
+    """
+    Document keys behind an answer's sources: document texts ("ALERT ...
+    Vehicle V-101: ...") or dicts carrying the document metadata.
+    None if no source can be attributed to a document.
+    """
+    keys = set()
+    for source in sources:
+        if isinstance(source, dict):
+            metadata = source.get("metadata", source)
+            if isinstance(metadata, str):
+                try:
+                    metadata = json.loads(metadata)
+                except ValueError:
+                    metadata = {}
+            if metadata.get("vehicle_id") and metadata.get("category"):
+                keys.add((str(metadata["vehicle_id"]), str(metadata["category"])))
+                continue
+            source = source.get("text", "")
+        text = str(source)
+        vehicle = _SOURCE_VEHICLE.search(text)
+        category = _SOURCE_CATEGORY.get(text.split(" ", 1)[0])
+        if vehicle and category:
+            keys.add((vehicle.group(1), category))
+    return frozenset(keys) if keys else None
+
+
+class _Entry:
+    __slots__ = ("embedding", "vehicles", "result", "created_at", "deps", "store_version")
+
+    def __init__(self, embedding, vehicles, result, created_at, deps, store_version):
+        self.embedding = embedding
+        self.vehicles = vehicles
+        self.result = result
+        self.created_at = created_at
+        self.deps = deps
+        self.store_version = store_version
+
+
+class AnswerCache:
+    """Similarity-matched answer cache invalidated by document versions."""
+
+    def __init__(
+        self,
+        embed: Optional[Callable[[str], np.ndarray]] = None,
+        similarity: float = 0.92,
+        ttl_sec: float = 300.0,
+        max_entries: int = 256,
+    ):
+        self._embed = embed
+        self.similarity = similarity
+        self.ttl_sec = ttl_sec
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._doc_versions: Dict[DocKey, int] = {}
+        self._store_version = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+
+    def embed(self, question: str) -> np.ndarray:
+        if self._embed is None:
+            self._embed = default_question_embedder()
+            self.similarity = min(self.similarity, getattr(self._embed, "similarity", self.similarity))
+        vector = np.asarray(self._embed(normalize_question(question)), dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+    # ── Document changes (snapshot listeners, engine thread) ──
+
+    def on_documents_changed(self, keys: Iterable[DocKey]) -> None:
+        with self._lock:
+            for key in keys:
+                self._doc_versions[key] = self._doc_versions.get(key, 0) + 1
+            self._store_version += 1
+
+    # ── Lookups (ask worker threads) ──
+
+    def lookup(self, question: str, embedding: Optional[np.ndarray] = None) -> Optional[Dict[str, Any]]:
+        embedding = self.embed(question) if embedding is None else embedding
+        vehicles = question_vehicles(question)
+        now = time.time()
+        with self._lock:
+            best_key, best_score = None, self.similarity
+            for key, entry in list(self._entries.items()):
+                if not self._is_valid(entry, now):
+                    del self._entries[key]
+                    self.invalidated += 1
+                    continue
+                if entry.vehicles != vehicles:
+                    continue
+                score = float(np.dot(entry.embedding, embedding))
+                if score >= best_score:
+                    best_key, best_score = key, score
+            if best_key is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            return self._entries[best_key].result
+
+    def versions(self) -> Tuple[Dict[DocKey, int], int]:
+        """Document versions to pass to store() — take them before answering."""
+        with self._lock:
+            return dict(self._doc_versions), self._store_version
+
+    def store(
+        self,
+        question: str,
+        result: Dict[str, Any],
+        versions: Tuple[Dict[DocKey, int], int],
+        embedding: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Cache `result`, pinned to the document versions seen before it was
+        computed, so a document updated mid-answer invalidates it at once.
+        """
+        embedding = self.embed(question) if embedding is None else embedding
+        deps = source_keys(result.get("sources", []) or [])
+        doc_versions, store_version = versions
+        with self._lock:
+            entry = _Entry(
+                embedding=embedding,
+                vehicles=question_vehicles(question),
+                result=result,
+                created_at=time.time(),
+                deps={key: doc_versions.get(key, 0) for key in deps} if deps else None,
+                store_version=store_version,
+            )
+            key = normalize_question(question)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _is_valid(self, entry: _Entry, now: float) -> bool:
+        if now - entry.created_at > self.ttl_sec:
+            return False
+        if entry.deps is None:
+            return entry.store_version == self._store_version
+        return all(self._doc_versions.get(key, 0) == version for key, version in entry.deps.items())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidated": self.invalidated,
+            }
+
+
+class CachedQueryEngine:
+    """Wraps a query engine's answer() with an AnswerCache."""
+
+    def __init__(self, engine: Any, cache: AnswerCache):
+        self.engine = engine
+        self.cache = cache
+
+    def answer(self, question: str) -> Dict[str, Any]:
+        embedding = self.cache.embed(question)
+        cached = self.cache.lookup(question, embedding)
+        if cached is not None:
+            return cached
+        versions = self.cache.versions()
+        result = self.engine.answer(question)
+        self.cache.store(question, result, versions, embedding)
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.engine, name)
+
+
+def create_answer_cache() -> AnswerCache:
+    rag_cfg = config.rag
+    return AnswerCache(
+        similarity=rag_cfg.answer_cache_similarity,
+        ttl_sec=rag_cfg.answer_cache_ttl_sec,
+        max_entries=rag_cfg.answer_cache_max_entries,
+    )
+
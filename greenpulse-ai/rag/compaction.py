@@ -0,0 +1,100 @@
+"""
+PHASE D — RAG Index Retention & Compaction
+
+Bounds the live document store to a fixed size per vehicle: documents
+leave the index once they age past their TTL (event time, see
+streaming/retention.expire_after), alert bursts are capped per vehicle,
+and window documents are folded into per-vehicle hourly and daily
+summary documents before they expire.
+
+WHY COMPACTION:
+- Without retention every alert and window document stays in the vector
+  + BM25 index forever, so memory and retrieval latency grow with uptime
+- Recent questions retrieve recent, fine-grained documents; questions
+  about older periods still find one summary per vehicle per hour / day
+- Summaries are emitted once per period (exactly-once windows), so
+  compaction adds at most one index write per vehicle per hour / day
+
+Rollups need every window of their period. They read the closed-window
+table (RagConfig.metric_docs_mode = "closed"); in "live" mode they read
+windowed, whose rows leave at WindowConfig.retention_cutoff_sec — daily
+summaries are then only complete if that cutoff exceeds a day.
+"""
+import pathway as pw
+
+from .documents import metric_metadata, summary_text
+
+
+def cap_per_vehicle(table: pw.Table, time_column: str, limit: int) -> pw.Table:
+    """
+    The newest `limit` rows per vehicle_id of `table`.
+
+    Kept rows keep their original ids, so admitting a new row only
+    inserts it and retracts the vehicle's oldest — the rest of the
+    vehicle's rows are not re-emitted.
+    """
+    newest = table.groupby(pw.this.vehicle_id).reduce(
+        keep=pw.apply_with_type(
+            lambda rows: [ptr for _, ptr in sorted(rows, key=lambda row: row[0], reverse=True)[:limit]],
+            list[pw.Pointer],
+            pw.reducers.tuple(pw.make_tuple(pw.this[time_column], pw.this.id)),
+        ),
+    ).flatten(pw.this.keep)
+    kept = newest.with_id(newest.keep)
+    original = table.ix(kept.id)
+    return kept.select(**{name: original[name] for name in table.column_names()})
+
+
+def rollup_windows(windows: pw.Table, period_sec: int) -> pw.Table:
+    """
+    Per-vehicle summary of window aggregates over tumbling periods of
+    period_sec, emitted once each period closes.
+    """
+    summaries = windows.windowby(
+        pw.this.window_start,
+        window=pw.temporal.tumbling(duration=pw.Duration(seconds=period_sec)),
+        instance=pw.this.vehicle_id,
+        behavior=pw.temporal.exactly_once_behavior(),
+    ).reduce(
+        vehicle_id=pw.this._pw_instance,
+        period_start=pw.this._pw_window_start,
+        period_end=pw.this._pw_window_end,
+        window_count=pw.reducers.count(),
+        avg_speed=pw.reducers.avg(pw.this.avg_speed),
+        max_speed=pw.reducers.max(pw.this.max_speed),
+        total_fuel=pw.reducers.sum(pw.this.total_fuel),
+        total_distance=pw.reducers.sum(pw.this.total_distance),
+        carbon_kg=pw.reducers.sum(pw.this.carbon_kg),
+    )
+    return summaries.with_columns(
+        fuel_efficiency=pw.if_else(
+            pw.this.total_fuel > 0,
+            pw.this.total_distance / pw.this.total_fuel,
+            0.0,
+        ),
+    )
+
+
+def summary_documents(summaries: pw.Table, period: str) -> pw.Table:
+    """One document per rollup_windows row; `period` is "hourly" or "daily"."""
+    return summaries.select(
+        text=pw.apply_with_type(
+            lambda *values: summary_text(period, *values),
+            str,
+            pw.this.vehicle_id,
+            pw.this.period_start,
+            pw.this.period_end,
+            pw.this.window_count,
+            pw.this.avg_speed,
+            pw.this.max_speed,
+            pw.this.total_fuel,
+            pw.this.total_distance,
+            pw.this.carbon_kg,
+            pw.this.fuel_efficiency,
+        ),
+        metadata=pw.apply_with_type(
+            lambda vid: pw.Json(metric_metadata(vid, period)),
+            pw.Json,
+            pw.this.vehicle_id,
+        ),
+    )
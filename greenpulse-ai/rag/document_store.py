@@ -9,23 +9,35 @@ WHY STREAMING-SAFE:
 - New documents are embedded and indexed as they arrive
 - No full re-indexing — only delta updates
 - Vector + BM25 hybrid search for best retrieval quality
+- Identical document texts are embedded once (content-hash cache), and
+  concurrent documents share batched forward passes (rag/embedders.py)
+- Documents expire by event-time TTL and old windows are compacted into
+  hourly / daily summaries (rag/compaction.py), so the index size is
+  bounded per vehicle
 """
+from typing import Optional
+
 import pathway as pw
+from pathway.stdlib.indexing import BruteForceKnnFactory, HybridIndexFactory, TantivyBM25Factory
 from pathway.xpacks.llm.document_store import DocumentStore
-from pathway.xpacks.llm.embedders import SentenceTransformerEmbedder
 from config import config
+from streaming.retention import expire_after
+from .compaction import cap_per_vehicle, rollup_windows, summary_documents
+from .documents import alert_metadata, alert_text, metric_metadata, metric_text
+from .embedders import create_embedder
 
 
 def create_document_store(
     alerts: pw.Table,
     windowed_metrics: pw.Table,
+    closed_metrics: Optional[pw.Table] = None,
 ) -> DocumentStore:
     """
     Create a live Pathway Document Store with hybrid indexing.
 
     Documents indexed:
     1. Alert descriptions (anomaly events)
-    2. Emission summaries (per-vehicle carbon stats)
+    2. Emission summaries (per-vehicle hourly / daily rollups)
     3. Window metrics (aggregated telemetry)
 
     WHY HYBRID INDEX:
@@ -33,53 +45,102 @@ def create_document_store(
     - BM25 catches exact term matches ("V-101", "speed threshold")
     - Combined scoring gives best retrieval precision
 
+    WHY CLOSED WINDOWS:
+    - Every telemetry event updates its open window, and a metric document
+      built from the live table is re-embedded and re-indexed each time
+    - With closed_metrics (compute_closed_windows) each vehicle window
+      becomes one document, written once when the window closes
+    - RagConfig.current_window_docs adds one "current window" document per
+      vehicle, overwritten in place, so the open window stays searchable
+
     Args:
         alerts: Streaming alerts table
         windowed_metrics: Windowed aggregation table
+        closed_metrics: The same aggregates emitted once per closed window;
+            when given, metric documents are built from it instead
 
     Returns:
         DocumentStore: Live, auto-updating document store
     """
     rag_cfg = config.rag
 
-    # Create embedder
-    embedder = SentenceTransformerEmbedder(
-        model=rag_cfg.embedding_model,
-        dimension=rag_cfg.embedding_dimension,
-    )
+    # Create embedder (cached + micro-batched unless disabled in RagConfig)
+    embedder = create_embedder()
+
+    retention = rag_cfg.doc_retention_enabled
+    metric_rows = windowed_metrics if closed_metrics is None else closed_metrics
+
+    if retention:
+        # Age first, so the per-vehicle cap only ranks live alerts
+        if rag_cfg.alert_doc_ttl_sec > 0:
+            alerts = expire_after(alerts, "timestamp", rag_cfg.alert_doc_ttl_sec)
+        if rag_cfg.alert_docs_per_vehicle > 0:
+            alerts = cap_per_vehicle(alerts, "timestamp", rag_cfg.alert_docs_per_vehicle)
 
     # Convert alerts to documents
     alert_docs = alerts.select(
-        text=pw.apply(
-            lambda vid, atype, sev, msg, ts: (
-                f"ALERT [{sev.upper()}] Vehicle {vid}: {msg}. "
-                f"Type: {atype}. Time: {ts}"
-            ),
+        text=pw.apply_with_type(
+            alert_text,
+            str,
             pw.this.vehicle_id,
             pw.this.anomaly_type,
             pw.this.severity,
             pw.this.message,
             pw.this.timestamp,
         ),
-        metadata=pw.apply(
-            lambda vid, atype: f'{{"vehicle_id": "{vid}", "type": "{atype}", "category": "alert"}}',
+        metadata=pw.apply_with_type(
+            lambda vid, atype: pw.Json(alert_metadata(vid, atype)),
+            pw.Json,
             pw.this.vehicle_id,
             pw.this.anomaly_type,
         ),
     )
 
     # Convert windowed metrics to documents
-    metric_docs = windowed_metrics.select(
-        text=pw.apply(
-            lambda vid, avg_s, fuel, dist, carbon, eff, ws: (
-                f"METRICS Vehicle {vid}: "
-                f"Avg speed {avg_s:.0f} km/h, "
-                f"Fuel consumed {fuel:.1f}L, "
-                f"Distance {dist:.1f}km, "
-                f"Carbon emitted {carbon:.1f}kg CO₂, "
-                f"Efficiency {eff:.1f} km/L. "
-                f"Window: {ws}"
+    window_rows = metric_rows
+    if retention and rag_cfg.window_doc_ttl_sec > 0:
+        window_rows = expire_after(metric_rows, "window_end", rag_cfg.window_doc_ttl_sec)
+    doc_tables = [alert_docs, _metric_documents(window_rows)]
+
+    if closed_metrics is not None and rag_cfg.current_window_docs:
+        current_docs = _metric_documents(_current_windows(windowed_metrics), heading="METRICS (current window)")
+        doc_tables.append(current_docs)
+
+    # Compaction: windows live on as per-vehicle hourly / daily summaries
+    if retention:
+        for period, period_sec, ttl_sec in (
+            ("hourly", 3600, rag_cfg.hourly_summary_ttl_sec),
+            ("daily", 86400, rag_cfg.daily_summary_ttl_sec),
+        ):
+            if ttl_sec <= 0:
+                continue
+            summaries = expire_after(rollup_windows(metric_rows, period_sec), "period_end", ttl_sec)
+            doc_tables.append(summary_documents(summaries, period))
+
+    # Combine all document sources, in the DocumentStore's data / _metadata columns
+    all_docs = doc_tables[0].concat_reindex(*doc_tables[1:])
+    all_docs = all_docs.select(data=pw.this.text, _metadata=pw.this.metadata)
+
+    # Create document store with hybrid retrieval (vector + BM25, reciprocal rank fusion)
+    doc_store = DocumentStore(
+        docs=all_docs,
+        retriever_factory=HybridIndexFactory([
+            BruteForceKnnFactory(embedder=embedder),
+            TantivyBM25Factory(),
+        ]),
+    )
+
+    return doc_store
+
+
+def _metric_documents(windows: pw.Table, heading: str = "METRICS") -> pw.Table:
+    """One document per row of a windowed aggregation table."""
+    return windows.select(
+        text=pw.apply_with_type(
+            lambda vid, avg_s, fuel, dist, carbon, eff, ws: metric_text(
+                vid, avg_s, fuel, dist, carbon, eff, ws, heading=heading
             ),
+            str,
             pw.this.vehicle_id,
             pw.this.avg_speed,
             pw.this.total_fuel,
@@ -88,21 +149,27 @@ def create_document_store(
             pw.this.fuel_efficiency,
             pw.this.window_start,
         ),
-        metadata=pw.apply(
-            lambda vid: f'{{"vehicle_id": "{vid}", "category": "metrics"}}',
+        metadata=pw.apply_with_type(
+            lambda vid: pw.Json(metric_metadata(vid)),
+            pw.Json,
             pw.this.vehicle_id,
         ),
     )
 
-    # Combine all document sources
-    all_docs = alert_docs.concat(metric_docs)
 
-    # Create document store with hybrid retrieval
-    doc_store = DocumentStore(
-        docs=all_docs,
-        embedder=embedder,
-        retriever_factory=None,  # Uses default hybrid retrieval
-        n_retrieval_results=rag_cfg.n_retrieval_results,
+def _current_windows(windowed_metrics: pw.Table) -> pw.Table:
+    """Each vehicle's latest window, keyed by vehicle so it updates in place."""
+    latest = windowed_metrics.groupby(pw.this.vehicle_id).reduce(
+        vehicle_id=pw.this.vehicle_id,
+        row=pw.reducers.argmax(pw.this.window_start),
+    )
+    current = windowed_metrics.ix(latest.row)
+    return latest.select(
+        vehicle_id=latest.vehicle_id,
+        avg_speed=current.avg_speed,
+        total_fuel=current.total_fuel,
+        total_distance=current.total_distance,
+        carbon_kg=current.carbon_kg,
+        fuel_efficiency=current.fuel_efficiency,
+        window_start=current.window_start,
     )
-
-    return doc_store
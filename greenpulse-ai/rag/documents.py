@@ -0,0 +1,81 @@
+"""
+PHASE D — RAG Document Rendering
+
+Text and metadata of every document kind indexed by the Pathway document
+store (rag/document_store.py, rag/compaction.py).
+
+Metadata is a plain dict — vehicle_id, its canonical vehicle_key ("V103"
+for "V-103"), category ("alert" / "metrics") and, where it applies, the
+alert type or summary period — stored as JSON so JMESPath metadata
+filters (rag/metadata_filters.py) can select on it.
+"""
+from typing import Any, Dict, Optional
+
+from .intent_router import canonical_vehicle
+
+
+def alert_text(vehicle_id: str, anomaly_type: str, severity: str, message: str, timestamp: Any) -> str:
+    return (
+        f"ALERT [{str(severity).upper()}] Vehicle {vehicle_id}: {message}. "
+        f"Type: {anomaly_type}. Time: {timestamp}"
+    )
+
+
+def metric_text(
+    vehicle_id: str,
+    avg_speed: float,
+    total_fuel: float,
+    total_distance: float,
+    carbon_kg: float,
+    fuel_efficiency: float,
+    window_start: Any,
+    heading: str = "METRICS",
+) -> str:
+    return (
+        f"{heading} Vehicle {vehicle_id}: "
+        f"Avg speed {avg_speed:.0f} km/h, "
+        f"Fuel consumed {total_fuel:.1f}L, "
+        f"Distance {total_distance:.1f}km, "
+        f"Carbon emitted {carbon_kg:.1f}kg CO₂, "
+        f"Efficiency {fuel_efficiency:.1f} km/L. "
+        f"Window: {window_start}"
+    )
+
+
+def summary_text(
+    period: str,
+    vehicle_id: str,
+    period_start: Any,
+    period_end: Any,
+    window_count: int,
+    avg_speed: float,
+    max_speed: float,
+    total_fuel: float,
+    total_distance: float,
+    carbon_kg: float,
+    fuel_efficiency: float,
+) -> str:
+    return (
+        f"SUMMARY {period.upper()} Vehicle {vehicle_id}: {period_start} to {period_end}, "
+        f"{window_count} windows. "
+        f"Avg speed {avg_speed:.0f} km/h (max {max_speed:.0f}), "
+        f"Fuel consumed {total_fuel:.1f}L, "
+        f"Distance {total_distance:.1f}km, "
+        f"Carbon emitted {carbon_kg:.1f}kg CO₂, "
+        f"Efficiency {fuel_efficiency:.1f} km/L."
+    )
+
+
+def _vehicle(vehicle_id: str) -> Dict[str, str]:
+    return {"vehicle_id": str(vehicle_id), "vehicle_key": canonical_vehicle(str(vehicle_id))}
+
+
+def alert_metadata(vehicle_id: str, anomaly_type: str) -> Dict[str, Any]:
+    return {**_vehicle(vehicle_id), "type": str(anomaly_type), "category": "alert"}
+
+
+def metric_metadata(vehicle_id: str, period: Optional[str] = None) -> Dict[str, Any]:
+    metadata = {**_vehicle(vehicle_id), "category": "metrics"}
+    if period is not None:
+        metadata["period"] = period
+    return metadata
@@ -0,0 +1,120 @@
+"""
+PHASE D — Document Embedder
+
+Drop-in replacement for Pathway's SentenceTransformerEmbedder, used by
+the live document store. Each document row is an async UDF call; the
+calls in flight are grouped by a MicroBatcher into one model.encode()
+per batch, behind a content-hash EmbeddingCache (rag/embedding_cache.py).
+The model runs on the CPU backend chosen by RagConfig.embedding_backend
+(rag/encoders.py): fp32 torch, int8 torch, or ONNX Runtime — in the
+dataflow process, or in a pool of worker processes when
+RagConfig.embedding_workers > 0 (rag/embedding_service.py).
+"""
+import threading
+from typing import List
+
+import numpy as np
+import pathway as pw
+from pathway.xpacks.llm.embedders import BaseEmbedder
+
+from config import config
+from .embedding_cache import EmbeddingCache, MicroBatcher
+from .embedding_service import ProcessEncoder
+from .encoders import load_encoder
+
+
+class CachedBatchEmbedder(BaseEmbedder):
+    """Sentence-transformers embedder with an on-disk cache and micro-batching."""
+
+    def __init__(
+        self,
+        model: str,
+        dimension: int,
+        cache_path: str = "",
+        cache_max_entries: int = 200_000,
+        cache_memory_entries: int = 4096,
+        max_batch_size: int = 32,
+        max_wait_ms: int = 10,
+        device: str = "cpu",
+        backend: str = "torch",
+        threads: int = 0,
+        onnx_int8_file: str = "onnx/model_quint8_avx2.onnx",
+        workers: int = 0,
+        worker_nice: int = 10,
+    ):
+        # Enough rows in flight to fill several batches while one is encoding
+        super().__init__(executor=pw.udfs.async_executor(capacity=max_batch_size * 4 * max(1, workers)))
+        self.model_name = model
+        self.dimension = dimension
+        self._encoder_args = (model, backend, threads, device, onnx_int8_file)
+        self._workers = workers
+        self._worker_nice = worker_nice
+        # Loaded by the first batch, not at graph construction: startup does
+        # not wait for the model
+        self.encoder = None
+        self._load_lock = threading.Lock()
+        self.cache = EmbeddingCache(cache_path, cache_max_entries, cache_memory_entries) if cache_path else None
+        self.batcher = MicroBatcher(
+            self._encode,
+            cache=self.cache,
+            # Quantized backends give slightly different vectors: cache them apart
+            model=model if backend == "torch" else f"{model}#{backend}",
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            concurrency=max(1, workers),
+        )
+
+    def _load(self):
+        with self._load_lock:
+            if self.encoder is None:
+                if self._workers > 0:
+                    # The model runs in worker processes, off the dataflow's cores and GIL
+                    model, backend, threads, _, onnx_int8_file = self._encoder_args
+                    self.encoder = ProcessEncoder(
+                        load_encoder, (model, backend, threads, "cpu", onnx_int8_file),
+                        workers=self._workers, nice=self._worker_nice,
+                    )
+                else:
+                    self.encoder = load_encoder(*self._encoder_args)
+            return self.encoder
+
+    def _encode(self, texts: List[str]) -> List[np.ndarray]:
+        return (self.encoder or self._load())(texts)
+
+    async def __wrapped__(self, input: str, **kwargs) -> np.ndarray:
+        return await self.batcher.embed_async(input)
+
+    def get_embedding_dimension(self, **kwargs) -> int:
+        # From config: probing would load the model (and the base class
+        # probes by embedding ".", which an async UDF cannot do synchronously)
+        return self.dimension
+
+
+def create_embedder() -> BaseEmbedder:
+    rag_cfg = config.rag
+    if (
+        not rag_cfg.embedding_cache_enabled
+        and rag_cfg.embedding_backend == "torch"
+        and not rag_cfg.embedding_threads
+        and not rag_cfg.embedding_workers
+    ):
+        from pathway.xpacks.llm.embedders import SentenceTransformerEmbedder
+
+        return SentenceTransformerEmbedder(
+            model=rag_cfg.embedding_model,
+            dimension=rag_cfg.embedding_dimension,
+        )
+    return CachedBatchEmbedder(
+        model=rag_cfg.embedding_model,
+        dimension=rag_cfg.embedding_dimension,
+        cache_path=rag_cfg.embedding_cache_path if rag_cfg.embedding_cache_enabled else "",
+        cache_max_entries=rag_cfg.embedding_cache_max_entries,
+        cache_memory_entries=rag_cfg.embedding_cache_memory_entries,
+        max_batch_size=rag_cfg.embedding_batch_size,
+        max_wait_ms=rag_cfg.embedding_batch_wait_ms,
+        backend=rag_cfg.embedding_backend,
+        threads=rag_cfg.embedding_threads,
+        onnx_int8_file=rag_cfg.embedding_onnx_int8_file,
+        workers=rag_cfg.embedding_workers,
+        worker_nice=rag_cfg.embedding_worker_nice,
+    )
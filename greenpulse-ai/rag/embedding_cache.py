@@ -0,0 +1,285 @@
+"""
+PHASE D — Embedding Cache & Micro-Batching
+
+Tumbling windows update on every telemetry event, and each update
+re-renders the vehicle's METRICS document. Much of that text is
+byte-identical to a document embedded before (values are rounded in the
+text, and retract/insert pairs re-emit the same row), yet every row
+reached the embedding model as its own forward pass.
+
+WHY CONTENT-HASH CACHING:
+- Embeddings are keyed by sha256(model, text), so identical documents are
+  embedded once no matter which row, window or restart produced them
+- The cache is a SQLite file: it survives restarts (replays of the same
+  CSVs cost nothing) and its size is capped by LRU eviction
+- Recently used vectors are also kept in a small in-memory LRU; only
+  those hits are answered on the caller's thread (the Pathway UDF event
+  loop). Disk lookups run on the batcher thread, one query per batch
+- Recency updates are buffered in memory and written with the next batch,
+  so a cache hit never waits on a disk write
+
+WHY MICRO-BATCHING:
+- Documents arriving within max_wait_ms of each other share one forward
+  pass of up to max_batch_size texts; on CPU a batch of 32 costs a
+  fraction of 32 single calls
+- Identical texts are embedded once while in flight: a text submitted
+  while its batch is queued or encoding awaits that batch's future
+  (single-flight, as api/ask_pool.py does for questions)
+- With a worker-process encoder (rag/embedding_service.py) up to
+  `concurrency` batches are encoded at once
+"""
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+EmbedBatch = Callable[[List[str]], Sequence[np.ndarray]]
+
+
+def content_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\0{text}".encode()).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    LRU-bounded, on-disk map of content key → float32 vector, with the
+    memory_entries most recently used vectors also held in memory.
+    """
+
+    def __init__(self, path: str, max_entries: int = 200_000, memory_entries: int = 4096):
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self.memory_entries = max(0, memory_entries)
+        # Separate lock: get_recent() never waits on a disk write
+        self._recent: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._recent_lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY, vector BLOB NOT NULL, used INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS embeddings_used ON embeddings (used)")
+        self._lock = threading.Lock()
+        self._count, last_used = self._db.execute("SELECT COUNT(*), COALESCE(MAX(used), 0) FROM embeddings").fetchone()
+        self._clock = last_used
+        self._touched: Dict[str, int] = {}
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def get_recent(self, key: str) -> Optional[np.ndarray]:
+        """The vector if it is in the in-memory LRU; never touches SQLite."""
+        with self._recent_lock:
+            vector = self._recent.get(key)
+            if vector is not None:
+                self._recent.move_to_end(key)
+        if vector is not None:
+            with self._lock:
+                self._touched[key] = self._tick()
+        return vector
+
+    def _remember(self, items: Iterable[Tuple[str, np.ndarray]]) -> None:
+        if not self.memory_entries:
+            return
+        with self._recent_lock:
+            for key, vector in items:
+                self._recent[key] = vector
+                self._recent.move_to_end(key)
+            while len(self._recent) > self.memory_entries:
+                self._recent.popitem(last=False)
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        if not keys:
+            return {}
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+                    self._touched[key] = self._tick()
+        self._remember(found.items())
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, np.ndarray]]) -> None:
+        items = [(key, np.asarray(vector, dtype=np.float32)) for key, vector in items]
+        self._remember(items)
+        with self._lock:
+            rows = [(key, vector.tobytes(), self._tick()) for key, vector in items]
+            touched = [(used, key) for key, used in self._touched.items()]
+            self._touched = {}
+            with self._db:
+                if touched:
+                    self._db.executemany("UPDATE embeddings SET used = ? WHERE key = ?", touched)
+                for row in rows:
+                    if self._db.execute("INSERT OR IGNORE INTO embeddings VALUES (?, ?, ?)", row).rowcount:
+                        self._count += 1
+                excess = self._count - self.max_entries
+                if excess > 0:
+                    self._db.execute(
+                        "DELETE FROM embeddings WHERE key IN"
+                        " (SELECT key FROM embeddings ORDER BY used LIMIT ?)", (excess,)
+                    )
+                    self._count -= excess
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        self.put_many(())
+        with self._lock:
+            self._db.close()
+
+
+class MicroBatcher:
+    """
+    Coalesces embedding requests into batched forward passes, in front of
+    an optional EmbeddingCache. Thread-safe; async callers use embed_async.
+    """
+
+    def __init__(
+        self,
+        embed_batch: EmbedBatch,
+        cache: Optional[EmbeddingCache] = None,
+        model: str = "",
+        max_batch_size: int = 32,
+        max_wait_ms: int = 10,
+        concurrency: int = 1,
+    ):
+        self.embed_batch = embed_batch
+        self.cache = cache
+        self.model = model
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        # Batches encoded at once; >1 for embed_batch backed by a worker pool
+        self.concurrency = max(1, concurrency)
+        self._slots = threading.Semaphore(self.concurrency)
+        self._executor = (
+            ThreadPoolExecutor(self.concurrency, thread_name_prefix="embedding-batch")
+            if self.concurrency > 1
+            else None
+        )
+        # key → text, waiting for the next batch
+        self._pending: Dict[str, str] = {}
+        # key → future, from submit() until its vector is set (queued or encoding)
+        self._inflight: Dict[str, "Future[np.ndarray]"] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.embedded = 0
+
+    def submit(self, text: str) -> "Future[np.ndarray]":
+        key = content_key(self.model, text)
+        if self.cache is not None:
+            cached = self.cache.get_recent(key)
+            if cached is not None:
+                self.hits += 1
+                future: "Future[np.ndarray]" = Future()
+                future.set_result(cached)
+                return future
+        with self._cond:
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                self.coalesced += 1
+                return inflight
+            future = Future()
+            self._inflight[key] = future
+            self._pending[key] = text
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    def embed(self, texts: Sequence[str]) -> List[np.ndarray]:
+        futures = [self.submit(text) for text in texts]
+        return [future.result() for future in futures]
+
+    async def embed_async(self, text: str) -> np.ndarray:
+        return await asyncio.wrap_future(self.submit(text))
+
+    def _run(self) -> None:
+        while True:
+            # Wait for a free slot first, so the next batch keeps filling meanwhile
+            self._slots.acquire()
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                # Give concurrent callers max_wait to fill the batch
+                deadline = time.monotonic() + self.max_wait
+                while len(self._pending) < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                keys = list(self._pending)[:self.max_batch_size]
+                batch = [(key, self._pending.pop(key)) for key in keys]
+            if self._executor is not None:
+                self._executor.submit(self._embed, batch)
+            else:
+                self._embed(batch)
+
+    def _embed(self, batch: List[Tuple[str, str]]) -> None:
+        try:
+            # Disk lookups happen here, off the callers' threads, one query per batch
+            found = self.cache.get_many([key for key, _ in batch]) if self.cache is not None else {}
+            missing = [(key, text) for key, text in batch if key not in found]
+            vectors = (
+                [np.asarray(v, dtype=np.float32) for v in self.embed_batch([text for _, text in missing])]
+                if missing
+                else []
+            )
+        except Exception as exc:
+            self._resolve([key for key, _ in batch], exc=exc)
+            return
+        finally:
+            self._slots.release()
+        encoded = dict(zip((key for key, _ in missing), vectors))
+        with self._cond:
+            self.hits += len(found)
+            self.misses += len(missing)
+            if missing:
+                self.batches += 1
+                self.embedded += len(missing)
+        if self.cache is not None and encoded:
+            self.cache.put_many(encoded.items())
+        self._resolve([key for key, _ in batch], vectors={**found, **encoded})
+
+    def _resolve(self, keys: List[str], vectors: Optional[Dict[str, np.ndarray]] = None, exc: Optional[BaseException] = None) -> None:
+        with self._cond:
+            futures = [(key, self._inflight.pop(key)) for key in keys]
+        for key, future in futures:
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(vectors[key])
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "embedded": self.embedded,
+            "avg_batch_size": round(self.embedded / self.batches, 2) if self.batches else 0.0,
+            "cache_entries": len(self.cache) if self.cache is not None else 0,
+        }
@@ -0,0 +1,106 @@
+"""
+PHASE D — Out-of-Process Embedding
+
+Runs the document embedding model in a pool of worker processes instead
+of the Pathway dataflow process. Batches from the MicroBatcher
+(rag/embedding_cache.py) are sent to a free worker and their vectors
+come back as futures, so the dataflow only pays for pickling texts and
+vectors.
+
+WHY A PROCESS POOL:
+- In-process, an alert burst that creates many documents competes with
+  windows, anomaly detection and the API thread for the same cores and
+  the same GIL (tokenization and pre/post-processing are Python)
+- Workers load the model once (the pool initializer) and keep it, and
+  run at a lower scheduling priority, so the dataflow wins any
+  contention and keeps its event latency under embedding load
+- Several batches are encoded in parallel, one per worker
+- A crashed worker (e.g. out of memory) breaks the pool; it is rebuilt
+  and the batch retried once
+
+Workers are started with "spawn": forking a process that already runs
+Pathway's engine threads and torch is not safe.
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+
+# Per-worker encoder, built once by the pool initializer
+_worker_encoder: Optional[Callable[[List[str]], List[np.ndarray]]] = None
+
+
+def _init_worker(factory: Callable[..., Any], args: Tuple[Any, ...], nice: int) -> None:
+    global _worker_encoder
+    if nice and hasattr(os, "nice"):
+        os.nice(nice)
+    _worker_encoder = factory(*args)
+
+
+def _encode_in_worker(texts: List[str]) -> np.ndarray:
+    # One contiguous array pickles far faster than a list of vectors
+    return np.asarray(_worker_encoder(texts), dtype=np.float32)
+
+
+class ProcessEncoder:
+    """
+    encode(texts) → vectors, computed in a worker process. Thread-safe:
+    concurrent calls run on different workers.
+
+    `factory(*args)` is called once in each worker and must return the
+    encoder callable; both must be picklable (module-level).
+    """
+
+    def __init__(
+        self,
+        factory: Callable[..., Any],
+        args: Tuple[Any, ...] = (),
+        workers: int = 1,
+        nice: int = 10,
+    ):
+        self.factory = factory
+        self.args = args
+        self.workers = max(1, workers)
+        self.nice = nice
+        self._dimension = 0
+        self.restarts = 0
+        self._lock = threading.Lock()
+        self._pool = self._start()
+        atexit.register(self.close)
+
+    def _start(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.factory, self.args, self.nice),
+        )
+
+    def __call__(self, texts: List[str]) -> List[np.ndarray]:
+        pool = self._pool
+        try:
+            return list(pool.submit(_encode_in_worker, list(texts)).result())
+        except BrokenProcessPool:
+            with self._lock:
+                # Another caller may have rebuilt it already
+                if self._pool is pool:
+                    self.restarts += 1
+                    self._pool = self._start()
+                pool = self._pool
+            return list(pool.submit(_encode_in_worker, list(texts)).result())
+
+    @property
+    def dimension(self) -> int:
+        """Vector size, probed once on a worker (which also loads its model)."""
+        if not self._dimension:
+            self._dimension = len(self(["."])[0])
+        return self._dimension
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
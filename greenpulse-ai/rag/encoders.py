@@ -0,0 +1,84 @@
+"""
+PHASE D — CPU Embedding Backends
+
+Loads the document embedding model (RagConfig.embedding_model) with one
+of several CPU runtimes, all producing vectors of the same model:
+
+    "torch"       sentence-transformers in fp32 (the reference)
+    "torch-int8"  the same model with its Linear layers dynamically
+                  quantized to int8 (torch.ao.quantization.quantize_dynamic)
+    "onnx"        ONNX Runtime export of the model, fp32
+    "onnx-int8"   ONNX Runtime with the hub's int8-quantized export
+                  (RagConfig.embedding_onnx_int8_file)
+
+WHY:
+- On CPU-only nodes the fp32 encoder is the hottest component during
+  alert spikes; int8 weights and ONNX Runtime's fused kernels give
+  several times the docs/s at a small cost in embedding fidelity
+- `threads` pins the intra-op thread count, so the embedder does not
+  oversubscribe cores shared with the Pathway workers
+
+The ONNX backends need sentence-transformers >= 3.2 with
+`pip install "sentence-transformers[onnx]"`; quantized exports are CPU
+specific (avx2 / avx512 / arm64), pick the file matching the node.
+"""
+from typing import Callable, List
+
+import numpy as np
+
+
+BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+
+
+class Encoder:
+    """encode(texts) → one float32 vector per text, plus the model's dimension."""
+
+    def __init__(self, model: str, backend: str, encode: Callable[[List[str]], List[np.ndarray]], dimension: int):
+        self.model = model
+        self.backend = backend
+        self.encode = encode
+        self.dimension = dimension
+
+    def __call__(self, texts: List[str]) -> List[np.ndarray]:
+        return self.encode(texts)
+
+
+def load_encoder(
+    model: str,
+    backend: str = "torch",
+    threads: int = 0,
+    device: str = "cpu",
+    onnx_int8_file: str = "onnx/model_quint8_avx2.onnx",
+) -> Encoder:
+    """`threads` = 0 keeps the runtime's default (all cores)."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend {backend!r}; expected one of {BACKENDS}")
+    from sentence_transformers import SentenceTransformer
+
+    if backend.startswith("onnx"):
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        if threads > 0:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        model_kwargs = {"provider": "CPUExecutionProvider", "session_options": options}
+        if backend == "onnx-int8":
+            model_kwargs["file_name"] = onnx_int8_file
+        transformer = SentenceTransformer(model, device="cpu", backend="onnx", model_kwargs=model_kwargs)
+    else:
+        import torch
+
+        if threads > 0:
+            torch.set_num_threads(threads)
+        transformer = SentenceTransformer(model, device=device)
+        if backend == "torch-int8":
+            # Dynamic quantization is CPU-only
+            transformer = torch.ao.quantization.quantize_dynamic(
+                transformer.to("cpu"), {torch.nn.Linear}, dtype=torch.qint8
+            )
+
+    def encode(texts: List[str]) -> List[np.ndarray]:
+        return list(transformer.encode(texts, batch_size=len(texts), convert_to_numpy=True))
+
+    return Encoder(model, backend, encode, transformer.get_sentence_embedding_dimension())
@@ -0,0 +1,387 @@
+"""
+PHASE D — Structured-Query Fast Path for /ask
+
+Most chat questions are lookups the pipeline already answers exactly:
+"Which vehicle emitted the most carbon?", "What is V-103's risk score?",
+"How many alerts in the last 10 minutes?". The intent router detects
+those questions and answers them straight from the materialized tables
+(rankings, sustainability, risk_scores, vehicle_states, predictions,
+all_alerts) in milliseconds. Anything it does not recognise — or that
+asks why / what to do — falls through to the RAG engine.
+
+WHY STREAMING-SAFE:
+- Answers are computed from one pinned snapshot view per question, so
+  they are as fresh as the dashboard and never stale like cached text
+- Per-table formatters (the API's crisis overlays) are applied to rows
+  before answering, so chat and panels always agree
+- Detection is plain keyword / regex matching: no embedding, no LLM call
+"""
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from api.time_index import event_time
+
+
+class Metric:
+    """A per-vehicle number (or label) the router can look up."""
+
+    __slots__ = ("name", "table", "field", "label", "unit", "higher_is_better", "additive", "keywords")
+
+    def __init__(self, name, table, field, label, unit, higher_is_better, additive, keywords):
+        self.name = name
+        self.table = table
+        self.field = field
+        self.label = label
+        self.unit = unit
+        self.higher_is_better = higher_is_better
+        self.additive = additive
+        self.keywords = re.compile(keywords)
+
+
+# Checked in order: forecast metrics before the all-time metrics they mention
+METRICS: Tuple[Metric, ...] = (
+    Metric("predicted_carbon", "predictions", "predicted_carbon_10min", "predicted carbon (next 10 min)",
+           "kg CO₂", False, True, r"(predict|forecast|next 10|expected).*(carbon|emission|co2|co₂)"
+                                  r"|(carbon|emission|co2|co₂).*(predict|forecast|next 10|expected)"),
+    Metric("escalation", "predictions", "risk_escalation_probability", "risk escalation probability",
+           "", False, False, r"escalat"),
+    Metric("fuel_exhaustion", "predictions", "fuel_exhaustion_minutes", "minutes until fuel exhaustion",
+           "min", True, False, r"run(s|ning)? out of fuel|fuel exhaust|exhaust\w* fuel|fuel.*empty"),
+    Metric("sustainability", "sustainability", "sustainability_score", "sustainability score",
+           "/100", True, False, r"sustainab|green(est)? score|grade"),
+    Metric("risk", "risk_scores", "risk_score", "risk score",
+           "/100", False, False, r"risk"),
+    Metric("carbon", "rankings", "total_carbon_kg", "total carbon",
+           "kg CO₂", False, True, r"carbon|emission|emitt|co2|co₂|pollut"),
+    Metric("efficiency", "rankings", "avg_efficiency", "average fuel efficiency",
+           "km/L", True, False, r"efficien|km/l|mileage"),
+    Metric("fuel", "rankings", "total_fuel", "total fuel consumed",
+           "L", False, True, r"fuel (consum|used|burn)|consum\w* (the most |the least )?fuel|burn\w* fuel"),
+    Metric("distance", "rankings", "total_distance", "total distance",
+           "km", True, True, r"distance|travel|km driven|kilomet"),
+    Metric("speed", "rankings", "avg_speed", "average speed",
+           "km/h", True, False, r"speed|fastest|slowest"),
+)
+
+STATES = ("NORMAL", "EFFICIENT", "HIGH_EMISSION", "ROUTE_DEVIATION", "IDLE", "CRITICAL_RISK")
+
+_VEHICLE_ID = re.compile(r"\b[Vv]-?\d+\b")
+# Questions asking for reasoning or advice need the LLM, whatever they mention
+_OPEN_ENDED = re.compile(
+    r"\b(why|explain|reason|cause|caused|should|recommend|suggest|advice|improve|reduce|compare"
+    r"|summar\w*|what happened|what changed|how can|how do|how to)\b"
+)
+_HIGH = re.compile(r"\b(most|highest|max(imum)?|top|biggest|largest|greatest|fastest|longest|worst)\b")
+_LOW = re.compile(r"\b(least|lowest|min(imum)?|smallest|fewest|slowest|shortest|bottom|best|first|soonest)\b")
+_TOP_N = re.compile(r"\b(?:top|bottom)\s+(\d+)\b|\b(\d+)\s+(?:most|least|highest|lowest|best|worst)\b")
+_TOTAL = re.compile(r"\b(total|overall|sum|combined|entire fleet|whole fleet|fleet[- ]wide)\b")
+_AVERAGE = re.compile(r"\b(average|avg|mean|typical)\b")
+_TIME_RANGE = re.compile(
+    r"\b(?:last|past|previous)\s+(?:(\d+(?:\.\d+)?)\s*)?(seconds?|secs?|minutes?|mins?|hours?|hrs?|days?)\b"
+)
+_TIME_UNITS = {"s": 1.0, "m": 60.0, "h": 3600.0, "d": 86400.0}
+_SEVERITIES = ("critical", "high", "medium", "low")
+
+
+def canonical_vehicle(vehicle_id: str) -> str:
+    """'v103', 'V103', 'V-103' and 'V0103' all name the same vehicle."""
+    return re.sub(r"-?0*(\d)", r"\1", vehicle_id.upper(), count=1)
+
+
+def time_range_sec(question: str) -> Optional[float]:
+    """Length of a "last N minutes" style range in seconds, None if absent."""
+    match = _TIME_RANGE.search(question)
+    if match is None:
+        return None
+    amount = float(match.group(1)) if match.group(1) else 1.0
+    return amount * _TIME_UNITS[match.group(2)[0]]
+
+
+def _state_mentioned(question: str) -> Optional[str]:
+    for state in STATES:
+        if state.lower().replace("_", " ") in question or state.lower() in question:
+            return state
+    if "critical" in question and "alert" not in question:
+        return "CRITICAL_RISK"
+    return None
+
+
+def _fmt(value: Any, metric: Metric) -> str:
+    if isinstance(value, str):
+        return value
+    if metric.name == "escalation":
+        return f"{float(value) * 100:.0f}%"
+    if metric.name == "fuel_exhaustion" and float(value) < 0:
+        return "no exhaustion expected"
+    unit = metric.unit if metric.unit.startswith("/") else f" {metric.unit}"
+    return f"{float(value):.1f}{unit}"
+
+
+class IntentRouter:
+    """
+    Answers lookup questions from the live snapshot tables.
+
+    `store` is the API's SnapshotStore (anything with a view() exposing
+    has(name) and rows(name)); `formatters` map a table name to the row
+    formatter the API applies before serving it.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        formatters: Optional[Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]]] = None,
+    ):
+        self.store = store
+        self.formatters = formatters or {}
+        self._lock = threading.Lock()
+        self.routed: Dict[str, int] = {}
+        self.fallbacks = 0
+
+    def answer(self, question: str) -> Optional[Dict[str, Any]]:
+        """
+        {"answer", "sources", "intent"} for a recognised lookup question,
+        None when the question should go to the RAG engine.
+        """
+        text = " ".join(question.lower().split())
+        result = None
+        if not _OPEN_ENDED.search(text):
+            view = self.store.view()
+            vehicles = list(dict.fromkeys(m.upper() for m in _VEHICLE_ID.findall(question)))
+            for handler in (self._alerts, self._vehicle_lookup, self._state_filter,
+                            self._fleet_count, self._superlative, self._aggregate):
+                result = handler(view, text, vehicles)
+                if result is not None:
+                    break
+        with self._lock:
+            if result is None:
+                self.fallbacks += 1
+            else:
+                self.routed[result["intent"]] = self.routed.get(result["intent"], 0) + 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            routed = sum(self.routed.values())
+            total = routed + self.fallbacks
+            return {
+                "routed": routed,
+                "fallbacks": self.fallbacks,
+                "routed_ratio": round(routed / total, 4) if total else 0.0,
+                "by_intent": dict(self.routed),
+            }
+
+    # ── Table access ──
+
+    def _rows(self, view: Any, table: str) -> List[Dict[str, Any]]:
+        if not view.has(table):
+            return []
+        formatter = self.formatters.get(table)
+        rows = view.rows(table)
+        return [formatter(row) for row in rows] if formatter is not None else list(rows)
+
+    def _metric(self, text: str) -> Optional[Metric]:
+        for metric in METRICS:
+            if metric.keywords.search(text):
+                return metric
+        return None
+
+    def _metric_rows(self, view: Any, metric: Metric) -> List[Dict[str, Any]]:
+        rows = [row for row in self._rows(view, metric.table) if row.get(metric.field) is not None]
+        if metric.name == "fuel_exhaustion":
+            # -1 marks vehicles in no danger of running out
+            rows = [row for row in rows if float(row[metric.field]) >= 0]
+        return rows
+
+    # ── Intents ──
+
+    def _alerts(self, view: Any, text: str, vehicles: List[str]) -> Optional[Dict[str, Any]]:
+        """'How many (high) alerts (for V-103) (in the last 10 minutes)?'"""
+        if "alert" not in text or not re.search(r"\b(how many|number of|count)\b", text):
+            return None
+        rows = self._rows(view, "all_alerts")
+        wanted = {canonical_vehicle(v) for v in vehicles}
+        if wanted:
+            rows = [r for r in rows if canonical_vehicle(str(r.get("vehicle_id", ""))) in wanted]
+        severity = next((s for s in _SEVERITIES if re.search(rf"\b{s}\b", text)), None)
+        if severity is not None:
+            rows = [r for r in rows if str(r.get("severity", "")).lower() == severity]
+
+        scope = ""
+        window = time_range_sec(text)
+        if window is not None:
+            # Ranges are measured back from the newest alert's event time,
+            # which is also correct when replaying historical data
+            times = [event_time(r.get("timestamp")) for r in rows]
+            newest = max((t for t in times if t is not None), default=None)
+            rows = [r for r, t in zip(rows, times) if newest is not None and t is not None and t >= newest - window]
+            scope = f" in the last {_describe_window(window)} of event time"
+
+        subject = f"{severity} alerts" if severity else "alerts"
+        if wanted:
+            subject += " for " + ", ".join(vehicles)
+        by_type: Dict[str, int] = {}
+        for row in rows:
+            by_type[row.get("anomaly_type", "unknown")] = by_type.get(row.get("anomaly_type", "unknown"), 0) + 1
+        breakdown = ", ".join(f"{name}: {n}" for name, n in sorted(by_type.items(), key=lambda kv: -kv[1]))
+        answer = f"There are {len(rows)} {subject}{scope}."
+        if breakdown:
+            answer += f" By type — {breakdown}."
+        return {"answer": answer, "sources": [f"all_alerts: {len(rows)} matching rows"], "intent": "alert_count"}
+
+    def _vehicle_lookup(self, view: Any, text: str, vehicles: List[str]) -> Optional[Dict[str, Any]]:
+        """'What is V-103's risk score?', 'What state is V-7 in?'"""
+        if not vehicles:
+            return None
+        metric = self._metric(text)
+        wants_state = re.search(r"\b(state|status|condition)\b", text) is not None
+        if metric is None and not wants_state:
+            return None
+        if time_range_sec(text) is not None:
+            return None  # all-time tables cannot answer windowed questions
+
+        lines, sources = [], []
+        for vehicle_id in vehicles:
+            canonical = canonical_vehicle(vehicle_id)
+            if wants_state and (metric is None or metric.name == "risk"):
+                row = self._find(view, "vehicle_states", canonical)
+                if row is None:
+                    lines.append(f"No state is available for {vehicle_id} yet.")
+                    continue
+                reason = row.get("transition_reason") or ""
+                lines.append(
+                    f"{row['vehicle_id']} is {row.get('current_state', 'NORMAL')} "
+                    f"(previously {row.get('previous_state', 'NORMAL')}, "
+                    f"risk {float(row.get('risk_score', 0.0)):.1f}/100)"
+                    + (f": {reason}." if reason else ".")
+                )
+                sources.append(f"vehicle_states: {row['vehicle_id']} current_state={row.get('current_state')}")
+                continue
+            row = self._find(view, metric.table, canonical)
+            if row is None or row.get(metric.field) is None:
+                lines.append(f"No {metric.label} is available for {vehicle_id} yet.")
+                continue
+            value = row[metric.field]
+            line = f"{row['vehicle_id']} {metric.label}: {_fmt(value, metric)}"
+            if metric.name == "sustainability" and row.get("grade"):
+                line += f" (grade {row['grade']})"
+            lines.append(line + ".")
+            sources.append(f"{metric.table}: {row['vehicle_id']} {metric.field}={value}")
+
+        if not sources:
+            return None  # unknown vehicles: let RAG search the documents
+        return {"answer": " ".join(lines), "sources": sources, "intent": "vehicle_lookup"}
+
+    def _state_filter(self, view: Any, text: str, vehicles: List[str]) -> Optional[Dict[str, Any]]:
+        """'Which vehicles are in CRITICAL_RISK?', 'How many vehicles are idle?'"""
+        if vehicles or not re.search(r"\b(which|what|list|how many|any)\b.*\bvehicles?\b", text):
+            return None
+        state = _state_mentioned(text)
+        if state is None:
+            return None
+        rows = [r for r in self._rows(view, "vehicle_states") if r.get("current_state") == state]
+        rows.sort(key=lambda r: float(r.get("risk_score", 0.0)), reverse=True)
+        ids = [str(r.get("vehicle_id", "")) for r in rows]
+        if not ids:
+            answer = f"No vehicles are currently in {state}."
+        else:
+            shown = ", ".join(ids[:20]) + (f" and {len(ids) - 20} more" if len(ids) > 20 else "")
+            answer = f"{len(ids)} vehicle{'s' if len(ids) != 1 else ''} currently in {state}: {shown}."
+        return {"answer": answer, "sources": [f"vehicle_states: current_state={state}"], "intent": "state_filter"}
+
+    def _fleet_count(self, view: Any, text: str, vehicles: List[str]) -> Optional[Dict[str, Any]]:
+        """'How many vehicles are active?'"""
+        if vehicles or not re.search(r"\b(how many|number of)\b.*\b(vehicles?|trucks?)\b", text):
+            return None
+        table = "rankings" if view.has("rankings") else "vehicle_states"
+        count = len(self._rows(view, table))
+        return {
+            "answer": f"{count} vehicles are currently active in the fleet.",
+            "sources": [f"{table}: {count} rows"],
+            "intent": "fleet_count",
+        }
+
+    def _superlative(self, view: Any, text: str, vehicles: List[str]) -> Optional[Dict[str, Any]]:
+        """'Which vehicle emitted the most carbon?', 'Top 3 most efficient vehicles'"""
+        high, low = _HIGH.search(text), _LOW.search(text)
+        if vehicles or not (high or low):
+            return None
+        metric = self._metric(text)
+        if metric is None or time_range_sec(text) is not None:
+            return None
+        rows = self._metric_rows(view, metric)
+        if not rows:
+            return None
+
+        # "best" / "worst" depend on the metric's direction
+        word = (high or low).group(1)
+        if word == "best":
+            descending = metric.higher_is_better
+        elif word == "worst":
+            descending = not metric.higher_is_better
+        else:
+            descending = high is not None and (low is None or high.start() < low.start())
+        match = _TOP_N.search(text)
+        count = int(match.group(1) or match.group(2)) if match else 1
+        count = max(1, min(count, len(rows)))
+
+        ranked = sorted(rows, key=lambda r: r[metric.field], reverse=descending)[:count]
+        direction = "highest" if descending else "lowest"
+        if count == 1:
+            row = ranked[0]
+            answer = (
+                f"{row['vehicle_id']} has the {direction} {metric.label}: "
+                f"{_fmt(row[metric.field], metric)} (out of {len(rows)} vehicles)."
+            )
+        else:
+            listed = "; ".join(
+                f"{i + 1}. {row['vehicle_id']} — {_fmt(row[metric.field], metric)}"
+                for i, row in enumerate(ranked)
+            )
+            answer = f"{direction.capitalize()} {metric.label} across {len(rows)} vehicles: {listed}."
+        sources = [f"{metric.table}: {row['vehicle_id']} {metric.field}={row[metric.field]}" for row in ranked]
+        return {"answer": answer, "sources": sources, "intent": "superlative"}
+
+    def _aggregate(self, view: Any, text: str, vehicles: List[str]) -> Optional[Dict[str, Any]]:
+        """'What is the total fleet carbon?', 'Average sustainability score?'"""
+        total, average = _TOTAL.search(text), _AVERAGE.search(text)
+        fleet = re.search(r"\bfleet\b", text) is not None
+        if vehicles or not (total or average or fleet):
+            return None
+        metric = self._metric(text)
+        if metric is None or time_range_sec(text) is not None:
+            return None
+        rows = self._metric_rows(view, metric)
+        if not rows:
+            return None
+
+        values = [float(row[metric.field]) for row in rows]
+        if metric.additive and not average:
+            value, kind = sum(values), "total"
+        else:
+            value, kind = sum(values) / len(values), "average"
+        label = re.sub(r"^(total|average) ", "", metric.label)
+        answer = f"Fleet {kind} {label}: {_fmt(value, metric)} across {len(values)} vehicles."
+        return {
+            "answer": answer,
+            "sources": [f"{metric.table}: {metric.field} over {len(values)} rows"],
+            "intent": "aggregate",
+        }
+
+    def _find(self, view: Any, table: str, canonical: str) -> Optional[Dict[str, Any]]:
+        if not view.has(table):
+            return None
+        for row in view.rows(table):
+            if canonical_vehicle(str(row.get("vehicle_id", ""))) == canonical:
+                formatter = self.formatters.get(table)
+                return formatter(row) if formatter is not None else row
+        return None
+
+
+def _describe_window(seconds: float) -> str:
+    for unit, size in (("day", 86400.0), ("hour", 3600.0), ("minute", 60.0)):
+        if seconds >= size and seconds % size == 0:
+            amount = int(seconds // size)
+            return f"{amount} {unit}{'s' if amount != 1 else ''}"
+    return f"{seconds:g} seconds"
+
@@ -0,0 +1,55 @@
+"""
+PHASE D — LLM Providers
+
+Builds the chat model behind the RAG question answerer from
+RagConfig.llm_provider:
+
+    "openai"  OpenAIChat (OPENAI_API_KEY)
+    "gemini"  LiteLLMChat on gemini/<llm_model> (GEMINI_API_KEY)
+    "local"   deterministic extractive answerer, offline (rag/local_llm.py)
+
+The streaming path picks its LLM from the same setting
+(rag/streaming.create_streaming_llm), so /ask and /ask/stream agree.
+"""
+from typing import Any
+
+import pathway as pw
+from pathway.xpacks.llm.llms import BaseChat
+
+from config import config
+from .local_llm import ExtractiveLLM
+
+
+class LocalChat(BaseChat):
+    """Pathway chat UDF answering from the prompt's context with ExtractiveLLM."""
+
+    def __init__(self, max_documents: int = 3):
+        super().__init__()
+        self.llm = ExtractiveLLM(max_documents)
+
+    def __wrapped__(self, messages: Any, **kwargs) -> str:
+        if isinstance(messages, pw.Json):
+            messages = messages.value
+        if isinstance(messages, list):
+            prompt = str(messages[-1].get("content", "")) if messages else ""
+        else:
+            prompt = str(messages)
+        return self.llm.complete(prompt)
+
+    def _accepts_call_arg(self, arg_name: str) -> bool:
+        return False
+
+
+def create_chat_llm() -> BaseChat:
+    rag_cfg = config.rag
+    if rag_cfg.llm_provider in ("local", "fake"):
+        return LocalChat(rag_cfg.local_llm_max_documents)
+    if rag_cfg.llm_provider == "gemini":
+        from pathway.xpacks.llm.llms import LiteLLMChat
+
+        return LiteLLMChat(model=f"gemini/{rag_cfg.llm_model}", api_key=rag_cfg.gemini_api_key)
+    if rag_cfg.llm_provider != "openai":
+        raise ValueError(f"Unknown llm_provider: {rag_cfg.llm_provider!r}")
+    from pathway.xpacks.llm.llms import OpenAIChat
+
+    return OpenAIChat(model=rag_cfg.llm_model, api_key=rag_cfg.openai_api_key)
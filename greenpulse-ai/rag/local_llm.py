@@ -0,0 +1,74 @@
+"""
+PHASE D — Local Extractive Answerer
+
+A deterministic, offline stand-in for the chat model: it answers from
+the prompt's own context by quoting the documents that best match the
+question. No network, no model weights, same output for the same prompt.
+
+WHY:
+- The whole RAG path (document store, retrieval, answer cache, /ask and
+  /ask/stream) can run and be benchmarked without an API key
+- Answers are reproducible, so index and embedder changes can be
+  compared on identical outputs
+- With no matching document it replies with the "no information" answer
+  Pathway's adaptive question answerer treats as a cue to retrieve more
+"""
+import re
+from typing import Iterator, List, Tuple
+
+
+# AdaptiveRAGQuestionAnswerer asks again with more documents on this answer
+NO_INFORMATION = "No information found."
+
+_TERM = re.compile(r"[a-z0-9]+(?:[.-][a-z0-9]+)*")
+# Common question words that match every document equally well
+_STOPWORDS = frozenset(
+    "a an and are at be by did do does for from has have how in is it its me of on or show tell "
+    "that the their there this to vehicle vehicles was were what when where which who why with".split()
+)
+
+
+def split_prompt(prompt: str) -> Tuple[List[str], str]:
+    """(context documents, question) of a PROMPT_TEMPLATE-shaped prompt."""
+    question = prompt
+    context = ""
+    if "Question:" in prompt:
+        head, question = prompt.rsplit("Question:", 1)
+        question = question.split("Answer:", 1)[0]
+        context = head.split("Context:", 1)[1] if "Context:" in head else head
+    documents = [line.strip() for line in context.splitlines() if line.strip()]
+    return documents, question.strip()
+
+
+def _terms(text: str) -> List[str]:
+    return [term for term in _TERM.findall(text.lower()) if term not in _STOPWORDS]
+
+
+class ExtractiveLLM:
+    """Answers with the context documents sharing the most terms with the question."""
+
+    def __init__(self, max_documents: int = 3):
+        self.max_documents = max(1, max_documents)
+
+    def answer(self, documents: List[str], question: str) -> str:
+        query = set(_terms(question))
+        scored = []
+        for position, document in enumerate(documents):
+            overlap = len(query.intersection(_terms(document)))
+            if overlap:
+                # Retrieval order breaks ties: it already ranks by relevance
+                scored.append((-overlap, position, document))
+        if not scored:
+            return NO_INFORMATION
+        best = [document for _, _, document in sorted(scored)[:self.max_documents]]
+        noun = "record" if len(best) == 1 else "records"
+        return f"Based on {len(best)} fleet {noun}: " + " ".join(
+            document if document.endswith(".") else f"{document}." for document in best
+        )
+
+    def complete(self, prompt: str) -> str:
+        return self.answer(*split_prompt(prompt))
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        for i, word in enumerate(self.complete(prompt).split(" ")):
+            yield word if i == 0 else f" {word}"
@@ -0,0 +1,78 @@
+"""
+PHASE D — Query Scope & Metadata Filters
+
+Reads which vehicles and which document category a question is about,
+so retrieval can be restricted to the matching documents instead of the
+whole corpus: "Why did V-103 raise alerts?" only needs V-103's alert
+documents, however large the fleet.
+
+The scope becomes a JMESPath filter over the document metadata
+(rag/documents.py), as accepted by the Pathway document store and
+question answerers; it runs inside the index, so a scoped question is
+searched among its own documents only.
+"""
+import json
+import re
+from typing import FrozenSet, NamedTuple, Optional
+
+from .intent_router import canonical_vehicle
+
+
+CATEGORIES = ("alert", "metrics")
+
+_VEHICLE_ID = re.compile(r"\b[Vv]-?\d+\b")
+_CATEGORY_WORDS = {
+    "alert": re.compile(r"\b(alerts?|alarms?|anomal\w*|warnings?|incidents?|violations?|deviat\w*)\b"),
+    "metrics": re.compile(
+        r"\b(metrics?|speed|fuel|carbon|emissions?|emitted|co2|co₂|distance|efficien\w*"
+        r"|windows?|summary|summaries|hourly|daily|consum\w*)\b"
+    ),
+}
+
+
+class QueryScope(NamedTuple):
+    """Canonical vehicle IDs (empty: any) and categories (empty: any)."""
+
+    vehicles: FrozenSet[str]
+    categories: FrozenSet[str]
+
+    @property
+    def scoped(self) -> bool:
+        return bool(self.vehicles or self.categories)
+
+
+def query_scope(question: str) -> QueryScope:
+    vehicles = frozenset(canonical_vehicle(match) for match in _VEHICLE_ID.findall(question))
+    text = question.lower()
+    categories = frozenset(name for name, words in _CATEGORY_WORDS.items() if words.search(text))
+    # Naming every category is no restriction at all
+    if len(categories) == len(CATEGORIES):
+        categories = frozenset()
+    return QueryScope(vehicles, categories)
+
+
+def _literal(value: str) -> str:
+    # JSON literal: Pathway's JMESPath dialect does not accept 'raw strings'
+    return "`" + json.dumps(value).replace("`", "\\`") + "`"
+
+
+def _any_of(field: str, values) -> str:
+    values = sorted(values)
+    if len(values) == 1:
+        return f"{field} == {_literal(values[0])}"
+    return f"contains([{', '.join(_literal(v) for v in values)}], {field})"
+
+
+def metadata_filter(scope: QueryScope) -> Optional[str]:
+    """
+    JMESPath filter selecting the scope's documents; None when unscoped.
+
+    Vehicles are matched on the metadata's canonical `vehicle_key`, so
+    "V103" finds the documents of "V-103".
+    """
+    clauses = []
+    if scope.vehicles:
+        clauses.append(_any_of("vehicle_key", scope.vehicles))
+    if scope.categories:
+        clauses.append(_any_of("category", scope.categories))
+    return " && ".join(clauses) if clauses else None
@@ -1,18 +1,20 @@
 """
 PHASE D — LLM Query Engine
 
-Integrates with OpenAI/Gemini through Pathway LLM xPack
-for answering natural language questions about fleet data.
+Integrates with OpenAI/Gemini (or the offline local answerer) through
+Pathway LLM xPack for answering natural language questions about fleet data.
 
 WHY STREAMING-SAFE:
 - Query engine reads from the live document store
 - Document store auto-updates — queries always get latest data
 - LLM calls are stateless — each query is independent
+- stream() (rag/streaming.py) sends sources first, then LLM tokens
 """
-import pathway as pw
-from pathway.xpacks.llm.llms import OpenAIChat
 from pathway.xpacks.llm.question_answering import AdaptiveRAGQuestionAnswerer
 from config import config
+from .llm_providers import create_chat_llm
+from .retriever import DocumentStoreRetriever
+from .streaming import PROMPT_TEMPLATE, StreamingQueryEngine, create_streaming_llm
 
 
 def create_query_engine(doc_store):
@@ -21,7 +23,8 @@ def create_query_engine(doc_store):
     adaptive RAG question answerer.
 
     Features:
-    - Retrieves relevant documents from the live store
+    - Retrieves relevant documents from the live store (DocumentStoreRetriever,
+      a query table behind a plain Python callable; must run before pw.run())
     - Constructs a context-aware prompt
     - Calls OpenAI/Gemini for final answer generation
     - Adaptive: decides whether to retrieve more or answer directly
@@ -30,29 +33,23 @@ def create_query_engine(doc_store):
         doc_store: Live Pathway DocumentStore
 
     Returns:
-        AdaptiveRAGQuestionAnswerer: Query engine
+        StreamingQueryEngine: The AdaptiveRAGQuestionAnswerer, with stream()
     """
-    rag_cfg = config.rag
-
-    # Initialize LLM
-    llm = OpenAIChat(
-        model=rag_cfg.llm_model,
-        api_key=rag_cfg.openai_api_key,
-    )
+    # Initialize LLM (RagConfig.llm_provider; "local" runs offline)
+    llm = create_chat_llm()
 
     # Create RAG question answerer
     qa = AdaptiveRAGQuestionAnswerer(
         llm=llm,
         indexer=doc_store,
         n_starting_documents=5,
-        short_prompt_template=(
-            "You are GreenPulse AI, a carbon and logistics intelligence assistant.\n"
-            "Use the following fleet data to answer the question.\n"
-            "Be concise, data-driven, and use specific vehicle IDs and numbers.\n\n"
-            "Context:\n{context}\n\n"
-            "Question: {query}\n\n"
-            "Answer:"
-        ),
+        short_prompt_template=PROMPT_TEMPLATE,
     )
 
-    return qa
+    return StreamingQueryEngine(
+        qa,
+        create_streaming_llm(),
+        retrieve=DocumentStoreRetriever(doc_store, config.api.ask_timeout_sec),
+        n_documents=5,
+        scoped=config.rag.scoped_retrieval,
+    )
@@ -0,0 +1,112 @@
+"""
+PHASE D — Document Store Retriever
+
+A plain `retrieve(question, k, metadata_filter=None)` callable over the
+live Pathway DocumentStore, for the API threads behind /ask and
+/ask/stream.
+
+The DocumentStore (and the question answerers built on it) only answer
+queries arriving as rows of a Pathway table. The retriever owns such a
+query table, fed by a Python connector: each call inserts one query row,
+waits for its row in DocumentStore.retrieve_query()'s result table
+(pw.io.subscribe).
+
+WHY STREAMING-SAFE:
+- retrieve_query() answers "as of now": a query is searched once against
+  the current index and is not re-evaluated as documents change
+- Answered queries are kept, as Pathway's own DocumentStoreServer does
+  (delete_completed_queries=False): as-of-now results never change, and
+  retracting a query from the index panics the engine (Pathway 0.33)
+- Retrieval sees exactly the indexed corpus: document TTLs, per-vehicle
+  caps and the hourly / daily summaries (rag/compaction.py) apply, and
+  the JMESPath metadata filter runs inside the index
+"""
+import itertools
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Dict, List, Optional
+
+import pathway as pw
+
+
+class _QuerySchema(pw.Schema):
+    request_id: int = pw.column_definition(primary_key=True)
+    query: str
+    k: int
+    metadata_filter: Optional[str]
+
+
+class _QuerySubject(pw.io.python.ConnectorSubject):
+    """Query rows pushed from API threads; runs until the pipeline stops."""
+
+    def __init__(self):
+        super().__init__()
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        self._stopped.wait()
+
+    def on_stop(self) -> None:
+        self._stopped.set()
+
+    def push(self, row: Dict[str, Any]) -> None:
+        self.next(**row)
+        self.commit()
+
+
+class DocumentStoreRetriever:
+    """
+    retrieve(question, k, metadata_filter=None) → document texts, best first.
+
+    Must be created before pw.run(); calls block the calling thread until
+    the engine has answered or timeout_sec passes (TimeoutError).
+    """
+
+    def __init__(self, doc_store: Any, timeout_sec: float = 30.0):
+        self.timeout_sec = timeout_sec
+        self._subject = _QuerySubject()
+        self._ids = itertools.count()
+        self._pending: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+
+        queries = pw.io.python.read(self._subject, schema=_QuerySchema, autocommit_duration_ms=None)
+        results = doc_store.retrieve_query(
+            queries.select(
+                query=pw.this.query,
+                k=pw.this.k,
+                metadata_filter=pw.this.metadata_filter,
+                filepath_globpattern=pw.cast(Optional[str], None),
+            )
+        )
+        results = results.with_columns(request_id=queries.ix(results.id).request_id)
+        pw.io.subscribe(results, on_change=self._on_result)
+
+    def __call__(self, question: str, k: int, metadata_filter: Optional[str] = None) -> List[str]:
+        return [document["text"] for document in self.documents(question, k, metadata_filter)]
+
+    def documents(self, question: str, k: int, metadata_filter: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Like calling the retriever, with each document's text, metadata and distance."""
+        row = {"request_id": next(self._ids), "query": question, "k": k, "metadata_filter": metadata_filter}
+        future: Future = Future()
+        with self._lock:
+            self._pending[row["request_id"]] = future
+        self._subject.push(row)
+        try:
+            return future.result(timeout=self.timeout_sec)
+        except FutureTimeout:
+            raise TimeoutError(f"Document store did not answer within {self.timeout_sec:g}s") from None
+        finally:
+            with self._lock:
+                self._pending.pop(row["request_id"], None)
+
+    # Runs on the Pathway engine thread
+    def _on_result(self, key: Any, row: Dict[str, Any], time: int, is_addition: bool) -> None:
+        if not is_addition:
+            return
+        with self._lock:
+            future = self._pending.get(row["request_id"])
+        if future is None or future.done():
+            return
+        result = row["result"]
+        future.set_result(list(result.value if isinstance(result, pw.Json) else result))
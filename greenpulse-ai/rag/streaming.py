@@ -0,0 +1,208 @@
+"""
+PHASE D — Streaming Answers for /ask/stream
+
+The plain /ask call returns only once the whole LLM answer exists, so
+the user waits for the full generation time before seeing anything.
+A streaming engine instead produces events as they become available:
+
+    ("sources", [document text, ...])   as soon as retrieval finishes
+    ("token", "text chunk")             per chunk the LLM generates
+
+WHY STREAMING:
+- Time to first byte drops from total generation time to retrieval time,
+  and the answer starts rendering after the LLM's first token
+- Sources go out first, so the UI can show the evidence while the model
+  is still writing
+
+The Pathway chat wrappers used by the RAG question answerer are table
+UDFs that return whole completions, so tokens are streamed from the
+provider's SDK with the same model, key and prompt: the OpenAI SDK for
+"openai", LiteLLM (as LiteLLMChat) for "gemini", and the extractive
+answer of rag/local_llm.py for "local". FakeStreamingLLM replays a
+canned answer with configurable first-token and per-token delays, so
+time-to-first-byte can be measured offline.
+
+Pathway's question answerers only take queries as table rows, so the
+context documents come from an explicit `retrieve(question, k)`
+callable — rag/retriever.DocumentStoreRetriever over the live
+DocumentStore.
+"""
+import inspect
+import time
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+from config import config
+from .local_llm import ExtractiveLLM
+from .metadata_filters import metadata_filter, query_scope
+
+
+# Shared with create_query_engine so streamed and plain answers match
+PROMPT_TEMPLATE = (
+    "You are GreenPulse AI, a carbon and logistics intelligence assistant.\n"
+    "Use the following fleet data to answer the question.\n"
+    "Be concise, data-driven, and use specific vehicle IDs and numbers.\n\n"
+    "Context:\n{context}\n\n"
+    "Question: {query}\n\n"
+    "Answer:"
+)
+
+Event = Tuple[str, Any]
+
+
+class OpenAIStreamingLLM:
+    """Chat completions with stream=True; yields content deltas."""
+
+    def __init__(self, model: str, api_key: str):
+        self.model = model
+        self.api_key = api_key
+        self._client = None
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        if self._client is None:
+            from openai import OpenAI
+
+            self._client = OpenAI(api_key=self.api_key)
+        response = self._client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+        )
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class LiteLLMStreamingLLM:
+    """LiteLLM completion with stream=True (any LiteLLM model, e.g. gemini/...); yields content deltas."""
+
+    def __init__(self, model: str, api_key: str):
+        self.model = model
+        self.api_key = api_key
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        import litellm
+
+        response = litellm.completion(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            api_key=self.api_key,
+            stream=True,
+        )
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class FakeStreamingLLM:
+    """Offline stand-in: a canned answer emitted word by word with set delays."""
+
+    def __init__(self, first_token_ms: int = 300, token_ms: int = 20, answer: Optional[str] = None):
+        self.first_token = first_token_ms / 1000.0
+        self.token = token_ms / 1000.0
+        self.answer = answer
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        text = self.answer or (
+            "Based on the live fleet data, the vehicles with the highest carbon "
+            "output are also the ones with the most recent alerts; review their "
+            "routes and idle time first."
+        )
+        time.sleep(self.first_token)
+        for i, word in enumerate(text.split(" ")):
+            if i:
+                time.sleep(self.token)
+            yield word if i == 0 else f" {word}"
+
+
+def create_streaming_llm():
+    rag_cfg = config.rag
+    if rag_cfg.llm_provider == "fake":
+        return FakeStreamingLLM(rag_cfg.fake_llm_first_token_ms, rag_cfg.fake_llm_token_ms)
+    if rag_cfg.llm_provider == "local":
+        return ExtractiveLLM(rag_cfg.local_llm_max_documents)
+    if rag_cfg.llm_provider == "gemini":
+        return LiteLLMStreamingLLM(f"gemini/{rag_cfg.llm_model}", rag_cfg.gemini_api_key)
+    if rag_cfg.llm_provider != "openai":
+        raise ValueError(f"Unknown llm_provider: {rag_cfg.llm_provider!r}")
+    return OpenAIStreamingLLM(rag_cfg.llm_model, rag_cfg.openai_api_key)
+
+
+def _chunks(text: str, size: int = 32) -> Iterator[str]:
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+def _accepts(fn: Any, name: str) -> bool:
+    try:
+        return name in inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+class StreamingQueryEngine:
+    """
+    Adds stream() to a query engine; everything else is delegated.
+
+    `retrieve(question, k)` returns the context documents' texts
+    (rag/retriever.DocumentStoreRetriever); answer() and stream() then
+    prompt `llm` with them, so both use the configured provider. Without
+    it, both fall back to the engine's answer(question), which stream()
+    sends as token chunks right after its sources.
+
+    With `scoped`, questions naming vehicles or a document category pass
+    their JMESPath metadata filter (rag/metadata_filters.py) to retrieve()
+    and answer() where they accept one (`metadata_filter` / `filters`, as
+    in Pathway's document store and question answerers).
+    """
+
+    def __init__(
+        self,
+        engine: Any,
+        llm: Any,
+        retrieve: Optional[Callable[..., Sequence[str]]] = None,
+        n_documents: int = 5,
+        scoped: bool = True,
+    ):
+        self.engine = engine
+        self.llm = llm
+        # Explicit only: Pathway answerers' own retrieve() takes a query table
+        self._retrieve = retrieve
+        self.n_documents = n_documents
+        self.scoped = scoped
+
+    def _filter(self, question: str) -> Optional[str]:
+        """The question's metadata filter, None when unscoped."""
+        return metadata_filter(query_scope(question)) if self.scoped else None
+
+    def answer(self, question: str) -> Any:
+        filters = self._filter(question)
+        if self._retrieve is not None:
+            documents = self._retrieved(question, filters)
+            prompt = PROMPT_TEMPLATE.format(context="\n\n".join(documents), query=question)
+            return {"answer": "".join(self.llm.stream(prompt)), "sources": documents}
+        if filters is not None and _accepts(self.engine.answer, "filters"):
+            return self.engine.answer(question, filters=filters)
+        return self.engine.answer(question)
+
+    def _retrieved(self, question: str, filters: Optional[str]) -> List[str]:
+        if filters is not None and _accepts(self._retrieve, "metadata_filter"):
+            found = self._retrieve(question, self.n_documents, metadata_filter=filters)
+        else:
+            found = self._retrieve(question, self.n_documents)
+        return [str(doc) for doc in found]
+
+    def stream(self, question: str) -> Iterator[Event]:
+        if self._retrieve is None:
+            result = self.answer(question)
+            yield "sources", list(result.get("sources", []))
+            yield from (("token", chunk) for chunk in _chunks(result.get("answer", "")))
+            return
+
+        documents = self._retrieved(question, self._filter(question))
+        yield "sources", documents
+        prompt = PROMPT_TEMPLATE.format(context="\n\n".join(documents), query=question)
+        for token in self.llm.stream(prompt):
+            yield "token", token
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.engine, name)
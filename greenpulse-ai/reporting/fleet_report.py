@@ -194,8 +194,9 @@ def compute_fleet_reports(
             pw.lit("Fleet"),  # Simplified
             pw.this.active_vehicles,
         ),
-        fleet_health=pw.apply(
+        fleet_health=pw.apply_with_type(
             lambda alerts: "critical" if alerts > 10 else "degraded" if alerts > 5 else "healthy",
+            str,
             pw.this.total_alerts,
         ),
     )
@@ -9,6 +9,7 @@ WHY THIS IMPROVES JUDGING SCORE:
 - Judges love gamification and leaderboards
 """
 import pathway as pw
+from streaming.retention import all_time_avg, all_time_count, all_time_sum
 
 
 def compute_vehicle_rankings(windowed: pw.Table) -> pw.Table:
@@ -23,6 +24,8 @@ def compute_vehicle_rankings(windowed: pw.Table) -> pw.Table:
     WHY STREAMING-SAFE:
     - groupby().reduce() is fully incremental in Pathway
     - Ranks recompute only for affected vehicles
+    - all_time_* reducers carry totals forward when old windows are
+      retracted by the retention policy
 
     Args:
         windowed: Windowed metrics table
@@ -32,12 +35,12 @@ def compute_vehicle_rankings(windowed: pw.Table) -> pw.Table:
     """
     rankings = windowed.groupby(pw.this.vehicle_id).reduce(
         vehicle_id=pw.this.vehicle_id,
-        total_carbon_kg=pw.reducers.sum(pw.this.carbon_kg),
-        avg_efficiency=pw.reducers.avg(pw.this.fuel_efficiency),
-        avg_speed=pw.reducers.avg(pw.this.avg_speed),
-        total_distance=pw.reducers.sum(pw.this.total_distance),
-        total_fuel=pw.reducers.sum(pw.this.total_fuel),
-        window_count=pw.reducers.count(),
+        total_carbon_kg=all_time_sum(pw.this.carbon_kg),
+        avg_efficiency=all_time_avg(pw.this.fuel_efficiency),
+        avg_speed=all_time_avg(pw.this.avg_speed),
+        total_distance=all_time_sum(pw.this.total_distance),
+        total_fuel=all_time_sum(pw.this.total_fuel),
+        window_count=all_time_count(),
     )
 
     return rankings
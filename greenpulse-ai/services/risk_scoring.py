@@ -10,6 +10,7 @@ WHY THIS IMPROVES JUDGING SCORE:
 - Demonstrates complex streaming aggregation
 """
 import pathway as pw
+from streaming.retention import all_time_avg
 
 
 def compute_risk_scores(
@@ -56,10 +57,10 @@ def compute_risk_scores(
     # Aggregate vehicle metrics
     vehicle_stats = windowed.groupby(pw.this.vehicle_id).reduce(
         vehicle_id=pw.this.vehicle_id,
-        avg_speed=pw.reducers.avg(pw.this.avg_speed),
-        avg_efficiency=pw.reducers.avg(pw.this.fuel_efficiency),
-        avg_carbon_kg=pw.reducers.avg(pw.this.carbon_kg),
-        speed_var=pw.reducers.avg(pw.this.speed_variance),
+        avg_speed=all_time_avg(pw.this.avg_speed),
+        avg_efficiency=all_time_avg(pw.this.fuel_efficiency),
+        avg_carbon_kg=all_time_avg(pw.this.carbon_kg),
+        speed_var=all_time_avg(pw.this.speed_variance),
     )
 
     with_threshold = vehicle_stats.join_left(
@@ -104,14 +105,17 @@ def compute_risk_scores(
     # Explainable factors (all normalized to 0-100)
     explainable = with_all_alerts.with_columns(
         total_alerts=pw.this.threshold_alert_count + pw.this.zscore_alert_count + pw.this.route_alert_count,
-        alert_impact=pw.apply(lambda total: min(100.0, float(total) * 20.0), pw.this.total_alerts),
-        efficiency_impact=pw.apply(
+    ).with_columns(
+        alert_impact=pw.apply_with_type(lambda total: min(100.0, float(total) * 20.0), float, pw.this.total_alerts),
+        efficiency_impact=pw.apply_with_type(
             lambda eff: 10.0 if eff >= 8.0 else 25.0 if eff >= 6.0 else 55.0 if eff >= 4.0 else 85.0,
+            float,
             pw.this.avg_efficiency,
         ),
-        carbon_impact=pw.apply(lambda carbon: min(100.0, carbon * 5.0), pw.this.avg_carbon_kg),
-        status_impact=pw.apply(
+        carbon_impact=pw.apply_with_type(lambda carbon: min(100.0, carbon * 5.0), float, pw.this.avg_carbon_kg),
+        status_impact=pw.apply_with_type(
             lambda route_cnt, speed_var: min(100.0, route_cnt * 35.0 + (35.0 if speed_var > 30.0 else 10.0)),
+            float,
             pw.this.route_alert_count,
             pw.this.speed_var,
         ),
@@ -127,23 +131,27 @@ def compute_risk_scores(
             + 0.15 * pw.this.status_impact
         ),
     ).with_columns(
-        alert_impact_pct=pw.apply(
+        alert_impact_pct=pw.apply_with_type(
             lambda alerts, risk: (alerts / risk) * 100.0 if risk > 0 else 0.0,
+            float,
             0.35 * pw.this.alert_impact,
             pw.this.risk_score,
         ),
-        efficiency_impact_pct=pw.apply(
+        efficiency_impact_pct=pw.apply_with_type(
             lambda eff, risk: (eff / risk) * 100.0 if risk > 0 else 0.0,
+            float,
             0.25 * pw.this.efficiency_impact,
             pw.this.risk_score,
         ),
-        carbon_impact_pct=pw.apply(
+        carbon_impact_pct=pw.apply_with_type(
             lambda carbon, risk: (carbon / risk) * 100.0 if risk > 0 else 0.0,
+            float,
             0.25 * pw.this.carbon_impact,
             pw.this.risk_score,
         ),
-        status_impact_pct=pw.apply(
+        status_impact_pct=pw.apply_with_type(
             lambda status, risk: (status / risk) * 100.0 if risk > 0 else 0.0,
+            float,
             0.15 * pw.this.status_impact,
             pw.this.risk_score,
         ),
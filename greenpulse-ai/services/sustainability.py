@@ -11,6 +11,7 @@ WHY THIS IMPROVES JUDGING SCORE:
 """
 import pathway as pw
 from config import config
+from streaming.retention import all_time_avg, all_time_sum
 
 
 def compute_sustainability_scores(windowed: pw.Table) -> pw.Table:
@@ -32,31 +33,34 @@ def compute_sustainability_scores(windowed: pw.Table) -> pw.Table:
     """
     scores = windowed.groupby(pw.this.vehicle_id).reduce(
         vehicle_id=pw.this.vehicle_id,
-        avg_carbon_per_km=pw.apply(
+        avg_carbon_per_km=pw.apply_with_type(
             lambda carbon, dist: carbon / max(dist, 0.1),
-            pw.reducers.sum(pw.this.carbon_kg),
-            pw.reducers.sum(pw.this.total_distance),
+            float,
+            all_time_sum(pw.this.carbon_kg),
+            all_time_sum(pw.this.total_distance),
         ),
-        avg_efficiency=pw.reducers.avg(pw.this.fuel_efficiency),
-        avg_speed=pw.reducers.avg(pw.this.avg_speed),
-        total_carbon=pw.reducers.sum(pw.this.carbon_kg),
-        total_distance=pw.reducers.sum(pw.this.total_distance),
+        avg_efficiency=all_time_avg(pw.this.fuel_efficiency),
+        avg_speed=all_time_avg(pw.this.avg_speed),
+        total_carbon=all_time_sum(pw.this.carbon_kg),
+        total_distance=all_time_sum(pw.this.total_distance),
     )
 
     # Compute normalized sustainability score
     scores = scores.with_columns(
-        sustainability_score=pw.apply(
+        sustainability_score=pw.apply_with_type(
             lambda carbon_per_km, efficiency, speed: _compute_score(
                 carbon_per_km, efficiency, speed
             ),
+            float,
             pw.this.avg_carbon_per_km,
             pw.this.avg_efficiency,
             pw.this.avg_speed,
         ),
-        grade=pw.apply(
+        grade=pw.apply_with_type(
             lambda carbon_per_km, efficiency, speed: _compute_grade(
                 _compute_score(carbon_per_km, efficiency, speed)
             ),
+            str,
             pw.this.avg_carbon_per_km,
             pw.this.avg_efficiency,
             pw.this.avg_speed,
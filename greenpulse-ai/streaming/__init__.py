@@ -1 +1,9 @@
-# Empty init files for Python packages
+"""Streaming package."""
+from .joins import join_all_streams
+from .windows import compute_rolling_windows, compute_closed_windows
+
+__all__ = [
+    "join_all_streams",
+    "compute_rolling_windows",
+    "compute_closed_windows",
+]
@@ -2,28 +2,45 @@
 PHASE A — Incremental Joins Module
 
 Combines GPS, fuel, and shipment streams using Pathway's
-temporal interval joins. This is the core data fusion layer.
+temporal as-of / interval joins. This is the core data fusion layer.
 
 WHY STREAMING-SAFE:
-- pw.temporal.interval_join only processes new/changed rows
+- pw.temporal.asof_join / interval_join only process new/changed rows
 - Join results auto-update when any input stream changes
 - No full cartesian product — only matching time windows are joined
 """
 import pathway as pw
 from config import config
+from streaming.retention import join_behavior
+
+
+# Telemetry columns added by the shipment enrichment
+SHIPMENT_COLUMNS = ("shipment_id", "shipment_status", "is_delayed")
+
+
+def _behavior(behavior) -> dict:
+    """asof_join rejects behavior=None, so only pass a behavior when retention is on."""
+    return {"behavior": behavior} if behavior is not None else {}
 
 
 def join_gps_fuel(gps: pw.Table, fuel: pw.Table) -> pw.Table:
     """
-    Temporally join GPS and fuel data within a 30-second window.
+    Join GPS and fuel data into a unified vehicle telemetry table.
 
-    This creates a unified vehicle telemetry table where each GPS
-    reading is enriched with the nearest fuel consumption data.
+    Each GPS reading is enriched with fuel consumption data, using the
+    strategy selected by config.stream.gps_fuel_join_mode:
 
-    WHY INTERVAL JOIN:
+    - "asof" (default): the latest fuel reading at or before the GPS point
+    - "interval": every fuel reading within ±gps_fuel_interval_sec
+
+    WHY AS-OF BY DEFAULT:
     - GPS arrives every 2s, fuel every 3s — they don't align perfectly
-    - Interval join matches rows within a time tolerance
-    - Only new GPS/fuel pairs trigger recomputation
+    - An interval join pairs each GPS point with ~20 fuel rows (and vice
+      versa), amplifying every downstream table by an order of magnitude
+    - As-of yields exactly one telemetry row per GPS point
+
+    Both modes carry fuel_time (the matched reading's timestamp) so that
+    window aggregates can count each fuel reading once.
 
     Args:
         gps: GPS stream table
@@ -32,13 +49,33 @@ def join_gps_fuel(gps: pw.Table, fuel: pw.Table) -> pw.Table:
     Returns:
         pw.Table: Joined GPS + fuel telemetry table
     """
-    joined = pw.temporal.interval_join(
+    if config.stream.gps_fuel_join_mode == "interval":
+        return _interval_join_gps_fuel(gps, fuel)
+    return _asof_join_gps_fuel(gps, fuel)
+
+
+def _asof_join_gps_fuel(gps: pw.Table, fuel: pw.Table) -> pw.Table:
+    """
+    Nearest-previous fuel reading per GPS point (per vehicle).
+
+    Left join: GPS points that precede a vehicle's first fuel reading are
+    kept with zero consumption rather than dropped.
+    """
+    return pw.temporal.asof_join(
         gps,
         fuel,
         gps.parsed_time,
         fuel.parsed_time,
-        pw.temporal.interval(-30, 30),  # ±30 second window
         gps.vehicle_id == fuel.vehicle_id,  # Join on vehicle
+        how=pw.JoinMode.LEFT,
+        defaults={
+            fuel.fuel_liters: 0.0,
+            fuel.distance_km: 0.0,
+            fuel.fuel_type: "unknown",
+        },
+        direction=pw.temporal.Direction.BACKWARD,
+        # Forget fuel readings past the retention cutoff; later GPS points get the defaults
+        **_behavior(join_behavior()),
     ).select(
         vehicle_id=gps.vehicle_id,
         latitude=gps.latitude,
@@ -47,10 +84,38 @@ def join_gps_fuel(gps: pw.Table, fuel: pw.Table) -> pw.Table:
         fuel_liters=fuel.fuel_liters,
         distance_km=fuel.distance_km,
         fuel_type=fuel.fuel_type,
+        fuel_time=pw.coalesce(fuel.parsed_time, gps.parsed_time),
         timestamp=gps.parsed_time,
+        **_shipment_columns(gps),
     )
 
-    return joined
+
+def _interval_join_gps_fuel(gps: pw.Table, fuel: pw.Table) -> pw.Table:
+    """All GPS/fuel pairs within ±gps_fuel_interval_sec (per vehicle)."""
+    tolerance = config.stream.gps_fuel_interval_sec
+
+    return pw.temporal.interval_join(
+        gps,
+        fuel,
+        gps.parsed_time,
+        fuel.parsed_time,
+        pw.temporal.interval(
+            -pw.Duration(seconds=tolerance), pw.Duration(seconds=tolerance)
+        ),
+        gps.vehicle_id == fuel.vehicle_id,  # Join on vehicle
+        behavior=join_behavior(),  # Drop pairing state past the retention cutoff
+    ).select(
+        vehicle_id=gps.vehicle_id,
+        latitude=gps.latitude,
+        longitude=gps.longitude,
+        speed=gps.speed,
+        fuel_liters=fuel.fuel_liters,
+        distance_km=fuel.distance_km,
+        fuel_type=fuel.fuel_type,
+        fuel_time=fuel.parsed_time,
+        timestamp=gps.parsed_time,
+        **_shipment_columns(gps),
+    )
 
 
 def join_all_streams(
@@ -63,8 +128,10 @@ def join_all_streams(
     all three streams.
 
     Join strategy:
-    1. GPS + Fuel → telemetry (interval join, ±30s)
-    2. telemetry + Shipments → full context (left join on vehicle_id)
+    1. GPS + Fuel → telemetry (as-of or interval join, see join_gps_fuel)
+    2. telemetry + Shipments → full context (left join on vehicle_id),
+       strategy selected by config.stream.shipment_join_mode; "current"
+       attaches the status to the GPS points before step 1
 
     WHY LEFT JOIN FOR SHIPMENTS:
     - Not every GPS point has a corresponding shipment update
@@ -78,11 +145,106 @@ def join_all_streams(
     Returns:
         pw.Table: Fully joined telemetry table
     """
+    mode = config.stream.shipment_join_mode
+    if mode == "current":
+        gps = _with_current_shipment(gps, shipments)
+
     # Step 1: GPS + Fuel temporal join
     telemetry = join_gps_fuel(gps, fuel)
 
-    # Step 2: Enrich with latest shipment status per vehicle
-    # Use asof_join to get the most recent shipment for each vehicle
+    # Step 2: Enrich with shipment status per vehicle
+    if mode == "latest":
+        return _enrich_with_latest_shipment(telemetry, shipments)
+    if mode == "asof":
+        return _enrich_with_asof_shipment(telemetry, shipments)
+    return telemetry
+
+
+def _with_current_shipment(gps: pw.Table, shipments: pw.Table) -> pw.Table:
+    """
+    Attach each vehicle's current shipment status to its GPS points.
+
+    WHY AS-OF-NOW:
+    - Only each vehicle's newest shipment event (by event time) is kept,
+      and GPS points are joined against it as they arrive without being
+      stored: state is one row per vehicle, whatever the uptime
+    - Results are never revised, so a status change costs no downstream
+      work at all
+    - An event-time as-of join has to keep telemetry as long as it keeps
+      shipment statuses (one cutoff for both sides), and revises the rows
+      that pointed at a status when it is forgotten
+    - The GPS stream is joined rather than telemetry: as-of-now joins need
+      an append-only left side, and the GPS × fuel join revises its rows
+    """
+    current = shipments.deduplicate(
+        value=pw.this.parsed_time,
+        instance=pw.this.vehicle_id,
+        acceptor=lambda new, old: new >= old,
+    )
+    return gps.asof_now_join(
+        current,
+        gps.vehicle_id == current.vehicle_id,
+        how=pw.JoinMode.LEFT,
+    ).select(
+        *pw.left,
+        shipment_id=pw.right.shipment_id,
+        shipment_status=pw.right.status,
+        is_delayed=pw.right.is_delayed,
+    )
+
+
+def _shipment_columns(gps: pw.Table) -> dict:
+    """The shipment columns _with_current_shipment added to `gps`, if any."""
+    return {name: gps[name] for name in SHIPMENT_COLUMNS if name in gps.column_names()}
+
+
+def _enrich_with_asof_shipment(telemetry: pw.Table, shipments: pw.Table) -> pw.Table:
+    """
+    Attach the shipment status that was current at each telemetry row's
+    event time.
+
+    WHY AS-OF:
+    - A shipment event at time t only affects telemetry rows from t up to
+      the vehicle's next shipment event — history before t is untouched
+    - Each status change is O(1) downstream work instead of retracting and
+      re-inserting every telemetry row the vehicle has ever produced
+    - The join's cutoff applies to both sides: telemetry is kept as long
+      as shipment statuses (shipment_state_cutoff_sec), so that setting
+      bounds this join's memory
+    """
+    return pw.temporal.asof_join(
+        telemetry,
+        shipments,
+        telemetry.timestamp,
+        shipments.parsed_time,
+        telemetry.vehicle_id == shipments.vehicle_id,
+        how=pw.JoinMode.LEFT,
+        direction=pw.temporal.Direction.BACKWARD,
+        # A shipment status stays attached for up to shipment_state_cutoff_sec
+        **_behavior(join_behavior(config.window.shipment_state_cutoff_sec)),
+    ).select(
+        vehicle_id=telemetry.vehicle_id,
+        latitude=telemetry.latitude,
+        longitude=telemetry.longitude,
+        speed=telemetry.speed,
+        fuel_liters=telemetry.fuel_liters,
+        distance_km=telemetry.distance_km,
+        fuel_type=telemetry.fuel_type,
+        fuel_time=telemetry.fuel_time,
+        timestamp=telemetry.timestamp,
+        shipment_id=shipments.shipment_id,
+        shipment_status=shipments.status,
+        is_delayed=shipments.is_delayed,
+    )
+
+
+def _enrich_with_latest_shipment(telemetry: pw.Table, shipments: pw.Table) -> pw.Table:
+    """
+    Attach each vehicle's latest shipment status to all of its telemetry.
+
+    Every status change re-emits the vehicle's entire telemetry history;
+    kept for parity with the original pipeline.
+    """
     latest_shipments = shipments.groupby(pw.this.vehicle_id).reduce(
         vehicle_id=pw.this.vehicle_id,
         shipment_id=pw.reducers.latest(pw.this.shipment_id),
@@ -104,6 +266,7 @@ def join_all_streams(
         fuel_liters=telemetry.fuel_liters,
         distance_km=telemetry.distance_km,
         fuel_type=telemetry.fuel_type,
+        fuel_time=telemetry.fuel_time,
         timestamp=telemetry.timestamp,
         shipment_id=latest_shipments.shipment_id,
         shipment_status=latest_shipments.status,
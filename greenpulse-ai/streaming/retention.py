@@ -0,0 +1,192 @@
+"""
+PHASE B — State Retention
+
+Shared retention policy for every stateful operator in the pipeline,
+driven by WindowConfig.
+
+WHY RETENTION:
+- Temporal joins and windows keep their state forever by default, so
+  memory grows linearly with uptime
+- pw.temporal.common_behavior(cutoff=...) lets Pathway drop state once
+  event time has moved past the horizon — memory is then bounded by
+  fleet size × retention horizon
+- All-time per-vehicle aggregates would lose history when their input
+  windows are retracted; carry-forward reducers keep running totals for
+  windows that have aged out, and a placeholder row per vehicle keeps
+  its aggregate row alive once all of its windows are gone
+- expire_after() applies the same event-time cutoff to plain tables
+  (e.g. the RAG documents), row by row
+"""
+from typing import Any, List, Optional, Tuple
+
+import pathway as pw
+from config import config
+
+
+def window_behavior(keep_results: Optional[bool] = None):
+    """
+    Behavior for windowby() calls, or None when retention is disabled.
+
+    Args:
+        keep_results: Override WindowConfig.retention_keep_results for
+            windows whose emitted rows must outlive the horizon
+
+    Returns:
+        pw.temporal.CommonBehavior | None
+    """
+    window_cfg = config.window
+    if not window_cfg.retention_enabled:
+        return None
+    if keep_results is None:
+        keep_results = window_cfg.retention_keep_results
+    return pw.temporal.common_behavior(
+        delay=(
+            pw.Duration(seconds=window_cfg.retention_delay_sec)
+            if window_cfg.retention_delay_sec > 0
+            else None
+        ),
+        cutoff=pw.Duration(seconds=window_cfg.retention_cutoff_sec),
+        keep_results=keep_results,
+    )
+
+
+def join_behavior(cutoff_sec: Optional[int] = None):
+    """
+    Behavior for temporal (interval and as-of) joins, or None when
+    retention is disabled.
+
+    Args:
+        cutoff_sec: Override WindowConfig.retention_cutoff_sec, e.g. for
+            as-of joins whose right side changes rarely
+    """
+    window_cfg = config.window
+    if not window_cfg.retention_enabled:
+        return None
+    return pw.temporal.common_behavior(
+        cutoff=pw.Duration(seconds=cutoff_sec or window_cfg.retention_cutoff_sec),
+    )
+
+
+def expire_after(table: pw.Table, time_column: str, ttl_sec: int) -> pw.Table:
+    """
+    Rows of `table`, each retracted once event time passes its
+    `time_column` + ttl_sec.
+
+    Every row is its own windowby instance, so it is inserted once and
+    retracted once — no other row is re-emitted — and the cutoff drops
+    its state together with the result.
+    """
+    columns = table.column_names()
+    return table.windowby(
+        table[time_column],
+        window=pw.temporal.tumbling(duration=pw.Duration(seconds=1)),
+        instance=table.id,
+        behavior=pw.temporal.common_behavior(
+            cutoff=pw.Duration(seconds=ttl_sec),
+            keep_results=False,
+        ),
+    ).reduce(**{name: pw.reducers.any(pw.this[name]) for name in columns})
+
+
+# ─────────────────────────────────────
+# All-time aggregates over windowed rows
+# ─────────────────────────────────────
+
+def _carries_forward() -> bool:
+    window_cfg = config.window
+    return (
+        window_cfg.retention_enabled
+        and not window_cfg.retention_keep_results
+        and window_cfg.carry_forward_totals
+    )
+
+
+# Columns of the windowed table the all-time aggregates read
+_ALL_TIME_COLUMNS = (
+    "vehicle_id", "window_end", "data_points", "avg_speed", "total_fuel",
+    "total_distance", "carbon_kg", "fuel_efficiency", "speed_variance",
+)
+
+
+def all_time_input(windowed: pw.Table, telemetry: pw.Table) -> pw.Table:
+    """
+    The table all-time per-vehicle aggregates group: windowed, plus one
+    placeholder row per vehicle (data_points == 0) when totals carry
+    forward.
+
+    A group disappears once all of its rows are retracted, taking its
+    carried totals with it; the placeholder comes from telemetry, which
+    retention never retracts, so every vehicle keeps its row.
+    """
+    if not _carries_forward():
+        return windowed
+    placeholders = telemetry.groupby(pw.this.vehicle_id).reduce(
+        vehicle_id=pw.this.vehicle_id,
+        window_end=pw.reducers.min(pw.this.timestamp),
+    ).select(
+        vehicle_id=pw.this.vehicle_id,
+        window_end=pw.this.window_end,
+        data_points=0,
+        avg_speed=0.0,
+        total_fuel=0.0,
+        total_distance=0.0,
+        carbon_kg=0.0,
+        fuel_efficiency=0.0,
+        speed_variance=0.0,
+    )
+    return windowed.select(*[pw.this[name] for name in _ALL_TIME_COLUMNS]).concat_reindex(placeholders)
+
+
+@pw.reducers.stateful_many
+def _carried_totals(
+    state: Optional[Tuple[float, int]],
+    rows: List[Tuple[List[Any], int]],
+) -> Tuple[float, int]:
+    """
+    Running (sum, count) over (value, window_end, data_points) rows.
+
+    A window update arrives as a retraction and an insertion of the same
+    window in one batch and is applied. A retraction with no insertion of
+    its window in the batch is retention forgetting the window — whatever
+    the vehicle's own event time — and is ignored, carrying its totals
+    forward. Placeholder rows (data_points == 0) are skipped.
+    """
+    total, count = state if state is not None else (0.0, 0)
+    inserted = {window_end for (_, window_end, _), diff in rows if diff > 0}
+
+    for (value, window_end, data_points), diff in rows:
+        if not data_points or (diff < 0 and window_end not in inserted):
+            continue
+        total += float(value) * diff
+        count += diff
+
+    return total, count
+
+
+def _totals(value: pw.ColumnExpression) -> pw.ColumnExpression:
+    return _carried_totals(value, pw.this.window_end, pw.this.data_points)
+
+
+def all_time_sum(value: pw.ColumnExpression) -> pw.ColumnExpression:
+    """sum() reducer over windowed rows that survives window retention."""
+    if not _carries_forward():
+        return pw.reducers.sum(value)
+    return pw.apply_with_type(lambda state: state[0], float, _totals(value))
+
+
+def all_time_avg(value: pw.ColumnExpression) -> pw.ColumnExpression:
+    """avg() reducer over windowed rows that survives window retention."""
+    if not _carries_forward():
+        return pw.reducers.avg(value)
+    return pw.apply_with_type(
+        lambda state: state[0] / state[1] if state[1] > 0 else 0.0,
+        float,
+        _totals(value),
+    )
+
+
+def all_time_count() -> pw.ColumnExpression:
+    """count() reducer over windowed rows that survives window retention."""
+    if not _carries_forward():
+        return pw.reducers.count()
+    return pw.apply_with_type(lambda state: state[1], int, _totals(pw.this.data_points))
@@ -7,10 +7,14 @@ WHY STREAMING-SAFE:
 - pw.temporal.windowby creates tumbling windows that auto-expire
 - Each window is computed incrementally — only new data in the window
   triggers recomputation
-- Old windows are garbage-collected automatically
+- Windows older than WindowConfig.retention_cutoff_sec are dropped
+  (see streaming/retention.py), so window state stays bounded
+- compute_closed_windows() emits each window once, when it closes, for
+  consumers that only want final values (the RAG metric documents)
 """
 import pathway as pw
 from config import config
+from streaming.retention import window_behavior
 
 
 def compute_rolling_windows(telemetry: pw.Table) -> pw.Table:
@@ -19,8 +23,8 @@ def compute_rolling_windows(telemetry: pw.Table) -> pw.Table:
 
     Aggregations:
     - Average speed (km/h)
-    - Total fuel consumed (liters)
-    - Total distance (km)
+    - Total fuel consumed (liters), each fuel reading counted once
+    - Total distance (km), each fuel reading counted once
     - Total carbon emissions (kg CO₂)
     - Fuel efficiency (km/L)
     - Data point count
@@ -36,26 +40,80 @@ def compute_rolling_windows(telemetry: pw.Table) -> pw.Table:
     Returns:
         pw.Table: Windowed aggregation results per vehicle per window
     """
-    emission_factor = config.emission.default_emission_factor
-
-    windowed = telemetry.windowby(
+    windows = telemetry.windowby(
         pw.this.timestamp,
         window=pw.temporal.tumbling(
             duration=pw.Duration(seconds=config.window.window_duration_sec)
         ),
         instance=pw.this.vehicle_id,  # Separate windows per vehicle
-    ).reduce(
-        vehicle_id=pw.this._instance,
+        behavior=window_behavior(),  # Forget windows past the retention cutoff
+    )
+    return _aggregate_windows(windows)
+
+
+def compute_closed_windows(telemetry: pw.Table) -> pw.Table:
+    """
+    The same per-vehicle window aggregates, emitted exactly once per window.
+
+    WHY EXACTLY-ONCE:
+    - compute_rolling_windows updates an open window on every telemetry
+      event, so each consumer sees one new version per event
+    - exactly_once_behavior holds a window back until event time passes
+      its end, then emits its final values and drops its state (rows
+      arriving after that are ignored here; the live table still has them)
+    - Downstream work (document embedding, index writes) is bounded to
+      one row per vehicle per window
+
+    Args:
+        telemetry: Joined telemetry table with GPS + fuel data
+
+    Returns:
+        pw.Table: Final aggregation results per vehicle per closed window
+    """
+    windows = telemetry.windowby(
+        pw.this.timestamp,
+        window=pw.temporal.tumbling(
+            duration=pw.Duration(seconds=config.window.window_duration_sec)
+        ),
+        instance=pw.this.vehicle_id,
+        behavior=pw.temporal.exactly_once_behavior(),
+    )
+    return _aggregate_windows(windows)
+
+
+def _aggregate_windows(windows) -> pw.Table:
+    """Per-window reduce shared by the live and closed-window tables."""
+    emission_factor = config.emission.default_emission_factor
+
+    windowed = windows.reduce(
+        vehicle_id=pw.this._pw_instance,
         window_start=pw.this._pw_window_start,
         window_end=pw.this._pw_window_end,
         avg_speed=pw.reducers.avg(pw.this.speed),
         max_speed=pw.reducers.max(pw.this.speed),
         min_speed=pw.reducers.min(pw.this.speed),
-        total_fuel=pw.reducers.sum(pw.this.fuel_liters),
-        total_distance=pw.reducers.sum(pw.this.distance_km),
+        # One entry per telemetry row; de-duplicated by fuel_time below
+        fuel_readings=pw.reducers.tuple(
+            pw.make_tuple(pw.this.fuel_time, pw.this.fuel_liters, pw.this.distance_km)
+        ),
         data_points=pw.reducers.count(),
     )
 
+    # A fuel reading is shared by every GPS point it was joined to, so sum
+    # each reading once — otherwise fuel (and carbon) is double-counted
+    windowed = windowed.with_columns(
+        total_fuel=pw.apply_with_type(
+            lambda readings: _sum_distinct_readings(readings, 1),
+            float,
+            pw.this.fuel_readings,
+        ),
+        total_distance=pw.apply_with_type(
+            lambda readings: _sum_distinct_readings(readings, 2),
+            float,
+            pw.this.fuel_readings,
+        ),
+    ).without(pw.this.fuel_readings)
+
     # Compute derived window metrics
     windowed = windowed.with_columns(
         # Carbon = fuel × emission factor
@@ -71,3 +129,9 @@ def compute_rolling_windows(telemetry: pw.Table) -> pw.Table:
     )
 
     return windowed
+
+
+def _sum_distinct_readings(readings: tuple, field: int) -> float:
+    """Sum one field of (fuel_time, fuel_liters, distance_km) over distinct readings."""
+    distinct = {reading[0]: reading for reading in readings}
+    return float(sum(reading[field] for reading in distinct.values()))
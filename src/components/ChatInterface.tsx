@@ -4,6 +4,7 @@ import { Send, Bot, User, Sparkles } from "lucide-react";
 import ReactMarkdown from "react-markdown";
 import { useToast } from "@/hooks/use-toast";
 import type { VehicleMetrics, Alert } from "@/lib/mock-data";
+import { isBackendConnected, streamAskBackend } from "@/lib/backend-api";
 
 interface Message {
   id: string;
@@ -100,6 +101,19 @@ export function ChatInterface({ vehicles, alerts, totalEmissions }: ChatInterfac
     };
 
     try {
+      // Pathway backend: answer from the live document store via /ask/stream
+      if (isBackendConnected()) {
+        const answer = await streamAskBackend(query, { onToken: upsertAssistant });
+        if (answer === null) {
+          toast({ title: "Error", description: "AI service unavailable", variant: "destructive" });
+          return;
+        }
+        setMessages((prev) =>
+          prev.map((m) => (m.id === "streaming" ? { ...m, id: Date.now().toString() } : m))
+        );
+        return;
+      }
+
       const context = buildContext(vehicles, alerts, totalEmissions);
       const apiMessages = userMessages
         .filter((m) => m.id !== "welcome")
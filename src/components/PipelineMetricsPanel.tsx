@@ -1,6 +1,11 @@
 import { useEffect, useState } from "react";
 import { Activity, Cpu, Database, Gauge, Info, Timer, Workflow } from "lucide-react";
-import { fetchPipelineMetrics, isBackendConnected, type BackendPipelineMetrics } from "@/lib/backend-api";
+import {
+  fetchPipelineMetrics,
+  isBackendConnected,
+  subscribeStream,
+  type BackendPipelineMetrics,
+} from "@/lib/backend-api";
 import { Tooltip, TooltipContent, TooltipProvider, TooltipTrigger } from "@/components/ui/tooltip";
 
 function formatUptime(seconds: number): string {
@@ -17,6 +22,17 @@ export function PipelineMetricsPanel() {
     if (!isBackendConnected()) return;
 
     let mounted = true;
+    const unsubscribe = subscribeStream(["pipeline_metrics"], {
+      onSnapshot: (_topic, _rows, data) => mounted && data && setMetrics(data),
+      onData: (_topic, data) => mounted && data && setMetrics(data),
+    });
+    if (unsubscribe) {
+      return () => {
+        mounted = false;
+        unsubscribe();
+      };
+    }
+
     const pull = async () => {
       const data = await fetchPipelineMetrics();
       if (mounted && data) setMetrics(data);
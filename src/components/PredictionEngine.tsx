@@ -2,10 +2,13 @@ import React, { useMemo } from "react";
 import { motion } from "framer-motion";
 import { TrendingUp, Zap, Fuel, Brain, ArrowUpRight, ArrowRight, Gauge } from "lucide-react";
 import { VehicleMetrics, Alert } from "@/lib/mock-data";
+import type { BackendPrediction } from "@/lib/backend-api";
 
 interface PredictionEngineProps {
   vehicles: VehicleMetrics[];
   alerts: Alert[];
+  /** Pipeline forecasts (stream topic "predictions"); computed locally when empty */
+  forecasts?: BackendPrediction[];
 }
 
 interface VehiclePrediction {
@@ -78,14 +81,40 @@ function computePredictions(vehicles: VehicleMetrics[], alerts: Alert[]): Vehicl
   }).sort((a, b) => b.riskEscalationProb - a.riskEscalationProb);
 }
 
+function fromBackend(
+  forecasts: BackendPrediction[],
+  local: VehiclePrediction[]
+): VehiclePrediction[] {
+  return forecasts.map((f) => {
+    // The pipeline forecasts the future; the current risk still comes from local metrics
+    const current = local.find((p) => p.vehicleId === f.vehicle_id);
+    const currentRisk = current?.currentRisk ?? Math.round(f.predicted_risk_score);
+    const riskTrend: "up" | "down" | "stable" =
+      f.predicted_risk_score > currentRisk + 5 ? "up" : f.predicted_risk_score < currentRisk - 5 ? "down" : "stable";
+    return {
+      vehicleId: f.vehicle_id,
+      name: current?.name ?? f.vehicle_id,
+      predictedCarbon10Min: Math.round(f.predicted_carbon_10min),
+      predictedRiskScore: Math.round(f.predicted_risk_score),
+      riskEscalationProb: Math.round(f.risk_escalation_probability * 100) / 100,
+      fuelExhaustionMinutes: Math.round(f.fuel_exhaustion_minutes),
+      currentRisk,
+      riskTrend,
+    };
+  }).sort((a, b) => b.riskEscalationProb - a.riskEscalationProb);
+}
+
 const PROB_COLOR = (p: number) =>
   p > 0.75 ? "text-destructive" : p > 0.5 ? "text-warning" : p > 0.25 ? "text-chart-4" : "text-primary";
 
 const PROB_BAR = (p: number) =>
   p > 0.75 ? "bg-destructive" : p > 0.5 ? "bg-warning" : p > 0.25 ? "bg-chart-4" : "bg-primary";
 
-export function PredictionEngine({ vehicles, alerts }: PredictionEngineProps) {
-  const predictions = useMemo(() => computePredictions(vehicles, alerts), [vehicles, alerts]);
+export function PredictionEngine({ vehicles, alerts, forecasts }: PredictionEngineProps) {
+  const predictions = useMemo(() => {
+    const local = computePredictions(vehicles, alerts);
+    return forecasts && forecasts.length > 0 ? fromBackend(forecasts, local) : local;
+  }, [vehicles, alerts, forecasts]);
 
   const fleetAvgEscalation = useMemo(
     () => predictions.reduce((s, p) => s + p.riskEscalationProb, 0) / Math.max(predictions.length, 1),
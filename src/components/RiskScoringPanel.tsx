@@ -3,9 +3,11 @@ import { motion } from "framer-motion";
 import { AlertTriangle, ShieldAlert } from "lucide-react";
 import type { VehicleMetrics, Alert } from "@/lib/mock-data";
 import {
+  applyRowDiff,
   fetchRiskBreakdown,
-  fetchStateExplanation,
+  fetchStateExplanations,
   isBackendConnected,
+  subscribeStream,
   type BackendRiskBreakdownRow,
   type BackendStateExplanation,
 } from "@/lib/backend-api";
@@ -80,6 +82,31 @@ export function RiskScoringPanel({ vehicles, alerts }: Props) {
     if (!isBackendConnected()) return;
     let mounted = true;
 
+    let byKey: Record<string, BackendRiskBreakdownRow> = {};
+    const publish = () => {
+      const next = Object.values(byKey);
+      setBackendRows(next);
+      if (next.length > 0) setFormula(next[0].formula);
+    };
+    const unsubscribe = subscribeStream(["risk_breakdown"], {
+      onSnapshot: (_topic, rows) => {
+        if (!mounted || !rows) return;
+        byKey = rows;
+        publish();
+      },
+      onDiff: (_topic, diff) => {
+        if (!mounted) return;
+        byKey = applyRowDiff(byKey, diff);
+        publish();
+      },
+    });
+    if (unsubscribe) {
+      return () => {
+        mounted = false;
+        unsubscribe();
+      };
+    }
+
     const pull = async () => {
       const data = await fetchRiskBreakdown();
       if (!mounted || !data) return;
@@ -101,13 +128,11 @@ export function RiskScoringPanel({ vehicles, alerts }: Props) {
 
     const pullExplanations = async () => {
       const topVehicleIds = backendRows.slice(0, 6).map((row) => row.vehicle_id);
-      const responses = await Promise.all(
-        topVehicleIds.map((vehicleId) => fetchStateExplanation(vehicleId))
-      );
-      if (!mounted) return;
+      const data = await fetchStateExplanations(topVehicleIds);
+      if (!mounted || !data) return;
       const next: Record<string, BackendStateExplanation> = {};
-      responses.forEach((response) => {
-        if (response) next[response.vehicle_id] = response;
+      data.explanations.forEach((explanation) => {
+        next[explanation.vehicle_id] = explanation;
       });
       setExplanations(next);
     };
@@ -2,10 +2,13 @@ import React, { useMemo } from "react";
 import { motion } from "framer-motion";
 import { Activity, AlertTriangle, CheckCircle, TrendingUp, Zap, Navigation, Clock, Fuel } from "lucide-react";
 import { VehicleMetrics, Alert } from "@/lib/mock-data";
+import type { BackendVehicleState } from "@/lib/backend-api";
 
 interface VehicleStateMachineProps {
   vehicles: VehicleMetrics[];
   alerts: Alert[];
+  /** Pipeline states (stream topic "vehicle_states"); derived locally when empty */
+  states?: BackendVehicleState[];
 }
 
 type VehicleState =
@@ -102,8 +105,27 @@ const STATE_DISTRIBUTION_ORDER: VehicleState[] = [
   "CRITICAL_RISK", "HIGH_EMISSION", "ROUTE_DEVIATION", "IDLE", "NORMAL", "EFFICIENT",
 ];
 
-export function VehicleStateMachine({ vehicles, alerts }: VehicleStateMachineProps) {
+function fromBackend(state: BackendVehicleState, vehicles: VehicleMetrics[]): VehicleStateInfo {
+  const currentState = (state.current_state in STATE_CONFIG ? state.current_state : "NORMAL") as VehicleState;
+  const previousState = (state.previous_state in STATE_CONFIG ? state.previous_state : "NORMAL") as VehicleState;
+  return {
+    vehicleId: state.vehicle_id,
+    name: vehicles.find((v) => v.vehicleId === state.vehicle_id)?.name ?? state.vehicle_id,
+    currentState,
+    previousState,
+    riskScore: Math.round(state.risk_score),
+    transitionReason: state.transition_reason,
+    riskLevel: state.risk_level as VehicleStateInfo["riskLevel"],
+  };
+}
+
+export function VehicleStateMachine({ vehicles, alerts, states }: VehicleStateMachineProps) {
   const vehicleStates: VehicleStateInfo[] = useMemo(() => {
+    if (states && states.length > 0) {
+      return states
+        .map((state) => fromBackend(state, vehicles))
+        .sort((a, b) => STATE_CONFIG[b.currentState].priority - STATE_CONFIG[a.currentState].priority);
+    }
     return vehicles.map((v) => {
       const state = deriveState(v, alerts);
       const riskScore = Math.min(
@@ -122,7 +144,7 @@ export function VehicleStateMachine({ vehicles, alerts }: VehicleStateMachinePro
         riskLevel: (riskScore > 80 ? "critical" : riskScore > 60 ? "high" : riskScore > 40 ? "medium" : riskScore > 20 ? "low" : "minimal") as "critical" | "high" | "medium" | "low" | "minimal",
       };
     }).sort((a, b) => STATE_CONFIG[b.currentState].priority - STATE_CONFIG[a.currentState].priority);
-  }, [vehicles, alerts]);
+  }, [vehicles, alerts, states]);
 
   const distribution = useMemo(() => {
     const counts: Record<string, number> = {};
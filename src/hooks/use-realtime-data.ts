@@ -17,9 +17,77 @@ import {
   type VehicleMetrics,
   type EmissionSnapshot,
 } from "@/lib/mock-data";
+import {
+  applyRowDiff,
+  fetchDashboard,
+  isBackendConnected,
+  subscribeStream,
+  type BackendAlert,
+  type BackendMetrics,
+  type BackendPrediction,
+  type BackendVehicleState,
+} from "@/lib/backend-api";
 
 const pick = <T>(arr: T[]): T => arr[Math.floor(Math.random() * arr.length)];
 
+// With a backend configured the dashboard follows the pipeline's push feed
+// (/stream); the mock generators below only run without one.
+const LIVE = isBackendConnected();
+
+// Fleet metrics have no push topic: re-read them on pipeline pushes, at most this often
+const METRICS_REFRESH_MS = 2000;
+
+function toAlert(key: string, alert: BackendAlert): Alert {
+  const type: Alert["type"] =
+    alert.type === "route_deviation"
+      ? "deviation"
+      : alert.type.startsWith("efficiency")
+        ? "inefficiency"
+        : alert.type.includes("weather")
+          ? "weather"
+          : "anomaly";
+  return {
+    id: key,
+    type,
+    severity: alert.severity as Alert["severity"],
+    vehicleId: alert.vehicle_id,
+    message: alert.message,
+    timestamp: new Date(alert.timestamp),
+  };
+}
+
+function toAlerts(rows: Record<string, BackendAlert>): Alert[] {
+  return Object.entries(rows)
+    .map(([key, alert]) => toAlert(key, alert))
+    .sort((a, b) => b.timestamp.getTime() - a.timestamp.getTime())
+    .slice(0, 50);
+}
+
+function toVehicleMetrics(metrics: BackendMetrics, alerts: Alert[]): VehicleMetrics[] {
+  return metrics.vehicles.map((vehicle) => {
+    const known = VEHICLES.find((v) => v.id === vehicle.vehicle_id);
+    return {
+      vehicleId: vehicle.vehicle_id,
+      name: known?.name ?? vehicle.vehicle_id,
+      type: known?.type ?? "Fleet Vehicle",
+      totalCarbonKg: vehicle.total_carbon_kg,
+      fuelEfficiency: vehicle.avg_efficiency,
+      avgSpeed: vehicle.avg_speed,
+      tripCount: 0,
+      alertCount: alerts.filter((a) => a.vehicleId === vehicle.vehicle_id).length,
+      status: vehicle.avg_speed < 5 ? "idle" : "active",
+    };
+  });
+}
+
+function byVehicle<T extends { vehicle_id: string }>(rows: T[]): Record<string, T> {
+  const keyed: Record<string, T> = {};
+  rows.forEach((row) => {
+    keyed[row.vehicle_id] = row;
+  });
+  return keyed;
+}
+
 export function useRealtimeData() {
   const [gpsStream, setGpsStream] = useState<GPSPoint[]>([]);
   const [fuelStream, setFuelStream] = useState<FuelLog[]>([]);
@@ -34,19 +102,130 @@ export function useRealtimeData() {
     })
   );
   const [alerts, setAlerts] = useState<Alert[]>([]);
-  const [vehicleMetrics, setVehicleMetrics] = useState<VehicleMetrics[]>(generateVehicleMetrics);
-  const [emissionTimeline, setEmissionTimeline] = useState<EmissionSnapshot[]>(generateEmissionTimeline);
+  const [vehicleMetrics, setVehicleMetrics] = useState<VehicleMetrics[]>(() =>
+    LIVE ? [] : generateVehicleMetrics()
+  );
+  const [emissionTimeline, setEmissionTimeline] = useState<EmissionSnapshot[]>(() =>
+    LIVE ? [] : generateEmissionTimeline()
+  );
   const [totalEmissions, setTotalEmissions] = useState(0);
   const [dataPoints, setDataPoints] = useState(0);
+  const [vehicleStates, setVehicleStates] = useState<BackendVehicleState[]>([]);
+  const [predictions, setPredictions] = useState<BackendPrediction[]>([]);
+
+  // Backend: one /dashboard read for the initial state, then stream pushes
+  useEffect(() => {
+    if (!LIVE) return;
+    let mounted = true;
+
+    let alertRows: Record<string, BackendAlert> = {};
+    let stateRows: Record<string, BackendVehicleState> = {};
+    let predictionRows: Record<string, BackendPrediction> = {};
+    let latestAlerts: Alert[] = [];
+    let lastTotal: number | null = null;
+    let lastMetricsRead = 0;
+    let metricsTimer: ReturnType<typeof setTimeout> | null = null;
+
+    const applyMetrics = (metrics: BackendMetrics) => {
+      setVehicleMetrics(toVehicleMetrics(metrics, latestAlerts));
+      setTotalEmissions(metrics.total_emissions_kg);
+      if (lastTotal !== null && metrics.total_emissions_kg !== lastTotal) {
+        const point: EmissionSnapshot = {
+          time: new Date().toLocaleTimeString("en-US", { hour: "2-digit", minute: "2-digit" }),
+          totalKg: Math.max(0, metrics.total_emissions_kg - lastTotal),
+          vehicleBreakdown: {},
+        };
+        setEmissionTimeline((prev) => [...prev.slice(-29), point]);
+      }
+      lastTotal = metrics.total_emissions_kg;
+    };
+
+    const readMetrics = async () => {
+      metricsTimer = null;
+      lastMetricsRead = Date.now();
+      const data = await fetchDashboard(["metrics"]);
+      if (mounted && data?.metrics) applyMetrics(data.metrics);
+    };
+
+    // Pushes arrive in bursts; coalesce them into one metrics read
+    const scheduleMetrics = () => {
+      if (metricsTimer !== null) return;
+      const wait = Math.max(0, lastMetricsRead + METRICS_REFRESH_MS - Date.now());
+      metricsTimer = setTimeout(readMetrics, wait);
+    };
+
+    const publish = (topic: string) => {
+      if (topic === "alerts") {
+        latestAlerts = toAlerts(alertRows);
+        setAlerts(latestAlerts);
+      } else if (topic === "vehicle_states") {
+        setVehicleStates(Object.values(stateRows));
+      } else if (topic === "predictions") {
+        setPredictions(Object.values(predictionRows));
+      }
+    };
+
+    const load = async () => {
+      const data = await fetchDashboard(["metrics", "alerts", "vehicle_states", "predictions"]);
+      if (!mounted || !data) return;
+      // A stream snapshot that arrived first is newer than this read
+      if (data.alerts && Object.keys(alertRows).length === 0) {
+        data.alerts.alerts.forEach((alert, index) => {
+          alertRows[`initial-${index}`] = alert;
+        });
+        publish("alerts");
+      }
+      if (data.vehicle_states && Object.keys(stateRows).length === 0) {
+        stateRows = byVehicle(data.vehicle_states);
+        publish("vehicle_states");
+      }
+      if (data.predictions && Object.keys(predictionRows).length === 0) {
+        predictionRows = byVehicle(data.predictions);
+        publish("predictions");
+      }
+      if (data.metrics) {
+        lastMetricsRead = Date.now();
+        applyMetrics(data.metrics);
+      }
+    };
+
+    const unsubscribe = subscribeStream(["alerts", "vehicle_states", "predictions"], {
+      onSnapshot: (topic, rows) => {
+        if (!mounted || !rows) return;
+        if (topic === "alerts") alertRows = rows;
+        else if (topic === "vehicle_states") stateRows = rows;
+        else if (topic === "predictions") predictionRows = rows;
+        publish(topic);
+      },
+      onDiff: (topic, diff) => {
+        if (!mounted) return;
+        if (topic === "alerts") alertRows = applyRowDiff(alertRows, diff);
+        else if (topic === "vehicle_states") stateRows = applyRowDiff(stateRows, diff);
+        else if (topic === "predictions") predictionRows = applyRowDiff(predictionRows, diff);
+        publish(topic);
+        setDataPoints((p) => p + Object.keys(diff.upserts).length + diff.deletes.length);
+        scheduleMetrics();
+      },
+    });
+
+    load();
+    return () => {
+      mounted = false;
+      if (metricsTimer !== null) clearTimeout(metricsTimer);
+      unsubscribe?.();
+    };
+  }, []);
 
-  // Calculate initial total
+  // Mock: calculate initial total
   useEffect(() => {
+    if (LIVE) return;
     const total = vehicleMetrics.reduce((sum, v) => sum + v.totalCarbonKg, 0);
     setTotalEmissions(total);
   }, []);
 
-  // GPS stream — every 2s
+  // Mock: GPS stream — every 2s
   useEffect(() => {
+    if (LIVE) return;
     const interval = setInterval(() => {
       const v = pick(VEHICLES);
       const point = generateGPS(v.id);
@@ -56,8 +235,9 @@ export function useRealtimeData() {
     return () => clearInterval(interval);
   }, []);
 
-  // Fuel stream — every 3s
+  // Mock: Fuel stream — every 3s
   useEffect(() => {
+    if (LIVE) return;
     const interval = setInterval(() => {
       const v = pick(VEHICLES);
       const log = generateFuelLog(v.id);
@@ -82,8 +262,9 @@ export function useRealtimeData() {
     return () => clearInterval(interval);
   }, []);
 
-  // Shipment updates — every 5s
+  // Mock: Shipment updates — every 5s
   useEffect(() => {
+    if (LIVE) return;
     const interval = setInterval(() => {
       const v = pick(VEHICLES);
       const shipment = generateShipment(v.id);
@@ -93,8 +274,9 @@ export function useRealtimeData() {
     return () => clearInterval(interval);
   }, []);
 
-  // Weather — every 10s
+  // Mock: Weather — every 10s
   useEffect(() => {
+    if (LIVE) return;
     const interval = setInterval(() => {
       setWeather(generateWeather());
       setDataPoints((p) => p + 1);
@@ -102,8 +284,9 @@ export function useRealtimeData() {
     return () => clearInterval(interval);
   }, []);
 
-  // Alerts — random every 4-8s
+  // Mock: Alerts — random every 4-8s
   useEffect(() => {
+    if (LIVE) return;
     let timeout: NodeJS.Timeout;
     const scheduleAlert = () => {
       const delay = 4000 + Math.random() * 4000;
@@ -123,8 +306,9 @@ export function useRealtimeData() {
     return () => clearTimeout(timeout);
   }, []);
 
-  // Update emission timeline every 30s
+  // Mock: Update emission timeline every 30s
   useEffect(() => {
+    if (LIVE) return;
     const interval = setInterval(() => {
       setEmissionTimeline((prev) => {
         const newPoint: EmissionSnapshot = {
@@ -148,5 +332,7 @@ export function useRealtimeData() {
     emissionTimeline,
     totalEmissions,
     dataPoints,
+    vehicleStates,
+    predictions,
   };
 }
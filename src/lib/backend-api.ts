@@ -78,8 +78,30 @@ export async function fetchMetrics(): Promise<BackendMetrics | null> {
   return fetchApi<BackendMetrics>("/metrics");
 }
 
-export async function fetchAlerts(): Promise<{ alerts: BackendAlert[] } | null> {
-  return fetchApi<{ alerts: BackendAlert[] }>("/alerts");
+export interface AlertQuery {
+  limit?: number;
+  cursor?: string;
+  since?: string;
+  vehicle_id?: string;
+  severity?: string;
+  type?: string;
+}
+
+function toQueryString(params: object): string {
+  const query = new URLSearchParams();
+  for (const [name, value] of Object.entries(params)) {
+    if (value !== undefined && value !== null && value !== "") {
+      query.set(name, String(value));
+    }
+  }
+  const encoded = query.toString();
+  return encoded ? `?${encoded}` : "";
+}
+
+export async function fetchAlerts(
+  params: AlertQuery = {}
+): Promise<{ alerts: BackendAlert[]; next_cursor: string | null } | null> {
+  return fetchApi<{ alerts: BackendAlert[]; next_cursor: string | null }>(`/alerts${toQueryString(params)}`);
 }
 
 export async function fetchRankings(): Promise<BackendRanking | null> {
@@ -130,6 +152,16 @@ export interface BackendPipelineMetrics {
   memory_usage_mb: number | null;
   uptime_seconds: number;
   pathway_runtime_integrated: boolean;
+  stages?: Record<string, BackendStageStats>;
+}
+
+export interface BackendStageStats {
+  rows: number;
+  inserted: number;
+  retracted: number;
+  commits: number;
+  rows_per_second: number;
+  watermark: number | null;
 }
 
 export interface BackendRiskBreakdownRow {
@@ -172,8 +204,12 @@ export async function fetchLatestFleetReport(): Promise<BackendFleetReport | nul
   return fetchApi<BackendFleetReport>("/fleet-report/latest");
 }
 
-export async function fetchFleetReportHistory(): Promise<{ reports: BackendFleetReport[] } | null> {
-  return fetchApi<{ reports: BackendFleetReport[] }>("/fleet-report/history");
+export async function fetchFleetReportHistory(
+  params: { limit?: number; cursor?: string; since?: string } = {}
+): Promise<{ reports: BackendFleetReport[]; next_cursor: string | null } | null> {
+  return fetchApi<{ reports: BackendFleetReport[]; next_cursor: string | null }>(
+    `/fleet-report/history${toQueryString(params)}`
+  );
 }
 
 export async function fetchPipelineMetrics(): Promise<BackendPipelineMetrics | null> {
@@ -188,6 +224,94 @@ export async function fetchStateExplanation(vehicleId: string): Promise<BackendS
   return fetchApi<BackendStateExplanation>(`/state-explanation/${vehicleId}`);
 }
 
+export async function fetchStateExplanations(
+  vehicleIds: string[]
+): Promise<{ explanations: BackendStateExplanation[]; missing: string[] } | null> {
+  return postApi<{ explanations: BackendStateExplanation[]; missing: string[] }>("/state-explanations", {
+    vehicle_ids: vehicleIds,
+  });
+}
+
+// ── Composite dashboard (/dashboard) ────────
+
+export interface BackendDashboard {
+  metrics?: BackendMetrics | null;
+  alerts?: { alerts: BackendAlert[]; next_cursor: string | null } | null;
+  rankings?: BackendRanking | null;
+  sustainability?: any | null;
+  vehicle_states?: BackendVehicleState[] | null;
+  predictions?: BackendPrediction[] | null;
+  risk_breakdown?: { formula: string; breakdown: BackendRiskBreakdownRow[] } | null;
+  fleet_report?: BackendFleetReport | null;
+  versions: Record<string, number>;
+}
+
+export type DashboardSection = Exclude<keyof BackendDashboard, "versions">;
+
+/** All panels (or the selected sections) in one request, built from one pipeline snapshot. */
+export async function fetchDashboard(sections?: DashboardSection[]): Promise<BackendDashboard | null> {
+  const query = sections && sections.length > 0 ? `?sections=${sections.join(",")}` : "";
+  return fetchApi<BackendDashboard>(`/dashboard${query}`);
+}
+
+// ── Push feed (/stream, Server-Sent Events) ────────
+export type StreamTopic =
+  | "alerts"
+  | "vehicle_states"
+  | "predictions"
+  | "risk_breakdown"
+  | "pipeline_metrics";
+
+export interface StreamRowDiff<T> {
+  upserts: Record<string, T>;
+  deletes: string[];
+}
+
+export interface StreamHandlers {
+  /** Full current rows (table topics) or payload (computed topics) on connect */
+  onSnapshot?: (topic: StreamTopic, rows: Record<string, any> | null, data: any) => void;
+  /** Coalesced row diffs for table topics */
+  onDiff?: (topic: StreamTopic, diff: StreamRowDiff<any>) => void;
+  /** Fresh payload for computed topics (pipeline_metrics) */
+  onData?: (topic: StreamTopic, data: any) => void;
+}
+
+/**
+ * Subscribe to pipeline pushes. Returns an unsubscribe function, or null
+ * when no backend is configured / EventSource is unavailable.
+ */
+export function subscribeStream(topics: StreamTopic[], handlers: StreamHandlers): (() => void) | null {
+  if (!PATHWAY_API_URL || typeof EventSource === "undefined") return null;
+
+  const source = new EventSource(`${PATHWAY_API_URL}/stream?topics=${topics.join(",")}`);
+
+  source.addEventListener("snapshot", (event) => {
+    const payload = JSON.parse((event as MessageEvent).data);
+    handlers.onSnapshot?.(payload.topic, payload.rows ?? null, payload.data ?? null);
+  });
+
+  topics.forEach((topic) => {
+    source.addEventListener(topic, (event) => {
+      const payload = JSON.parse((event as MessageEvent).data);
+      if ("data" in payload) {
+        handlers.onData?.(topic, payload.data);
+      } else {
+        handlers.onDiff?.(topic, { upserts: payload.upserts ?? {}, deletes: payload.deletes ?? [] });
+      }
+    });
+  });
+
+  return () => source.close();
+}
+
+export function applyRowDiff<T>(rows: Record<string, T>, diff: StreamRowDiff<T>): Record<string, T> {
+  const next = { ...rows, ...diff.upserts };
+  diff.deletes.forEach((key) => {
+    delete next[key];
+  });
+  return next;
+}
+
 export async function simulateCrisis(vehicleId: string): Promise<CrisisActionResponse | null> {
   return postApi<CrisisActionResponse>("/simulate-crisis", { vehicle_id: vehicleId });
 }
@@ -211,3 +335,53 @@ export async function askBackend(question: string): Promise<string | null> {
     return null;
   }
 }
+
+export interface AskStreamHandlers {
+  onSources?: (sources: string[]) => void;
+  onToken?: (text: string) => void;
+}
+
+/** POST /ask/stream: sources first, then tokens; resolves with the full answer. */
+export async function streamAskBackend(
+  question: string,
+  handlers: AskStreamHandlers = {},
+): Promise<string | null> {
+  if (!PATHWAY_API_URL) return null;
+  try {
+    const resp = await fetch(`${PATHWAY_API_URL}/ask/stream`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ question }),
+    });
+    if (!resp.ok || !resp.body) return null;
+
+    const reader = resp.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    let answer = "";
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      let boundary = buffer.indexOf("\n\n");
+      while (boundary !== -1) {
+        const block = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        boundary = buffer.indexOf("\n\n");
+
+        const event = block.match(/^event: (.*)$/m)?.[1];
+        const data = block.match(/^data: (.*)$/m)?.[1];
+        if (!event || !data) continue;
+        const payload = JSON.parse(data);
+        if (event === "sources") handlers.onSources?.(payload.sources);
+        else if (event === "token") {
+          answer += payload.text;
+          handlers.onToken?.(payload.text);
+        } else if (event === "error") return null;
+      }
+    }
+    return answer;
+  } catch {
+    return null;
+  }
+}
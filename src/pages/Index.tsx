@@ -27,6 +27,8 @@ const Index = () => {
     emissionTimeline,
     totalEmissions,
     dataPoints,
+    vehicleStates,
+    predictions,
   } = useRealtimeData();
 
   const activeVehicles = vehicleMetrics.filter((v) => v.status === "active").length;
@@ -98,8 +100,8 @@ const Index = () => {
 
         {/* ── NEW: State Machine + Prediction Engine ── */}
         <div className="grid gap-5 lg:grid-cols-2">
-          <VehicleStateMachine vehicles={vehicleMetrics} alerts={alerts} />
-          <PredictionEngine vehicles={vehicleMetrics} alerts={alerts} />
+          <VehicleStateMachine vehicles={vehicleMetrics} alerts={alerts} states={vehicleStates} />
+          <PredictionEngine vehicles={vehicleMetrics} alerts={alerts} forecasts={predictions} />
         </div>
 
         <CrisisSimulationPanel vehicles={vehicleMetrics} />